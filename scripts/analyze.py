@@ -0,0 +1,4 @@
+#!/usr/bin/python3
+from src.batch_cli import main
+if __name__ == '__main__':
+    main()
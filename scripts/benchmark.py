@@ -0,0 +1,49 @@
+#!/usr/bin/python3
+import argparse
+import os
+import sys
+from src.benchmark import (
+    DEFAULT_TOLERANCE, compare, load_baselines, run_suite, save_baseline)
+from src.synthetic_data import write_ratings_csv
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark the analysis classes on synthetic data.')
+    parser.add_argument('--rows', type=int, default=10000,
+                        help='rows of the synthetic dataset, e.g. 10000, '
+                        '1000000 or 10000000')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', default='data/.bench')
+    parser.add_argument('--baseline', default='benchmarks/baselines.json')
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--no-memory', action='store_true',
+                        help='skip the traced runs that measure memory')
+    args = parser.parse_args()
+
+    data_path = os.path.join(
+        args.data_dir, f'ratings_{args.rows}_{args.seed}.csv')
+    if not os.path.exists(data_path):
+        os.makedirs(args.data_dir, exist_ok=True)
+        print(f"Generating {args.rows} rows into {data_path}")
+        write_ratings_csv(data_path, args.rows, args.seed)
+    results = run_suite(data_path, memory=not args.no_memory)
+    print(f"{'step':<50}{'seconds':>10}{'peak MB':>10}")
+    for step, metrics in results.items():
+        print(f"{step:<50}{metrics['seconds']:>10.3f}"
+              f"{metrics.get('peak_mb', float('nan')):>10.1f}")
+
+    if args.save_baseline:
+        save_baseline(args.baseline, args.rows, results)
+        print(f"\nSaved baseline for {args.rows} rows to {args.baseline}")
+        sys.exit(0)
+    baseline = load_baselines(args.baseline).get(str(args.rows))
+    if baseline is None:
+        print(f"\nNo baseline for {args.rows} rows in {args.baseline}; "
+              "record one with --save-baseline")
+        sys.exit(1)
+    regressions = compare(results, baseline, args.tolerance)
+    for step, metric, base, value in regressions:
+        print(f"REGRESSION {step} {metric}: {base:.3f} -> {value:.3f}")
+    if not regressions:
+        print("\nNo regressions against the baseline")
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,15 @@
+#!/usr/bin/python3
+from sys import argv
+import pandas as pd
+from src.instrumentation import read_records, summarize
+if __name__ == '__main__':
+    records_path = argv[1] if len(argv) > 1 else 'instrumentation.jsonl'
+    records = read_records(records_path)
+    with pd.option_context('display.width', 200,
+                           'display.max_columns', None,
+                           'display.float_format', '{:.3f}'.format):
+        print(summarize(records))
+        if 'profile_path' in records:
+            print("\nProfiles:")
+            print(records.dropna(subset=['profile_path'])[
+                ['call', 'profile_path']].to_string(index=False))
@@ -0,0 +1,11 @@
+#!/usr/bin/python3
+from sys import argv
+from src.spike_detector import StreamingSpikeDetector, replay_csv
+if __name__ == '__main__':
+    data_path = argv[1] if len(argv) > 1 else 'data/raw_analyst_ratings.csv'
+    detector = StreamingSpikeDetector(window=30, n_std=2.0)
+    events, report = replay_csv(data_path, detector)
+    for event in events[:20]:
+        print(event)
+    print("\nReplay Report:")
+    print(report)
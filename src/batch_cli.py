@@ -0,0 +1,331 @@
+#!/usr/bin/python3
+"""
+This module provides the batch command line interface: it loads the
+financial news dataset once, runs any subset of the analyses against the
+shared frame, writes their tables (Parquet or CSV) and figures (PNG or
+SVG) to an output directory and prints a timing summary. No window is
+ever opened, so a full run fits in one headless process.
+"""
+import argparse
+import os
+import matplotlib
+import pandas as pd
+from src.financial_news_analysis import FinancialNewsAnalysis
+from src.forecasting import VolumeForecaster, forecast_summary, \
+    prophet_forecast
+from src.instrumentation import measure
+from src.publisher_analysis import PublisherAnalysis
+from src.text_features import TextFeatureAnalysis, topic_summary
+from src.time_series_analysis import TimeSeriesAnalysis
+
+TABLE_FORMATS = ['parquet', 'csv']
+FIGURE_FORMATS = ['png', 'svg']
+
+
+def run_descriptive(analysis, output):
+    """
+    Headline length, publisher and date statistics.
+
+    Args:
+    - analysis (FinancialNewsAnalysis): Analysis over the shared frame.
+    - output (BatchOutput): Where tables and figures are written.
+    """
+    headline_stats, publisher_counts, date_counts = \
+        analysis.descriptive_statistics()
+    output.table('headline_stats', headline_stats)
+    output.table('publisher_counts', publisher_counts)
+    output.table('date_counts', date_counts)
+    analysis.visualize_stat_measures(output.figures_dir, output.figure_format)
+
+
+def run_publishers(analysis, output):
+    """
+    Top publishers by article count.
+
+    Args:
+    - analysis (PublisherAnalysis): Analysis over the shared frame.
+    - output (BatchOutput): Where tables and figures are written.
+    """
+    top_publishers = analysis.top_publishers()
+    output.table('top_publishers', top_publishers)
+    analysis.plot_publisher_distribution(
+        top_publishers, output.figure('publisher_distribution'))
+
+
+def run_domains(analysis, output):
+    """
+    Articles per domain of email-address publishers, per normalized
+    publisher name and per publisher type.
+
+    Args:
+    - analysis (PublisherAnalysis): Analysis over the shared frame.
+    - output (BatchOutput): Where tables and figures are written.
+    """
+    output.table('publisher_domains', analysis.publisher_groups('domain'))
+    output.table('publisher_names', analysis.publisher_groups('name'))
+    output.table('publisher_kinds', analysis.publisher_groups('kind'))
+
+
+def run_time_series(analysis, output):
+    """
+    Daily publication frequency, publication hours and spike days.
+
+    Args:
+    - analysis (TimeSeriesAnalysis): Analysis over the shared frame.
+    - output (BatchOutput): Where tables and figures are written.
+    """
+    publication_frequency = analysis.publication_frequency_over_time()
+    output.table('publication_frequency', publication_frequency)
+    analysis.plot_publication_frequency(
+        publication_frequency, output.figure('publication_frequency'))
+    output.table('publication_times', analysis.analyze_publication_times(
+        output.figure('publication_times')))
+    output.table('article_spikes', analysis.analyze_article_spikes(
+        output.figure('article_spikes')))
+
+
+def run_ticker_reports(analysis, output):
+    """
+    One publication frequency figure per ticker.
+
+    Args:
+    - analysis (TimeSeriesAnalysis): Analysis over the shared frame.
+    - output (BatchOutput): Where tables and figures are written.
+    """
+    analysis.render_ticker_reports(
+        os.path.join(output.figures_dir, 'tickers'), output.workers,
+        output.figure_format)
+
+
+def run_forecasts(analysis, output):
+    """
+    Daily publication frequency forecast of every ticker with enough
+    history, fitted in the worker processes. Fitted models are cached
+    under the output directory, so a rerun only refits tickers whose
+    series changed.
+
+    Args:
+    - analysis (TimeSeriesAnalysis): Analysis over the shared frame.
+    - output (BatchOutput): Where tables and figures are written.
+    """
+    forecasts = analysis.forecast_publication_frequency(
+        forecaster=VolumeForecaster(
+            prophet_forecast, workers=output.workers,
+            cache_dir=os.path.join(output.output_dir, 'forecast_cache')))
+    output.table('ticker_forecasts', forecasts)
+    output.table('ticker_forecast_totals', forecast_summary(forecasts))
+
+
+def run_topics(analysis, output):
+    """
+    Hashed headline features and their topics. The features are persisted
+    under the output directory and reused until the dataset changes.
+
+    Args:
+    - analysis (TextFeatureAnalysis): Analysis over the shared frame.
+    - output (BatchOutput): Where tables and figures are written.
+    """
+    features = analysis.headline_features(
+        cache_dir=os.path.join(output.output_dir, 'text_features'))
+    output.table('headline_topics', topic_summary(features))
+
+
+# Analysis name -> (analysis class, runner). Every analysis runs by default
+# except the per-ticker reports and forecasts, which write or fit one
+# figure or model per ticker, and the headline topics.
+ANALYSES = {
+    'descriptive': (FinancialNewsAnalysis, run_descriptive),
+    'publishers': (PublisherAnalysis, run_publishers),
+    'domains': (PublisherAnalysis, run_domains),
+    'time_series': (TimeSeriesAnalysis, run_time_series),
+    'ticker_reports': (TimeSeriesAnalysis, run_ticker_reports),
+    'forecasts': (TimeSeriesAnalysis, run_forecasts),
+    'topics': (TextFeatureAnalysis, run_topics)}
+DEFAULT_ANALYSES = ['descriptive', 'publishers', 'domains', 'time_series']
+# Analyses that need the rows in memory.
+ROW_ANALYSES = ['ticker_reports', 'forecasts']
+
+
+class BatchOutput:
+    """
+    Writes the tables and figures of a batch run under one directory.
+
+    Parameters:
+    - output_dir (str): Root directory; tables go to `tables/` and figures
+    to `figures/` below it.
+    - table_format (str): 'parquet' or 'csv'.
+    - figure_format (str): 'png' or 'svg'.
+    - workers (int): Number of processes for work that can be split.
+    """
+    def __init__(self, output_dir, table_format='parquet',
+                 figure_format='png', workers=None):
+        """
+        Initialize the BatchOutput object and create its directories.
+
+        Args:
+        - output_dir (str): Root directory of the outputs.
+        - table_format (str): 'parquet' or 'csv'.
+        - figure_format (str): 'png' or 'svg'.
+        - workers (int): Number of processes for work that can be split.
+        """
+        self.output_dir = output_dir
+        self.tables_dir = os.path.join(output_dir, 'tables')
+        self.figures_dir = os.path.join(output_dir, 'figures')
+        self.table_format = table_format
+        self.figure_format = figure_format
+        self.workers = workers
+        self.written = []
+        os.makedirs(self.tables_dir, exist_ok=True)
+        os.makedirs(self.figures_dir, exist_ok=True)
+
+    def table(self, name, table):
+        """
+        Write one result table.
+
+        Args:
+        - name (str): File name without extension.
+        - table (pandas Series or DataFrame): The result; its index is kept.
+
+        Returns:
+        - str: The written path.
+        """
+        if isinstance(table, pd.Series):
+            table = table.to_frame(table.name or 'value')
+        table = table.rename(columns=str)
+        path = os.path.join(self.tables_dir, f'{name}.{self.table_format}')
+        if self.table_format == 'parquet':
+            table.to_parquet(path)
+        else:
+            table.to_csv(path)
+        self.written.append(path)
+        return path
+
+    def figure(self, name):
+        """
+        Path of one figure file.
+
+        Args:
+        - name (str): File name without extension.
+
+        Returns:
+        - str: The path the figure should be written to.
+        """
+        path = os.path.join(self.figures_dir, f'{name}.{self.figure_format}')
+        self.written.append(path)
+        return path
+
+
+def run_batch(data_path, analyses=None, output_dir='output',
+              table_format='parquet', figure_format='png', cache_dir=None,
+              workers=None, out_of_core=False, unique_stories=False):
+    """
+    Load the dataset once and run analyses against the shared frame.
+
+    Only the columns the selected analyses need are read, and the
+    aggregates are computed once and shared by every analysis.
+
+    Args:
+    - data_path (str or list): The path to the CSV file containing the
+    financial news data, or a glob pattern or list of such files.
+    - analyses (list): Names from `ANALYSES`. Defaults to
+    `DEFAULT_ANALYSES`.
+    - output_dir (str): Directory receiving the tables and figures.
+    - table_format (str): 'parquet' or 'csv'.
+    - figure_format (str): 'png' or 'svg'.
+    - cache_dir (str): Load through the columnar cache in this directory.
+    - workers (int): Number of processes for the per-ticker figures and
+    the forecast fits.
+    - out_of_core (bool): Stream the file in chunks instead of loading it,
+    for datasets larger than RAM. The per-ticker reports and forecasts
+    need the rows and are not available in this mode.
+    - unique_stories (bool): Cluster near-duplicate headlines into stories
+    and run every analysis over one row per story.
+
+    Returns:
+    - dict: Seconds spent in each step, starting with `load` and
+    `statistics`.
+    """
+    analyses = list(analyses or DEFAULT_ANALYSES)
+    unknown = sorted(set(analyses) - set(ANALYSES))
+    if unknown:
+        raise ValueError(f"unknown analyses {unknown}, "
+                         f"choose from {sorted(ANALYSES)}")
+    in_memory = [name for name in ROW_ANALYSES if name in analyses]
+    if unique_stories:
+        in_memory.append('unique_stories')
+    if out_of_core and in_memory:
+        raise ValueError(f"{', '.join(in_memory)} need the rows in memory "
+                         "and cannot run out of core")
+    columns = ['headline', 'date'] if unique_stories else []
+    for name in analyses:
+        columns.extend(column for column in ANALYSES[name][0].analysis_columns
+                       if column not in columns)
+    output = BatchOutput(output_dir, table_format, figure_format, workers)
+    timings = {}
+    base, metrics = measure(
+        FinancialNewsAnalysis, (data_path,),
+        {'columns': columns, 'cache_dir': cache_dir, 'workers': workers,
+         'out_of_core': out_of_core}, memory=False)
+    timings['load'] = metrics['seconds']
+    if unique_stories:
+        base, metrics = measure(base.unique_stories, memory=False)
+        timings['unique_stories'] = metrics['seconds']
+    statistics, metrics = measure(base.statistics, memory=False)
+    timings['statistics'] = metrics['seconds']
+    for name in analyses:
+        cls, runner = ANALYSES[name]
+        analysis = cls.from_frame(
+            base.data, data_path, statistics, workers)
+        _, metrics = measure(runner, (analysis, output), memory=False)
+        timings[name] = metrics['seconds']
+    return timings
+
+
+def main(argv=None):
+    """
+    Parse command line arguments and run the batch.
+
+    Args:
+    - argv (list): Arguments, without the program name. Defaults to
+    `sys.argv[1:]`.
+
+    Returns:
+    - dict: Seconds spent in each step.
+    """
+    parser = argparse.ArgumentParser(
+        description='Run financial news analyses in one headless batch.')
+    parser.add_argument('data_paths', nargs='+', metavar='data_path',
+                        help='analyst ratings CSV file; several files or a '
+                        'quoted glob pattern are loaded together')
+    parser.add_argument('-a', '--analyses', nargs='+', choices=ANALYSES,
+                        default=DEFAULT_ANALYSES)
+    parser.add_argument('-o', '--output-dir', default='output')
+    parser.add_argument('--table-format', choices=TABLE_FORMATS,
+                        default='parquet')
+    parser.add_argument('--figure-format', choices=FIGURE_FORMATS,
+                        default='png')
+    parser.add_argument('--cache-dir',
+                        help='columnar cache directory for faster reloads')
+    parser.add_argument('-w', '--workers', type=int)
+    parser.add_argument('--out-of-core', action='store_true',
+                        help='stream the file in chunks instead of loading '
+                        'it, for datasets larger than memory')
+    parser.add_argument('--unique-stories', action='store_true',
+                        help='count near-duplicate headlines of the same '
+                        'day once')
+    args = parser.parse_args(argv)
+
+    # Figures are only ever written to files.
+    matplotlib.use('Agg')
+    data_paths = [os.path.expanduser(path) for path in args.data_paths]
+    timings = run_batch(
+        data_paths[0] if len(data_paths) == 1 else data_paths,
+        args.analyses, args.output_dir, args.table_format,
+        args.figure_format, args.cache_dir, args.workers, args.out_of_core,
+        args.unique_stories)
+    print(f"Results written to {args.output_dir}\n")
+    print(f"{'step':<20}{'seconds':>10}")
+    for step, seconds in timings.items():
+        print(f"{step:<20}{seconds:>10.3f}")
+    print(f"{'total':<20}{sum(timings.values()):>10.3f}")
+    return timings
@@ -0,0 +1,130 @@
+#!/usr/bin/python3
+"""
+This module provides a benchmark suite for the analysis classes. Each step
+loads a dataset or runs one analysis method, and the suite records its
+wall time and peak traced memory. Results can be stored as baselines and
+later runs compared against them to catch regressions.
+"""
+import json
+import os
+from src.financial_news_analysis import FinancialNewsAnalysis
+from src.instrumentation import measure
+from src.publisher_analysis import PublisherAnalysis
+from src.time_series_analysis import TimeSeriesAnalysis
+
+# A step regresses when a metric grows past `tolerance` times its baseline
+# and by more than this absolute margin, so tiny timings do not flap.
+MIN_REGRESSION = {'seconds': 0.05, 'peak_mb': 5.0}
+DEFAULT_TOLERANCE = 1.5
+SUITE = [
+    ('financial_news', FinancialNewsAnalysis, ['descriptive_statistics']),
+    ('publisher', PublisherAnalysis, ['top_publishers', 'extract_domains']),
+    ('time_series', TimeSeriesAnalysis,
+     ['publication_frequency_over_time', 'publication_times',
+      'article_spikes'])]
+
+
+def call_fresh(analysis, method):
+    """
+    Run an analysis method without the aggregates memoized by earlier
+    calls.
+
+    Args:
+    - analysis (FinancialNewsAnalysis): The analysis object.
+    - method (str): Name of the method to call.
+
+    Returns:
+    - The result of the method.
+    """
+    analysis.data = analysis.data
+    return getattr(analysis, method)()
+
+
+def run_suite(data_path, suite=None, memory=True):
+    """
+    Benchmark every analysis class on one dataset.
+
+    Each class loads the file with the typed loader, then each of its
+    methods is timed on a fresh dataset assignment so that no step reuses
+    aggregates memoized by an earlier one.
+
+    Args:
+    - data_path (str): The path to the CSV file containing the financial
+    news data.
+    - suite (list): (name, class, methods) entries. Defaults to `SUITE`.
+    - memory (bool): Also measure the peak memory of each step.
+
+    Returns:
+    - dict: Measurements per step, keyed '<name>.load' and
+    '<name>.<method>'.
+    """
+    results = {}
+    for name, cls, methods in suite or SUITE:
+        analysis, results[f'{name}.load'] = measure(
+            cls, (data_path,), {'typed': True}, memory)
+        for method in methods:
+            _, results[f'{name}.{method}'] = measure(
+                call_fresh, (analysis, method), memory=memory)
+    return results
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Find the steps that regressed against a baseline.
+
+    Args:
+    - results (dict): Measurements from `run_suite`.
+    - baseline (dict): Stored measurements of the same dataset size.
+    - tolerance (float): Allowed ratio of a metric to its baseline.
+
+    Returns:
+    - list: (step, metric, baseline value, current value) tuples for each
+    regression; steps missing from the baseline are skipped.
+    """
+    regressions = []
+    for step, metrics in results.items():
+        for metric, value in metrics.items():
+            base = baseline.get(step, {}).get(metric)
+            if base is None:
+                continue
+            if value > base * tolerance and \
+                    value - base > MIN_REGRESSION[metric]:
+                regressions.append((step, metric, base, value))
+    return regressions
+
+
+def load_baselines(path):
+    """
+    Read stored baselines.
+
+    Args:
+    - path (str): JSON file of baselines keyed by number of rows.
+
+    Returns:
+    - dict: The baselines, empty if the file does not exist.
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+def save_baseline(path, rows, results):
+    """
+    Store the measurements of one dataset size as its baseline.
+
+    Args:
+    - path (str): JSON file of baselines keyed by number of rows.
+    - rows (int): Number of rows of the benchmarked dataset.
+    - results (dict): Measurements from `run_suite`.
+    """
+    baselines = load_baselines(path)
+    baselines[str(rows)] = {
+        step: {metric: round(value, 4) for metric, value in metrics.items()}
+        for step, metrics in results.items()}
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(baselines, handle, indent=2, sort_keys=True)
+        handle.write('\n')
@@ -0,0 +1,228 @@
+#!/usr/bin/python3
+"""
+This module contains a class called `CorrelationAnalysis` that correlates
+daily news volume per ticker with daily stock returns read from a local
+price file, for every ticker at once, and runs event studies of the
+returns around news spikes.
+"""
+import os
+import numpy as np
+import pandas as pd
+from src.event_study import DEFAULT_ESTIMATION, DEFAULT_WINDOW, \
+    EventStudy, market_events
+from src.financial_news_analysis import FinancialNewsAnalysis
+from src.frequency_matrix import FrequencyMatrix
+from src.instrumentation import instrumented
+
+PRICE_COLUMNS = {'date': 'date', 'stock': 'stock', 'ticker': 'stock',
+                 'symbol': 'stock', 'close': 'close', 'adj close': 'close',
+                 'adj_close': 'close'}
+
+
+def load_prices(price_path):
+    """
+    Load daily closing prices from a CSV or Parquet file.
+
+    The file holds one row per (date, ticker) with `date`, `stock` (or
+    `ticker`/`symbol`) and `close` (or `adj close`) columns; adjusted
+    closes win when both are present.
+
+    Args:
+    - price_path (str): Path of a .csv or .parquet price file.
+
+    Returns:
+    - pandas DataFrame: Closing prices with one row per trading day and
+    one column per ticker.
+    """
+    if os.path.splitext(price_path)[1].lower() in ('.parquet', '.pq'):
+        prices = pd.read_parquet(price_path)
+    else:
+        prices = pd.read_csv(price_path)
+    prices.columns = [column.strip().lower() for column in prices.columns]
+    if 'adj close' in prices or 'adj_close' in prices:
+        prices = prices.drop(columns='close', errors='ignore')
+    prices = prices.rename(columns=PRICE_COLUMNS)[['date', 'stock', 'close']]
+    prices['date'] = pd.to_datetime(prices['date']).dt.normalize()
+    if prices['date'].dt.tz is not None:
+        prices['date'] = prices['date'].dt.tz_localize(None)
+    return prices.pivot_table(
+        index='date', columns='stock', values='close', aggfunc='last')
+
+
+def lagged_pairs(x, y, lag):
+    """
+    Align news at day t with returns at day t + lag along axis 0.
+
+    Args:
+    - x (numpy array): News counts, days x tickers.
+    - y (numpy array): Returns, days x tickers.
+    - lag (int): Days by which news leads returns (may be negative).
+
+    Returns:
+    - tuple: The aligned x and y arrays.
+    """
+    if lag > 0:
+        return x[:-lag], y[lag:]
+    if lag < 0:
+        return x[-lag:], y[:lag]
+    return x, y
+
+
+def batched_pearson(x, y):
+    """
+    Pearson correlation of every column of x with the same column of y,
+    using only the rows where both are present.
+
+    Args:
+    - x (numpy array): Days x tickers.
+    - y (numpy array): Days x tickers.
+
+    Returns:
+    - tuple: Correlation per column (NaN when undefined) and the number
+    of observations per column.
+    """
+    mask = ~(np.isnan(x) | np.isnan(y))
+    n = mask.sum(axis=0)
+    x = np.where(mask, x, 0.0)
+    y = np.where(mask, y, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x = np.where(mask, x - x.sum(axis=0) / n, 0.0)
+        y = np.where(mask, y - y.sum(axis=0) / n, 0.0)
+        r = (x * y).sum(axis=0) / np.sqrt(
+            (x ** 2).sum(axis=0) * (y ** 2).sum(axis=0))
+    return r, n
+
+
+def batched_spearman(x, y):
+    """
+    Spearman rank correlation of every column of x with the same column
+    of y, using only the rows where both are present.
+
+    Args:
+    - x (numpy array): Days x tickers.
+    - y (numpy array): Days x tickers.
+
+    Returns:
+    - tuple: Correlation per column (NaN when undefined) and the number
+    of observations per column.
+    """
+    missing = np.isnan(x) | np.isnan(y)
+    # Ranks are taken over the pairwise-complete rows of each column, with
+    # ties sharing their average rank.
+    x_ranks = pd.DataFrame(np.where(missing, np.nan, x)).rank().to_numpy()
+    y_ranks = pd.DataFrame(np.where(missing, np.nan, y)).rank().to_numpy()
+    return batched_pearson(x_ranks, y_ranks)
+
+
+class CorrelationAnalysis(FinancialNewsAnalysis):
+    """
+    A class for correlating news volume with stock returns.
+
+    Inherits from FinancialNewsAnalysis for access to dataset and basic
+    analysis methods.
+    """
+    analysis_columns = ['date', 'stock']
+
+    @instrumented
+    def aligned_series(self, price_path):
+        """
+        Align daily article counts with daily returns.
+
+        Only tickers present in both the news data and the price file are
+        kept. News published on days without a price row (weekends,
+        holidays) is not counted.
+
+        Args:
+        - price_path (str): Path of a .csv or .parquet price file.
+
+        Returns:
+        - tuple: News counts and returns as trading days x tickers
+        DataFrames with identical index and columns.
+        """
+        returns = load_prices(price_path).pct_change(fill_method=None)
+        matrix = FrequencyMatrix.from_frame(self.data)
+        tickers = matrix.tickers.intersection(returns.columns)
+        rows = matrix.tickers.get_indexer(tickers)
+        columns = matrix.days.get_indexer(returns.index)
+        counts = matrix.counts[rows]
+        counts = counts.toarray() if hasattr(counts, 'toarray') else counts
+        # Trading days outside the news date range have no articles.
+        news = np.where(
+            columns >= 0, counts[:, np.maximum(columns, 0)], 0).T
+        return (pd.DataFrame(news.astype('float64'), index=returns.index,
+                             columns=tickers),
+                returns[tickers])
+
+    @instrumented
+    def news_return_correlation(self, price_path, lags=(0,)):
+        """
+        Correlate daily article counts with daily returns for all tickers.
+
+        Each lag k pairs the news volume on trading day t with the return
+        on trading day t + k, so positive lags test whether news leads
+        price. Correlations are computed for all tickers at once as array
+        operations.
+
+        Args:
+        - price_path (str): Path of a .csv or .parquet price file.
+        - lags (iterable): Lags, in trading days, to evaluate.
+
+        Returns:
+        - pandas DataFrame: Indexed by (stock, lag), with the `pearson` and
+        `spearman` correlations and the number of `observations`.
+        """
+        news, returns = self.aligned_series(price_path)
+        x, y = news.to_numpy(), returns.to_numpy()
+        results = []
+        for lag in lags:
+            lagged_x, lagged_y = lagged_pairs(x, y, lag)
+            pearson, n = batched_pearson(lagged_x, lagged_y)
+            spearman, _ = batched_spearman(lagged_x, lagged_y)
+            results.append(pd.DataFrame({
+                'stock': news.columns, 'lag': lag, 'pearson': pearson,
+                'spearman': spearman, 'observations': n}))
+        if not results:
+            return pd.DataFrame(
+                columns=['pearson', 'spearman', 'observations'])
+        return pd.concat(results).set_index(['stock', 'lag']).sort_index()
+
+    @instrumented
+    def spike_event_study(self, price_path, per_ticker=True, n_std=2,
+                          window=DEFAULT_WINDOW, model='market',
+                          estimation=DEFAULT_ESTIMATION, benchmark=None):
+        """
+        Study the returns around news spikes.
+
+        Per-ticker spikes are the (ticker, day) cells of the frequency
+        matrix above the ticker's mean daily count plus `n_std` standard
+        deviations. Market-wide spikes are the days found by
+        `TimeSeriesAnalysis.article_spikes`, applied to every ticker of the
+        price file.
+
+        Args:
+        - price_path (str): Path of a .csv or .parquet price file.
+        - per_ticker (bool): Use per-ticker spikes instead of market-wide
+        ones.
+        - n_std (float): Standard deviations above the mean that make a
+        spike.
+        - window (int): Trading days k of the [-k, +k] event window.
+        - model (str): Abnormal return model, 'market', 'mean' or 'raw'.
+        - estimation (int): Estimation period of the 'mean' model.
+        - benchmark (str): Ticker of the price file used as the market
+        return, instead of the equal-weighted mean of every ticker.
+
+        Returns:
+        - EventStudy: The abnormal returns of every spike and their
+        aggregates.
+        """
+        returns = load_prices(price_path).pct_change(fill_method=None)
+        if per_ticker:
+            events = FrequencyMatrix.from_frame(self.data).spikes(n_std)
+        else:
+            daily = self.statistics().date_counts
+            threshold = daily.mean() + n_std * daily.std()
+            events = market_events(
+                daily.index[daily > threshold],
+                returns.columns.drop(benchmark, errors='ignore'))
+        return EventStudy(returns, events, window, model, estimation,
+                          benchmark)
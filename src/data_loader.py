@@ -0,0 +1,262 @@
+#!/usr/bin/python3
+"""
+This module provides helpers for loading the financial news dataset with
+column projection, compact dtypes and bounded-size chunked reads.
+"""
+import re
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+from src.instrumentation import instrumented
+
+NEWS_COLUMNS = ['headline', 'url', 'publisher', 'date', 'stock']
+CATEGORICAL_COLUMNS = ['publisher', 'stock']
+DEFAULT_CHUNKSIZE = 100000
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+OFFSET_PATTERN = re.compile(r'^(?:Z|([+-])(\d{2}):?(\d{2}))?$')
+
+
+def utc_offset_minutes(suffix):
+    """
+    Parse the UTC offset that follows the time of a date string.
+
+    Args:
+    - suffix (str): Text after the seconds, e.g. '-04:00', '+0530', 'Z'
+    or '' for a date without an offset (taken as UTC).
+
+    Returns:
+    - int: The offset in minutes east of UTC, or None if `suffix` is not
+    an offset.
+    """
+    match = OFFSET_PATTERN.match(suffix)
+    if match is None:
+        return None
+    sign, hours, minutes = match.groups()
+    if sign is None:
+        return 0
+    offset = int(hours) * 60 + int(minutes)
+    return -offset if sign == '-' else offset
+
+
+@instrumented
+def parse_date_column(dates):
+    """
+    Parse a column of publication dates and count the unparseable ones.
+
+    Dates in the dataset are written as `DATE_FORMAT` followed by an
+    optional UTC offset that varies between rows (e.g. -04:00 and -05:00).
+    The fast path parses the first 19 characters with that fixed format
+    and subtracts the offset, which is parsed once per distinct suffix.
+    Only the rows the fast path cannot handle go through pandas' per-value
+    format inference.
+
+    Args:
+    - dates (pandas Series): Raw date strings.
+
+    Returns:
+    - tuple: Timezone-aware UTC timestamps (NaT where the value could not
+    be parsed) and the number of non-missing values that were coerced to
+    NaT.
+    """
+    if not pd.api.types.is_object_dtype(dates):
+        parsed = pd.to_datetime(
+            dates, errors='coerce', utc=True, format='mixed')
+        return parsed, int((parsed.isna() & dates.notna()).sum())
+    local = pd.to_datetime(
+        dates.str[:19], format=DATE_FORMAT, errors='coerce')
+    codes, suffixes = pd.factorize(dates.str[19:])
+    # Missing values have code -1, which picks the trailing NaN.
+    offsets = np.array(
+        [utc_offset_minutes(suffix) for suffix in suffixes] + [None],
+        dtype='float64')
+    parsed = local.dt.tz_localize('UTC') - pd.to_timedelta(
+        offsets[codes], unit='m')
+    retry = parsed.isna() & dates.notna()
+    if retry.any():
+        parsed.loc[retry] = pd.to_datetime(
+            dates[retry], errors='coerce', utc=True, format='mixed')
+    return parsed, int((parsed.isna() & dates.notna()).sum())
+
+
+def parse_dates(dates):
+    """
+    Parse a column of publication dates.
+
+    Args:
+    - dates (pandas Series): Raw date strings.
+
+    Returns:
+    - pandas Series: Timezone-aware UTC timestamps, NaT where the value
+    could not be parsed.
+    """
+    return parse_date_column(dates)[0]
+
+
+def news_dtypes(columns):
+    """
+    Build the `dtype` mapping passed to pd.read_csv for a column subset.
+
+    Args:
+    - columns (list): Columns that will be read.
+
+    Returns:
+    - dict: Column name to dtype for the columns in `columns`.
+    """
+    return {
+        column: 'category' if column in CATEGORICAL_COLUMNS else 'object'
+        for column in columns if column != 'date'}
+
+
+def iter_news_chunks(data_path, columns=None, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Stream the dataset as typed DataFrame chunks of bounded size.
+
+    Only the requested columns are read, `publisher` and `stock` are read
+    as categoricals and `date` is parsed as each chunk is produced, so at
+    most one chunk of raw strings is held in memory at a time.
+
+    Args:
+    - data_path (str): The path to the CSV file containing the financial
+    news data.
+    - columns (list): Columns to read. Defaults to every news column.
+    - chunksize (int): Maximum number of rows per chunk.
+
+    Yields:
+    - pandas DataFrame: The next chunk of typed rows.
+    """
+    columns = list(columns or NEWS_COLUMNS)
+    with pd.read_csv(
+            data_path, usecols=columns, dtype=news_dtypes(columns),
+            chunksize=chunksize) as reader:
+        for chunk in reader:
+            yield prepare_chunk(chunk)
+
+
+def prepare_chunk(chunk):
+    """
+    Parse the `date` column of a freshly read chunk in place.
+
+    Args:
+    - chunk (pandas DataFrame): Rows read from the CSV file.
+
+    Returns:
+    - pandas DataFrame: The same chunk with `date` parsed and the number
+    of unparseable dates in `attrs['bad_dates']`.
+    """
+    if 'date' in chunk:
+        chunk['date'], chunk.attrs['bad_dates'] = parse_date_column(
+            chunk['date'])
+    return chunk
+
+
+def concat_chunks(chunks):
+    """
+    Concatenate typed chunks, unioning the categories of categorical
+    columns so they stay categorical in the result.
+
+    Args:
+    - chunks (list): DataFrames produced by `iter_news_chunks`.
+
+    Returns:
+    - pandas DataFrame: All rows of `chunks` with a fresh RangeIndex.
+    """
+    if not chunks:
+        return pd.DataFrame()
+    categorical = [
+        column for column in chunks[0].columns
+        if isinstance(chunks[0][column].dtype, pd.CategoricalDtype)]
+    # Concatenating categoricals with differing categories falls back to
+    # object dtype, so union them separately.
+    data = pd.concat(
+        [chunk.drop(columns=categorical) for chunk in chunks],
+        ignore_index=True)
+    for column in categorical:
+        data[column] = union_categoricals(
+            [chunk[column] for chunk in chunks])
+    data = data[list(chunks[0].columns)]
+    if 'bad_dates' in chunks[0].attrs:
+        data.attrs['bad_dates'] = sum(
+            chunk.attrs['bad_dates'] for chunk in chunks)
+    return data
+
+
+def fold_chunks(chunks):
+    """
+    Fold typed chunks into one frame as they are read.
+
+    Each chunk is split into its columns as soon as it arrives and then
+    dropped; categorical columns are kept as integer codes against
+    categories that grow with every chunk. Only the column being joined
+    is ever held twice, instead of every chunk and the concatenated frame
+    as with `concat_chunks`.
+
+    Args:
+    - chunks (iterable): DataFrames produced by `iter_news_chunks`.
+
+    Returns:
+    - pandas DataFrame: All rows of `chunks` with a fresh RangeIndex,
+    the same result as `concat_chunks`.
+    """
+    parts, categories, bad_dates, rows = None, {}, None, 0
+    for chunk in chunks:
+        if parts is None:
+            parts = {column: [] for column in chunk.columns}
+            categories = {
+                column: pd.Index([], dtype=chunk[column].cat.categories.dtype)
+                for column in chunk.columns
+                if isinstance(chunk[column].dtype, pd.CategoricalDtype)}
+        for column, values in chunk.items():
+            if column in categories:
+                # Categories are appended in order of first appearance,
+                # as union_categoricals orders them.
+                known = categories[column].append(
+                    values.cat.categories.difference(
+                        categories[column], sort=False))
+                categories[column] = known
+                # Missing values keep code -1 via the appended entry.
+                recode = np.append(known.get_indexer(
+                    values.cat.categories), -1)
+                values = recode[values.cat.codes.to_numpy()]
+            parts[column].append(values)
+        if 'bad_dates' in chunk.attrs:
+            bad_dates = (bad_dates or 0) + chunk.attrs['bad_dates']
+        rows += len(chunk)
+    if parts is None:
+        return pd.DataFrame()
+    data = pd.DataFrame(index=pd.RangeIndex(rows))
+    for column in list(parts):
+        values = parts.pop(column)
+        if column in categories:
+            data[column] = pd.Categorical.from_codes(
+                np.concatenate(values), categories[column])
+        else:
+            data[column] = pd.concat(values, ignore_index=True)
+    if bad_dates is not None:
+        data.attrs['bad_dates'] = bad_dates
+    return data
+
+
+@instrumented
+def load_news_data(data_path, columns=None, chunksize=None):
+    """
+    Load the dataset with column projection and compact dtypes.
+
+    Args:
+    - data_path (str): The path to the CSV file containing the financial
+    news data.
+    - columns (list): Columns to read. Defaults to every news column.
+    - chunksize (int): Stream the file in chunks of this many rows, folded
+    into the result as they are read, so the raw strings of only one
+    chunk are held at a time. When None the file is read in a single
+    pass.
+
+    Returns:
+    - pandas DataFrame: The typed financial news data. When `date` is read,
+    the number of dates that could not be parsed is kept in
+    `attrs['bad_dates']`.
+    """
+    if chunksize is None:
+        columns = list(columns or NEWS_COLUMNS)
+        return prepare_chunk(pd.read_csv(
+            data_path, usecols=columns, dtype=news_dtypes(columns)))
+    return fold_chunks(iter_news_chunks(data_path, columns, chunksize))
@@ -0,0 +1,195 @@
+#!/usr/bin/python3
+"""
+This module provides `DatasetCache`, an on-disk columnar (Feather) copy of
+the typed financial news dataset that is memory-mapped on later loads and
+invalidated automatically when the source CSV changes.
+"""
+import hashlib
+import json
+import os
+import time
+import pyarrow.feather as feather
+from src.data_loader import NEWS_COLUMNS, load_news_data
+from src.instrumentation import instrumented
+
+# Bump when the typed layout written to the cache changes.
+CACHE_VERSION = 2
+
+
+def file_hash(path, block_size=1 << 20):
+    """
+    Compute the SHA-256 digest of a file.
+
+    Args:
+    - path (str): Path of the file to hash.
+    - block_size (int): Number of bytes read at a time.
+
+    Returns:
+    - str: Hex digest of the file content.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class DatasetCache:
+    """
+    A columnar on-disk cache of the typed financial news dataset.
+
+    The first load of a source file parses the CSV with the typed loader
+    and writes an uncompressed Feather copy with dates already parsed and
+    `publisher`/`stock` stored as dictionaries. Later loads memory-map that
+    copy. The copy is rebuilt when the source's size or mtime changes and
+    its content hash no longer matches.
+
+    Parameters:
+    - cache_dir (str): Directory where cached copies are stored.
+    """
+    def __init__(self, cache_dir):
+        """
+        Initialize the DatasetCache object.
+
+        Args:
+        - cache_dir (str): Directory where cached copies are stored.
+        """
+        self.cache_dir = os.path.expanduser(cache_dir)
+
+    def paths(self, data_path):
+        """
+        Locate the cached table and its metadata for a source file.
+
+        Args:
+        - data_path (str): The path to the source CSV file.
+
+        Returns:
+        - tuple: Paths of the Feather table and of its JSON metadata.
+        """
+        source = os.path.abspath(os.path.expanduser(data_path))
+        key = hashlib.sha1(source.encode('utf-8')).hexdigest()[:16]
+        stem = os.path.join(self.cache_dir, f'{key}.news')
+        return f'{stem}.feather', f'{stem}.json'
+
+    def is_valid(self, data_path):
+        """
+        Check whether the cached copy still matches the source file.
+
+        Size and mtime are compared first; when either differs the content
+        hash decides, and a matching hash refreshes the stored size and
+        mtime so the next check is cheap again.
+
+        Args:
+        - data_path (str): The path to the source CSV file.
+
+        Returns:
+        - bool: True if the cached copy can be used.
+        """
+        table_path, meta_path = self.paths(data_path)
+        if not (os.path.exists(table_path) and os.path.exists(meta_path)):
+            return False
+        with open(meta_path, encoding='utf-8') as handle:
+            meta = json.load(handle)
+        if meta.get('version') != CACHE_VERSION:
+            return False
+        stat = os.stat(os.path.expanduser(data_path))
+        if (meta['size'], meta['mtime_ns']) == (
+                stat.st_size, stat.st_mtime_ns):
+            return True
+        if meta['size'] != stat.st_size or \
+                meta['sha256'] != file_hash(os.path.expanduser(data_path)):
+            return False
+        meta['mtime_ns'] = stat.st_mtime_ns
+        self._write_meta(meta_path, meta)
+        return True
+
+    @instrumented
+    def load(self, data_path, columns=None, chunksize=None):
+        """
+        Load the typed dataset, from the cache when it is valid.
+
+        Args:
+        - data_path (str): The path to the source CSV file.
+        - columns (list): Columns to return. Defaults to every news column.
+        - chunksize (int): Chunk size used by the typed loader when the
+        cache has to be (re)built.
+
+        Returns:
+        - tuple: The typed DataFrame and a load report dict with the
+        `source` ('cache' or 'csv'), the `seconds` this load took, the
+        `cold_seconds` the CSV parse took when the cache was built and the
+        number of `bad_dates` that could not be parsed.
+        """
+        table_path, meta_path = self.paths(data_path)
+        start = time.perf_counter()
+        if self.is_valid(data_path):
+            data = feather.read_table(
+                table_path, columns=columns, memory_map=True).to_pandas()
+            seconds = time.perf_counter() - start
+            with open(meta_path, encoding='utf-8') as handle:
+                meta = json.load(handle)
+            data.attrs['bad_dates'] = meta['bad_dates']
+            return data, {'source': 'cache', 'seconds': seconds,
+                          'cold_seconds': meta['cold_seconds'],
+                          'bad_dates': meta['bad_dates']}
+
+        data = load_news_data(data_path, NEWS_COLUMNS, chunksize)
+        cold_seconds = time.perf_counter() - start
+        self.store(data_path, data, cold_seconds)
+        if columns is not None:
+            data = data[list(columns)]
+        return data, {'source': 'csv', 'seconds': cold_seconds,
+                      'cold_seconds': cold_seconds,
+                      'bad_dates': data.attrs.get('bad_dates', 0)}
+
+    def store(self, data_path, data, cold_seconds):
+        """
+        Write a typed DataFrame and its source fingerprint to the cache.
+
+        Args:
+        - data_path (str): The path to the source CSV file.
+        - data (pandas DataFrame): The typed data loaded from `data_path`.
+        - cold_seconds (float): Time the CSV parse took.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        table_path, meta_path = self.paths(data_path)
+        source = os.path.expanduser(data_path)
+        stat = os.stat(source)
+        # Uncompressed Feather files can be memory-mapped without copying.
+        tmp_path = f'{table_path}.tmp'
+        feather.write_feather(
+            data.reset_index(drop=True), tmp_path, compression='uncompressed')
+        os.replace(tmp_path, table_path)
+        self._write_meta(meta_path, {
+            'version': CACHE_VERSION,
+            'source': os.path.abspath(source),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': file_hash(source),
+            'cold_seconds': cold_seconds,
+            'bad_dates': data.attrs.get('bad_dates', 0)})
+
+    def clear(self, data_path):
+        """
+        Remove the cached copy of a source file, if any.
+
+        Args:
+        - data_path (str): The path to the source CSV file.
+        """
+        for path in self.paths(data_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    @staticmethod
+    def _write_meta(meta_path, meta):
+        """
+        Atomically write cache metadata as JSON.
+
+        Args:
+        - meta_path (str): Destination path.
+        - meta (dict): Metadata to write.
+        """
+        tmp_path = f'{meta_path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as handle:
+            json.dump(meta, handle)
+        os.replace(tmp_path, meta_path)
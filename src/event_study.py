@@ -0,0 +1,212 @@
+#!/usr/bin/python3
+"""
+This module provides `EventStudy`, which measures how prices move around
+news events such as the article spikes found by `FrequencyMatrix.spikes`
+(per ticker) or `TimeSeriesAnalysis.article_spikes` (market wide).
+
+Abnormal returns are computed once for the whole trading days x tickers
+return matrix. The [-k, +k] window of every event is then gathered in a
+single fancy-indexing step from a strided sliding-window view of that
+matrix, so no Python loop runs over events and the windows are the only
+copy made.
+"""
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from src.instrumentation import instrumented
+
+MODELS = ['market', 'mean', 'raw']
+DEFAULT_WINDOW = 5
+DEFAULT_ESTIMATION = 60
+
+
+def market_events(dates, tickers):
+    """
+    Turn market-wide event dates into one event per ticker.
+
+    Args:
+    - dates (iterable): Event dates, e.g. the index of
+    `TimeSeriesAnalysis.article_spikes`.
+    - tickers (iterable): Tickers every event applies to.
+
+    Returns:
+    - pandas DataFrame: The `stock` and `date` of each event.
+    """
+    index = pd.MultiIndex.from_product(
+        [list(tickers), pd.to_datetime(list(dates))],
+        names=['stock', 'date'])
+    return index.to_frame(index=False)
+
+
+def window_view(values, window):
+    """
+    Strided view of the [-window, +window] rows around every row.
+
+    Args:
+    - values (numpy array): Trading days x tickers.
+    - window (int): Days on each side of the event day.
+
+    Returns:
+    - numpy array: Read-only view of shape days x tickers x
+    (2 * window + 1), NaN where the window leaves the data.
+    """
+    padding = np.full((window, values.shape[1]), np.nan)
+    return sliding_window_view(
+        np.vstack([padding, values, padding]), 2 * window + 1, axis=0)
+
+
+def trailing_means(values, length):
+    """
+    Mean of the previous `length` rows of every column, ignoring NaN.
+
+    Args:
+    - values (numpy array): Trading days x tickers.
+    - length (int): Number of previous rows.
+
+    Returns:
+    - numpy array: Same shape as `values`; row t holds the mean of rows
+    t - length to t - 1, NaN when none of them is present.
+    """
+    present = ~np.isnan(values)
+    zeros = np.zeros((1, values.shape[1]))
+    sums = np.vstack([zeros, np.cumsum(np.where(present, values, 0), 0)])
+    counts = np.vstack([zeros, np.cumsum(present, 0)])
+    ends = np.arange(values.shape[0])
+    starts = np.maximum(ends - length, 0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = (sums[ends] - sums[starts]) / (counts[ends] - counts[starts])
+    return means
+
+
+class EventStudy:
+    """
+    Abnormal and cumulative abnormal returns in a window around events.
+
+    Each event is placed on the first trading day on or after its date.
+    Events on tickers without prices, or after the last trading day, are
+    dropped. Abnormal returns follow `model`:
+
+    - 'market': the return minus the market return of the day, i.e. the
+    `benchmark` column, or the equal-weighted mean of every ticker.
+    - 'mean': the return minus the ticker's mean return over the
+    `estimation` trading days before the window.
+    - 'raw': the return itself.
+
+    Attributes:
+    - events (pandas DataFrame): The kept events with their `stock`,
+    `date` and the trading `day` their window is centred on.
+    - offsets (numpy array): Trading days relative to the event, -k to k.
+    - abnormal (numpy array): Abnormal returns, events x offsets, NaN
+    where a price is missing or the window leaves the data.
+    """
+    def __init__(self, returns, events, window=DEFAULT_WINDOW,
+                 model='market', estimation=DEFAULT_ESTIMATION,
+                 benchmark=None):
+        """
+        Initialize the EventStudy object and gather every event window.
+
+        Args:
+        - returns (pandas DataFrame): Daily returns, trading days x
+        tickers, indexed by timezone-naive dates.
+        - events (pandas DataFrame): One row per event with `stock` and
+        `date` columns.
+        - window (int): Trading days k on each side of the event.
+        - model (str): 'market', 'mean' or 'raw'.
+        - estimation (int): Length of the estimation period of 'mean'.
+        - benchmark (str): Column of `returns` holding the market return
+        for 'market'; it is not itself an event ticker.
+        """
+        if model not in MODELS:
+            raise ValueError(f"model must be one of {MODELS}, got {model!r}")
+        if benchmark is not None:
+            market = returns[benchmark].to_numpy(dtype='float64')
+            returns = returns.drop(columns=benchmark)
+        values = returns.to_numpy(dtype='float64')
+        if model == 'market' and benchmark is None:
+            present = ~np.isnan(values)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                market = np.where(present, values, 0).sum(axis=1) / \
+                    present.sum(axis=1)
+        dates = pd.to_datetime(events['date'])
+        if dates.dt.tz is not None:
+            dates = dates.dt.tz_localize(None)
+        rows = returns.index.searchsorted(dates.dt.normalize().to_numpy())
+        cols = returns.columns.get_indexer(events['stock'])
+        kept = (cols >= 0) & (rows < len(returns))
+        rows, cols = rows[kept], cols[kept]
+        self.events = pd.DataFrame({
+            'stock': events['stock'].to_numpy()[kept],
+            'date': dates.to_numpy()[kept],
+            'day': returns.index[rows]})
+        self.offsets = np.arange(-window, window + 1)
+        if model == 'market':
+            values = values - market[:, None]
+        windows = window_view(values, window)[rows, cols]
+        if model == 'mean':
+            # The estimation period ends the day before the window opens.
+            starts = rows - window
+            expected = np.full(len(rows), np.nan)
+            inside = starts >= 0
+            expected[inside] = trailing_means(values, estimation)[
+                starts[inside], cols[inside]]
+            windows = windows - expected[:, None]
+        self.abnormal = windows
+
+    def _frame(self, values):
+        """
+        Label an events x offsets array.
+
+        Args:
+        - values (numpy array): One row per event.
+
+        Returns:
+        - pandas DataFrame: Indexed by (stock, date), one column per offset.
+        """
+        return pd.DataFrame(
+            values, columns=pd.Index(self.offsets, name='offset'),
+            index=pd.MultiIndex.from_frame(self.events[['stock', 'date']]))
+
+    def abnormal_returns(self):
+        """
+        Abnormal return of every event on every day of its window.
+
+        Returns:
+        - pandas DataFrame: Indexed by (stock, date), one column per offset.
+        """
+        return self._frame(self.abnormal)
+
+    def cumulative_abnormal_returns(self):
+        """
+        Cumulative abnormal return of every event from the window start.
+
+        Returns:
+        - pandas DataFrame: Indexed by (stock, date), one column per
+        offset. Once a day is missing the rest of the row is NaN.
+        """
+        return self._frame(np.cumsum(self.abnormal, axis=1))
+
+    @instrumented
+    def summary(self):
+        """
+        Aggregate the abnormal returns across events.
+
+        Returns:
+        - pandas DataFrame: Per offset, the number of `events` with a
+        cumulative abnormal return, the mean abnormal return `mean_ar`,
+        the mean cumulative abnormal return `mean_car`, its standard
+        deviation `car_std` and the cross-sectional t statistic `car_t`.
+        """
+        cumulative = np.cumsum(self.abnormal, axis=1)
+        present = ~np.isnan(cumulative)
+        n = present.sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_ar = np.nansum(self.abnormal, axis=0) / \
+                (~np.isnan(self.abnormal)).sum(axis=0)
+            mean_car = np.where(present, cumulative, 0).sum(axis=0) / n
+            deviations = np.where(present, cumulative - mean_car, 0)
+            car_std = np.sqrt((deviations ** 2).sum(axis=0) / (n - 1))
+            car_t = mean_car / (car_std / np.sqrt(n))
+        return pd.DataFrame({
+            'events': n, 'mean_ar': mean_ar, 'mean_car': mean_car,
+            'car_std': car_std, 'car_t': car_t},
+            index=pd.Index(self.offsets, name='offset'))
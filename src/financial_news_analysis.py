@@ -3,8 +3,22 @@
 This module provides a class, FinancialNewsAnalysis, for performing
 descriptive statistics analysis on financial news data.
 """
+import os
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+from src.data_loader import DEFAULT_CHUNKSIZE, load_news_data
+from src.dataset_cache import DatasetCache
+from src.incremental import IncrementalAggregator
+from src.instrumentation import instrumented
+from src.multi_file_loader import is_file_set, load_news_files
+from src.near_duplicates import StoryClusterer
+from src.news_index import NewsIndex
+from src.news_statistics import NewsStatistics, ensure_datetime
+from src.out_of_core import streaming_statistics
+from src.plot_rendering import (
+    FigureRenderer, RenderJob, draw_date_distribution, draw_headline_lengths,
+    draw_top_publishers, render_batch)
 
 
 class FinancialNewsAnalysis:
@@ -15,16 +29,311 @@ class FinancialNewsAnalysis:
     - data_path (str): The path to the CSV file containing the financial
     news data.
     """
-    def __init__(self, data_path):
+    # Columns read by the typed loader when none are given explicitly.
+    analysis_columns = ['headline', 'publisher', 'date', 'stock']
+
+    @instrumented
+    def __init__(self, data_path, typed=False, columns=None, chunksize=None,
+                 cache_dir=None, state_path=None, workers=None,
+                 out_of_core=False):
         """
         Initialize the FinancialNewsAnalysis object.
 
         Args:
-        - data_path (str): The path to the CSV file containing the financial
-        news data.
+        - data_path (str or list): The path to the CSV file containing the
+        financial news data, or a glob pattern or list of such files. Files
+        of a set are read concurrently with the typed loader and rows
+        repeated across them (same `url`) are dropped.
+        - typed (bool): Read only the needed columns, with categorical
+        `publisher`/`stock` and `date` parsed once at load time. Implied
+        when `columns` or `chunksize` is given.
+        - columns (list): Columns read by the typed loader. Defaults to
+        `analysis_columns`.
+        - chunksize (int): Stream the file through the typed loader in
+        chunks of this many rows, folded into `data` as they are read, so
+        the raw strings of only one chunk are held at a time. `data`
+        itself still holds every row; use `out_of_core` for datasets
+        larger than memory.
+        - cache_dir (str): Load the typed data through a columnar cache kept
+        in this directory. The cold and warm load timings are recorded in
+        `load_report`.
+        - state_path (str): Run in incremental mode: no rows are kept in
+        `data`; the aggregates are read from this state file and only rows
+        appended to `data_path` since the last run are folded in.
+        - workers (int): Number of processes for the per-ticker figures
+        and forecasts, and of threads reading a file set. The aggregates
+        are computed serially; see `src.parallel_analysis`.
+        - out_of_core (bool): Keep no rows in `data`; the aggregates and the
+        publisher domains are computed by streaming `columns` from the file
+        in chunks of `chunksize` rows, so memory stays bounded for datasets
+        larger than RAM.
+        """
+        self.data_path = data_path
+        self.load_report = None
+        self.workers = workers
+        self.columns = columns or self.analysis_columns
+        self.chunksize = chunksize
+        self._renderer = None
+        if is_file_set(data_path) and (
+                cache_dir is not None or state_path is not None):
+            raise ValueError(
+                "cache_dir and state_path need a single data file")
+        if out_of_core:
+            self.data = None
+        elif state_path is not None:
+            self.data = None
+            self._statistics = IncrementalAggregator(
+                data_path, state_path).refresh()
+        elif cache_dir is not None:
+            self.data, self.load_report = DatasetCache(cache_dir).load(
+                data_path, self.columns, chunksize)
+        elif is_file_set(data_path):
+            self.data = load_news_files(
+                data_path, self.columns, workers=workers)
+        elif typed or columns is not None or chunksize is not None:
+            self.data = load_news_data(data_path, self.columns, chunksize)
+        else:
+            self.data = pd.read_csv(data_path)
+
+    @classmethod
+    def from_frame(cls, data, data_path=None, statistics=None, workers=None,
+                   chunksize=None):
+        """
+        Create an analysis over an already loaded DataFrame.
+
+        Several analyses can share one loaded frame, and its aggregates,
+        instead of each reading the CSV file again.
+
+        Args:
+        - data (pandas DataFrame): The financial news data, or None to
+        share out-of-core aggregates of `data_path`.
+        - data_path (str): The file `data` was loaded from, if any.
+        - statistics (NewsStatistics): Aggregates already computed from
+        `data`, reused instead of being recomputed.
+        - workers (int): Number of processes for work that can be split.
+        - chunksize (int): Rows per chunk when `data` is None and the file
+        has to be streamed.
+
+        Returns:
+        - FinancialNewsAnalysis: An instance of `cls` over `data`.
+        """
+        analysis = cls.__new__(cls)
+        analysis.data_path = data_path
+        analysis.load_report = None
+        analysis.workers = workers
+        analysis.columns = cls.analysis_columns
+        analysis.chunksize = chunksize
+        analysis._renderer = None
+        analysis.data = data
+        analysis._statistics = statistics
+        return analysis
+
+    @property
+    def data(self):
+        """
+        The DataFrame containing the financial news data.
+
+        Assigning a new DataFrame discards aggregates computed from the
+        previous one.
+        """
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        """
+        Replace the financial news data and drop cached aggregates.
+
+        Args:
+        - data (pandas DataFrame): The new financial news data.
+        """
+        self._data = data
+        self._statistics = None
+        self._news_index = None
+        self._story_ids = None
+
+    @instrumented
+    def statistics(self):
+        """
+        Compute, once per dataset, every aggregate used by the analyses.
+
+        Returns:
+        - NewsStatistics: Headline length, publisher, date, hour and stock
+        counts computed in a single pass over `data`, or streamed from
+        `data_path` in out-of-core mode.
         """
-        self.data = pd.read_csv(data_path)
+        if self._statistics is None:
+            if self.data is None:
+                self._statistics = streaming_statistics(
+                    self.data_path, self.columns,
+                    self.chunksize or DEFAULT_CHUNKSIZE)
+            else:
+                self._statistics = NewsStatistics.from_frame(self.data)
+        return self._statistics
+
+    def figure_renderer(self):
+        """
+        Create, once per analysis, the renderer that writes figure files,
+        so its figure is reused by every plot of the analysis.
+
+        Returns:
+        - FigureRenderer: The analysis' renderer.
+        """
+        if self._renderer is None:
+            self._renderer = FigureRenderer()
+        return self._renderer
+
+    def _render_jobs(self, jobs, workers=None):
+        """
+        Render plots to files with the analysis' renderer, or in a pool of
+        processes each reusing its own figure.
+
+        Args:
+        - jobs (list): RenderJob entries.
+        - workers (int): Number of rendering processes. Renders with
+        `figure_renderer` when None or 1.
+
+        Returns:
+        - list: The written paths, in job order.
+        """
+        if workers and workers > 1:
+            return render_batch(jobs, workers)
+        renderer = self.figure_renderer()
+        return [renderer.render(job.path, job.draw, job.args, job.figsize)
+                for job in jobs]
+
+    def news_index(self):
+        """
+        Build, once per dataset, the (stock, date) index used by queries.
+
+        Returns:
+        - NewsIndex: The index over `data`, with its result cache.
+
+        Raises:
+        - ValueError: In out-of-core or incremental mode, where no rows are
+        kept in memory.
+        """
+        if self.data is None:
+            raise ValueError("queries need the rows in memory")
+        if self._news_index is None:
+            self._news_index = NewsIndex(self.data)
+        return self._news_index
+
+    def query_articles(self, stock, start=None, end=None):
+        """
+        Articles of one ticker published in [start, end), e.g.
+        `query_articles('TSLA', '2020-03-01', '2020-04-01')`.
+
+        Args:
+        - stock (str): The ticker.
+        - start (str or datetime): First publication time included; naive
+        values are in the timezone of the data (UTC when typed).
+        - end (str or datetime): End of the range, excluded.
 
+        Returns:
+        - pandas DataFrame: The matching rows in publication order. The
+        result may be shared with later identical queries, so do not
+        modify it in place.
+        """
+        return self.news_index().articles(stock, start, end)
+
+    def query_count(self, stock, start=None, end=None):
+        """
+        Count the articles of one ticker published in [start, end).
+
+        Args:
+        - stock (str): The ticker.
+        - start (str or datetime): First publication time included.
+        - end (str or datetime): End of the range, excluded.
+
+        Returns:
+        - int: The number of matching articles.
+        """
+        return self.news_index().count(stock, start, end)
+
+    def query_top_publishers(self, stock, start=None, end=None, n=10):
+        """
+        Most frequent publishers of one ticker's articles published in
+        [start, end).
+
+        Args:
+        - stock (str): The ticker.
+        - start (str or datetime): First publication time included.
+        - end (str or datetime): End of the range, excluded.
+        - n (int): Number of publishers to return.
+
+        Returns:
+        - pandas Series: Articles per publisher, most frequent first.
+        """
+        return self.news_index().top_publishers(stock, start, end, n)
+
+    @instrumented
+    def story_ids(self, clusterer=None):
+        """
+        Cluster near-duplicate headlines into stories.
+
+        `data` is left unchanged, since it may be shared with other
+        analyses; the IDs are kept, once per dataset, for
+        `unique_stories`.
+
+        Args:
+        - clusterer (StoryClusterer): The clustering settings. Defaults to
+        a `StoryClusterer` joining similar headlines of the same day, and
+        to the IDs already computed for this dataset.
+
+        Returns:
+        - pandas Series: The story ID of every row, aligned with `data`.
+
+        Raises:
+        - ValueError: In out-of-core or incremental mode, where no rows are
+        kept in memory.
+        """
+        if self.data is None:
+            raise ValueError("story clustering needs the rows in memory")
+        if clusterer is not None or self._story_ids is None:
+            self._story_ids = (clusterer or StoryClusterer()).cluster(
+                self.data)
+        return self._story_ids
+
+    @instrumented
+    def unique_stories(self, clusterer=None):
+        """
+        Create an analysis of the same kind over one row per story, so
+        that frequency and spike analyses count syndicated and templated
+        copies of a story once.
+
+        A `story_id` column already in `data` is used unless a clusterer
+        is given; otherwise the IDs come from `story_ids`. Each story keeps
+        its earliest published row.
+
+        Args:
+        - clusterer (StoryClusterer): The clustering settings used to
+        compute the story IDs.
+
+        Returns:
+        - FinancialNewsAnalysis: An instance of this class over the kept
+        rows, in their original order.
+
+        Raises:
+        - ValueError: In out-of-core or incremental mode, where no rows are
+        kept in memory.
+        """
+        if clusterer is None and self.data is not None and \
+                'story_id' in self.data:
+            stories = self.data['story_id']
+        else:
+            stories = self.story_ids(clusterer)
+        dates = ensure_datetime(self.data)
+        nanoseconds = dates.array.asi8.copy()
+        nanoseconds[dates.isna().to_numpy()] = np.iinfo('int64').max
+        order = np.argsort(nanoseconds, kind='stable')
+        repeated = pd.Series(
+            stories.to_numpy()[order]).duplicated().to_numpy()
+        kept = self.data.iloc[np.sort(order[~repeated])]
+        return type(self).from_frame(kept, self.data_path,
+                                     workers=self.workers,
+                                     chunksize=self.chunksize)
+
+    @instrumented
     def descriptive_statistics(self):
         """
         Perform descriptive statistics analysis on the financial news data.
@@ -35,22 +344,11 @@ class FinancialNewsAnalysis:
         - date_counts (pandas Series): Number of articles published on each
         date.
         """
-        # Calculate headline lengths
-        self.data['headline_length'] = self.data['headline'].apply(len)
-
-        # Basic statistics for headline lengths
-        headline_stats = self.data['headline_length'].describe()
-
-        # Count number of articles per publisher
-        publisher_counts = self.data['publisher'].value_counts()
-
-        # Analyze publication dates
-        self.data['date'] = pd.to_datetime(self.data['date'], errors='coerce')
-        date_counts = self.data['date'].dt.date.value_counts()
-
-        return headline_stats, publisher_counts, date_counts
+        stats = self.statistics()
+        return stats.headline_stats, stats.publisher_counts, stats.date_counts
 
-    def visualize_stat_measures(self):
+    @instrumented
+    def visualize_stat_measures(self, output_dir=None, fmt='png'):
         """
         Visualize descriptive statistics measures.
 
@@ -60,41 +358,33 @@ class FinancialNewsAnalysis:
         publishers by article count,
         and a histogram of publication dates.
 
+        Args:
+        - output_dir (str): Write the figures to this directory instead of
+        showing them.
+        - fmt (str): Image format of written figures, e.g. 'png' or 'svg'.
+
         Returns:
-            None
-        """
-        # Headline Length Histogram
-        plt.figure(figsize=(12, 6))
-        plt.hist(
-            self.data['headline_length'],
-            bins=30, color='skyblue', edgecolor='black')
-        plt.xlabel('Headline Length')
-        plt.ylabel('Frequency')
-        plt.title('Distribution of Headline Lengths')
-        plt.grid(axis='y', alpha=0.75)
-        plt.show()
-
-        # Publisher Article Counts Bar Plot
-        plt.figure(figsize=(14, 6))
-        publisher_counts = self.data['publisher'].value_counts()
-        # Displaying only top 10 publishers for better visibility
-        top_publishers = publisher_counts.head(10)
-        top_publishers.plot(kind='bar', color='skyblue', edgecolor='black')
-        plt.xlabel('Publisher')
-        plt.ylabel('Number of Articles')
-        plt.title('Top 10 Publishers by Article Count')
-        plt.xticks(rotation=45, ha='right')
-        plt.show()
-
-        # Publication Date Counts Histogram
-        plt.figure(figsize=(12, 6))
-        # To remove 'NaT' values from the data['date'] use dropna()
-        plt.hist(
-            self.data['date'].dropna(),
-            bins=50, color='skyblue', edgecolor='black')
-        plt.xlabel('Publication Date')
-        plt.ylabel('Frequency')
-        plt.title('Publication Date Distribution')
-        plt.xticks(rotation=45)
-        plt.grid(axis='y', alpha=0.75)
-        plt.show()
+            list: Paths of the written figures, or None when the figures
+            are shown.
+        """
+        stats = self.statistics()
+        plots = [
+            ('headline_lengths', draw_headline_lengths,
+             (stats.length_counts,), (12, 6)),
+            # Displaying only top 10 publishers for better visibility
+            ('top_publishers', draw_top_publishers,
+             (stats.top_publishers(10),), (14, 6)),
+            ('publication_dates', draw_date_distribution,
+             (stats.date_counts,), (12, 6))]
+
+        if output_dir is not None:
+            return self._render_jobs([
+                RenderJob(os.path.join(output_dir, f'{name}.{fmt}'),
+                          draw, args, figsize)
+                for name, draw, args, figsize in plots])
+
+        for _, draw, args, figsize in plots:
+            plt.figure(figsize=figsize)
+            draw(plt.gca(), *args)
+            plt.show()
+        return None
@@ -0,0 +1,278 @@
+#!/usr/bin/python3
+"""
+This module provides `VolumeForecaster`, which forecasts the daily
+publication frequency of many tickers (or publishers) at once: one model
+per series, fitted in a pool of processes, with series too sparse to model
+skipped and fitted models cached on disk by series hash so that unchanged
+series are not refit on later runs.
+
+The default model is Prophet, imported only when a fit actually runs.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import json
+import logging
+import os
+from itertools import repeat
+import pandas as pd
+from src.instrumentation import instrumented
+from src.news_statistics import ensure_datetime
+
+DEFAULT_HORIZON = 30
+# Series with fewer days carrying at least one article are not modelled.
+MIN_ACTIVE_DAYS = 30
+FORECAST_COLUMNS = ['ds', 'yhat', 'yhat_lower', 'yhat_upper']
+# Prophet draws 1000 samples per forecast for its intervals by default;
+# 200 keeps the 80% interval stable at a fifth of the prediction cost.
+PROPHET_OPTIONS = {'uncertainty_samples': 200}
+
+
+def prophet_forecast(series, horizon):
+    """
+    Fit Prophet to a daily count series and forecast it.
+
+    Needs the `prophet` package from `requirements.txt`.
+
+    Args:
+    - series (pandas Series): Articles per day, indexed by consecutive
+    timezone-naive dates.
+    - horizon (int): Number of days to forecast after the last date.
+
+    Returns:
+    - tuple: The fitted model as Prophet JSON, which
+    `prophet.serialize.model_from_json` restores, and the forecast as a
+    DataFrame with the `FORECAST_COLUMNS`.
+    """
+    # pylint: disable=import-outside-toplevel
+    from prophet import Prophet
+    from prophet.serialize import model_to_json
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+    model = Prophet(**PROPHET_OPTIONS)
+    model.fit(pd.DataFrame({'ds': series.index, 'y': series.to_numpy()}))
+    future = model.make_future_dataframe(horizon, include_history=False)
+    return model_to_json(model), model.predict(future)[FORECAST_COLUMNS]
+
+
+def daily_series(data, by='stock', top=None, min_active_days=1):
+    """
+    Build the daily article count series of every ticker or publisher.
+
+    All series come from one grouping pass over `data`.
+
+    Args:
+    - data (pandas DataFrame): The financial news data.
+    - by (str): 'stock' or 'publisher'.
+    - top (int): Only build the series of this many keys with the most
+    articles.
+    - min_active_days (int): Leave out series with fewer days carrying at
+    least one article.
+
+    Returns:
+    - dict: Articles per calendar day, indexed by timezone-naive UTC dates,
+    per key in order of article count. Every series runs from its key's
+    first article to the last date of the dataset, so all forecasts start
+    on the same day; days without articles are zeros.
+    """
+    dates = ensure_datetime(data)
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_convert(None)
+    dates = dates.dt.normalize()
+    last = dates.max()
+    counts = data.groupby([data[by], dates], observed=True).size()
+    totals = counts.groupby(level=0, observed=True).agg(['sum', 'size'])
+    totals = totals[totals['size'] >= min_active_days].sort_values(
+        'sum', ascending=False, kind='stable').head(top)
+    grouped = dict(list(counts.groupby(level=0, observed=True)))
+    series = {}
+    for key in totals.index:
+        counts = grouped[key].droplevel(0)
+        series[key] = counts.reindex(
+            pd.date_range(counts.index[0], last, freq='D'), fill_value=0
+        ).rename_axis('ds').rename('y')
+    return series
+
+
+def series_hash(series, horizon, fitter):
+    """
+    Hash a count series together with the model that forecasts it.
+
+    Args:
+    - series (pandas Series): Articles per day.
+    - horizon (int): Number of forecast days.
+    - fitter (callable): The fitting function.
+
+    Returns:
+    - str: Hex digest that changes when the dates, the counts, the
+    horizon or the fitter change.
+    """
+    digest = hashlib.sha256(
+        f'{fitter.__module__}.{fitter.__qualname__}:{horizon}'.encode())
+    digest.update(series.index.to_numpy(dtype='datetime64[ns]').tobytes())
+    digest.update(series.to_numpy(dtype='int64').tobytes())
+    return digest.hexdigest()
+
+
+class VolumeForecaster:
+    """
+    Forecast many daily count series, one model per series.
+
+    Parameters:
+    - fitter (callable): Module-level function taking a series and a
+    horizon and returning the fitted parameters (JSON-serializable) and a
+    forecast DataFrame with the `FORECAST_COLUMNS`. Defaults to
+    `prophet_forecast`.
+    - horizon (int): Number of days to forecast.
+    - min_active_days (int): Series with fewer days carrying at least one
+    article are skipped.
+    - cache_dir (str): Directory holding one JSON file of fitted
+    parameters and forecast per series hash. Nothing is cached when None.
+    - workers (int): Number of fitting processes. Serial when None or 1.
+    """
+    def __init__(self, fitter=prophet_forecast, horizon=DEFAULT_HORIZON,
+                 min_active_days=MIN_ACTIVE_DAYS, cache_dir=None,
+                 workers=None):
+        """
+        Initialize the VolumeForecaster object.
+
+        Args:
+        - fitter (callable): Module-level fitting function.
+        - horizon (int): Number of days to forecast.
+        - min_active_days (int): Minimum number of days with articles.
+        - cache_dir (str): Directory of the fit cache, or None.
+        - workers (int): Number of fitting processes.
+        """
+        self.fitter = fitter
+        self.horizon = horizon
+        self.min_active_days = min_active_days
+        self.cache_dir = None if cache_dir is None else \
+            os.path.expanduser(cache_dir)
+        self.workers = workers
+        self.report = {}
+
+    @instrumented
+    def forecast(self, series):
+        """
+        Forecast every series that has enough active days.
+
+        Args:
+        - series (dict): Daily count series per key, as built by
+        `daily_series`.
+
+        Returns:
+        - pandas DataFrame: The forecasts of all modelled keys, one row per
+        key and day, with a `key` column followed by the
+        `FORECAST_COLUMNS`. Counts of skipped, cached and fitted series
+        are kept in `report`.
+        """
+        modelled = {key: counts for key, counts in series.items()
+                    if int((counts > 0).sum()) >= self.min_active_days}
+        hashes = {key: series_hash(counts, self.horizon, self.fitter)
+                  for key, counts in modelled.items()}
+        forecasts = {}
+        for key, digest in hashes.items():
+            cached = self.read_cache(digest)
+            if cached is not None:
+                forecasts[key] = cached
+        missing = [key for key in modelled if key not in forecasts]
+        for key, (params, forecast) in zip(
+                missing, self._fit([modelled[key] for key in missing])):
+            self.write_cache(hashes[key], key, params, forecast)
+            forecasts[key] = forecast
+        self.report = {'series': len(series),
+                       'skipped': len(series) - len(modelled),
+                       'cached': len(modelled) - len(missing),
+                       'fitted': len(missing)}
+        if not forecasts:
+            return pd.DataFrame(columns=['key'] + FORECAST_COLUMNS)
+        return pd.concat(
+            [forecasts[key].assign(key=key) for key in modelled],
+            ignore_index=True)[['key'] + FORECAST_COLUMNS]
+
+    def _fit(self, series):
+        """
+        Fit series serially or in the process pool.
+
+        Args:
+        - series (list): Daily count series to fit.
+
+        Returns:
+        - list: The fitter's (parameters, forecast) result for each series.
+        """
+        if not self.workers or self.workers <= 1 or len(series) <= 1:
+            return [self.fitter(counts, self.horizon) for counts in series]
+        # Fits are short, so several are sent to a worker at a time.
+        chunksize = max(1, len(series) // (self.workers * 4))
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            return list(pool.map(self.fitter, series, repeat(self.horizon),
+                                 chunksize=chunksize))
+
+    def cache_path(self, digest):
+        """
+        Locate the cache file of one series.
+
+        Args:
+        - digest (str): Hash from `series_hash`.
+
+        Returns:
+        - str: Path of the JSON file, or None when nothing is cached.
+        """
+        if self.cache_dir is None:
+            return None
+        return os.path.join(self.cache_dir, f'{digest}.json')
+
+    def read_cache(self, digest):
+        """
+        Read the cached forecast of one series.
+
+        Args:
+        - digest (str): Hash from `series_hash`.
+
+        Returns:
+        - pandas DataFrame: The cached forecast, or None if there is none.
+        """
+        path = self.cache_path(digest)
+        if path is None or not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as handle:
+            forecast = pd.DataFrame(json.load(handle)['forecast'])
+        forecast['ds'] = pd.to_datetime(forecast['ds'])
+        return forecast[FORECAST_COLUMNS]
+
+    def write_cache(self, digest, key, params, forecast):
+        """
+        Atomically store the fitted parameters and forecast of one series.
+
+        Args:
+        - digest (str): Hash from `series_hash`.
+        - key (str): The ticker or publisher.
+        - params: JSON-serializable fitted parameters.
+        - forecast (pandas DataFrame): The forecast.
+        """
+        path = self.cache_path(digest)
+        if path is None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        forecast = forecast[FORECAST_COLUMNS].assign(
+            ds=forecast['ds'].dt.strftime('%Y-%m-%d'))
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as handle:
+            json.dump({'key': str(key), 'params': params,
+                       'forecast': forecast.to_dict('list')}, handle,
+                      default=float)
+        os.replace(tmp_path, path)
+
+
+def forecast_summary(forecasts):
+    """
+    Total forecast articles per key.
+
+    Args:
+    - forecasts (pandas DataFrame): Output of `VolumeForecaster.forecast`.
+
+    Returns:
+    - pandas DataFrame: Per key, the summed `yhat` and interval bounds
+    over the horizon, largest first.
+    """
+    return forecasts.groupby('key', sort=False)[
+        ['yhat', 'yhat_lower', 'yhat_upper']].sum().clip(
+            lower=0).sort_values('yhat', ascending=False)
@@ -0,0 +1,172 @@
+#!/usr/bin/python3
+"""
+This module provides the FrequencyMatrix class, a tickers x days matrix of
+article counts built in one vectorized pass over the `stock` and `date`
+columns, so per-ticker frequencies, spikes and cross-ticker comparisons
+become array slices.
+"""
+import numpy as np
+import pandas as pd
+from scipy import sparse as sp
+from src.instrumentation import instrumented
+from src.news_statistics import ensure_datetime
+
+NS_PER_DAY = 86400 * 10 ** 9
+
+
+def day_numbers(dates):
+    """
+    Convert publication timestamps to calendar day numbers.
+
+    Timezone-aware timestamps keep their own calendar date, matching
+    `Series.dt.date`.
+
+    Args:
+    - dates (pandas Series): Parsed publication timestamps.
+
+    Returns:
+    - numpy array: Days since the epoch as int64, -1 where `dates` is NaT.
+    """
+    if getattr(dates.dt, 'tz', None) is not None:
+        dates = dates.dt.tz_localize(None)
+    days = dates.to_numpy(dtype='datetime64[D]').astype('int64')
+    days[dates.isna().to_numpy()] = -1
+    return days
+
+
+class FrequencyMatrix:
+    """
+    Article counts per ticker and calendar day.
+
+    Attributes:
+    - counts (scipy.sparse.csr_matrix or numpy array): Counts with one row
+    per ticker and one column per day.
+    - tickers (pandas Index): Ticker of each row, sorted.
+    - days (pandas DatetimeIndex): Every calendar day from the first to the
+    last publication date, one per column.
+    """
+    def __init__(self, counts, tickers, days):
+        """
+        Initialize the FrequencyMatrix object.
+
+        Args:
+        - counts (scipy.sparse.csr_matrix or numpy array): Counts with one
+        row per ticker and one column per day.
+        - tickers (pandas Index): Ticker of each row.
+        - days (pandas DatetimeIndex): Calendar day of each column.
+        """
+        self.counts = counts
+        self.tickers = pd.Index(tickers)
+        self.days = pd.DatetimeIndex(days)
+
+    @classmethod
+    @instrumented
+    def from_frame(cls, data, dense=False):
+        """
+        Build the matrix from the financial news data.
+
+        Tickers are integer-coded with `pd.factorize`, days are offsets
+        from the first publication day, and duplicate (ticker, day) pairs
+        are summed when the COO matrix is converted. Rows without a ticker
+        or a date are skipped.
+
+        Args:
+        - data (pandas DataFrame): Data with `stock` and `date` columns.
+        - dense (bool): Return a NumPy array instead of a CSR matrix.
+
+        Returns:
+        - FrequencyMatrix: The article counts.
+        """
+        codes, tickers = pd.factorize(data['stock'], sort=True)
+        days = day_numbers(ensure_datetime(data))
+        valid = (codes >= 0) & (days >= 0)
+        codes, days = codes[valid], days[valid]
+        first = days.min() if len(days) else 0
+        n_days = int(days.max() - first + 1) if len(days) else 0
+        columns = days - first
+        shape = (len(tickers), n_days)
+        if dense:
+            counts = np.bincount(
+                codes * n_days + columns,
+                minlength=shape[0] * shape[1]).reshape(shape)
+        else:
+            counts = sp.coo_matrix(
+                (np.ones(len(codes), dtype='int64'), (codes, columns)),
+                shape=shape).tocsr()
+        day_index = pd.to_datetime(first + np.arange(n_days), unit='D')
+        return cls(counts, tickers, day_index)
+
+    def ticker_series(self, ticker):
+        """
+        Daily article counts of one ticker.
+
+        Args:
+        - ticker (str): The ticker.
+
+        Returns:
+        - pandas Series: Articles per calendar day, including zero days.
+        """
+        row = self.counts[self.tickers.get_loc(ticker)]
+        row = row.toarray().ravel() if sp.issparse(row) else row
+        return pd.Series(row, index=self.days, name=ticker)
+
+    def daily_totals(self):
+        """
+        Article counts over all tickers.
+
+        Returns:
+        - pandas Series: Articles per calendar day.
+        """
+        totals = np.asarray(self.counts.sum(axis=0)).ravel()
+        return pd.Series(totals, index=self.days)
+
+    def compare(self, tickers, start=None, end=None):
+        """
+        Daily counts of several tickers side by side.
+
+        Args:
+        - tickers (list): Tickers to compare.
+        - start (str or datetime): First day to include.
+        - end (str or datetime): Last day to include.
+
+        Returns:
+        - pandas DataFrame: One column per ticker, one row per day.
+        """
+        rows = self.tickers.get_indexer(tickers)
+        lo, hi = self.days.slice_locs(start, end)
+        block = self.counts[rows][:, lo:hi]
+        block = block.toarray() if sp.issparse(block) else block
+        return pd.DataFrame(
+            block.T, index=self.days[lo:hi], columns=list(tickers))
+
+    def spikes(self, n_std=2):
+        """
+        Find (ticker, day) cells above their ticker's mean daily count plus
+        `n_std` standard deviations, computed over the full day range.
+
+        Args:
+        - n_std (float): Number of standard deviations above the mean.
+
+        Returns:
+        - pandas DataFrame: One row per spike with the `stock`, `date`,
+        `articles` and the ticker's `threshold`.
+        """
+        n_days = len(self.days)
+        if sp.issparse(self.counts):
+            totals = np.asarray(self.counts.sum(axis=1)).ravel()
+            squares = np.asarray(
+                self.counts.multiply(self.counts).sum(axis=1)).ravel()
+        else:
+            totals = self.counts.sum(axis=1)
+            squares = (self.counts ** 2).sum(axis=1)
+        mean = totals / n_days
+        variance = (squares - n_days * mean ** 2) / max(n_days - 1, 1)
+        threshold = mean + n_std * np.sqrt(np.maximum(variance, 0))
+        # Zero cells can never exceed a non-negative threshold, so only the
+        # stored entries of a sparse matrix need to be checked.
+        cells = sp.coo_matrix(self.counts)
+        hits = cells.data > threshold[cells.row]
+        rows, cols = cells.row[hits], cells.col[hits]
+        return pd.DataFrame({
+            'stock': self.tickers[rows], 'date': self.days[cols],
+            'articles': cells.data[hits], 'threshold': threshold[rows]})
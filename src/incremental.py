@@ -0,0 +1,165 @@
+#!/usr/bin/python3
+"""
+This module provides `IncrementalAggregator`, which keeps the aggregates
+behind the descriptive, publisher and time series analyses up to date for
+an append-only CSV file by folding in only the rows added since the
+previous run.
+"""
+import hashlib
+import io
+import json
+import os
+from src.data_loader import load_news_data
+from src.instrumentation import instrumented
+from src.news_statistics import NewsStatistics
+
+STATE_VERSION = 1
+STATISTICS_COLUMNS = ['headline', 'publisher', 'date', 'stock']
+# Bytes before the stored offset that must be unchanged for the file to
+# count as appended to rather than rewritten.
+TAIL_BYTES = 4096
+
+
+class IncrementalAggregator:
+    """
+    Mergeable aggregate state persisted next to an append-only dataset.
+
+    The state holds the `NewsStatistics` of every row read so far and the
+    byte offset of the first unread row. A refresh reads from that offset
+    in blocks of whole lines, computes the statistics of each block and
+    merges them in, so its cost is proportional to the appended data. If
+    the header or the bytes just before the offset changed, or the file
+    shrank, the file is treated as rewritten and the state is rebuilt.
+
+    Records are assumed not to contain embedded newlines.
+
+    Parameters:
+    - data_path (str): The path to the CSV file containing the financial
+    news data.
+    - state_path (str): The path of the JSON file holding the state.
+    - block_size (int): Maximum number of bytes parsed at a time.
+    """
+    def __init__(self, data_path, state_path, block_size=64 << 20):
+        """
+        Initialize the IncrementalAggregator object.
+
+        Args:
+        - data_path (str): The path to the CSV file containing the financial
+        news data.
+        - state_path (str): The path of the JSON file holding the state.
+        - block_size (int): Maximum number of bytes parsed at a time.
+        """
+        self.data_path = os.path.expanduser(data_path)
+        self.state_path = os.path.expanduser(state_path)
+        self.block_size = block_size
+
+    @instrumented
+    def refresh(self):
+        """
+        Fold rows appended since the last refresh into the stored state.
+
+        Returns:
+        - NewsStatistics: Aggregates of every row in the file.
+        """
+        with open(self.data_path, 'rb') as handle:
+            header = handle.readline()
+            state = self._read_state()
+            if state is None or not self._is_append_of(handle, header, state):
+                # Empty counts keep the aggregates usable when the file
+                # has no rows yet.
+                stats, offset = NewsStatistics.empty(), len(header)
+            else:
+                stats = NewsStatistics.from_dict(state['statistics'])
+                offset = state['offset']
+            handle.seek(offset)
+            for block in self._iter_blocks(handle):
+                stats = stats.merge(NewsStatistics.from_frame(load_news_data(
+                    io.BytesIO(header + block), STATISTICS_COLUMNS)))
+                offset += len(block)
+            handle.seek(max(len(header), offset - TAIL_BYTES))
+            tail = handle.read(offset - handle.tell())
+        self._write_state({
+            'version': STATE_VERSION,
+            'header': header.decode('utf-8'),
+            'offset': offset,
+            'tail_sha256': hashlib.sha256(tail).hexdigest(),
+            'statistics': stats.to_dict()})
+        return stats
+
+    def reset(self):
+        """
+        Discard the stored state so the next refresh reads the whole file.
+        """
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
+
+    def _iter_blocks(self, handle):
+        """
+        Read the rest of a file in blocks that end on a line boundary.
+
+        An incomplete last line is left for a later refresh.
+
+        Args:
+        - handle (file): Binary file positioned at the first unread row.
+
+        Yields:
+        - bytes: The next block of complete lines.
+        """
+        pending = b''
+        while True:
+            data = handle.read(self.block_size)
+            if not data:
+                return
+            pending += data
+            end = pending.rfind(b'\n') + 1
+            if end:
+                yield pending[:end]
+                pending = pending[end:]
+
+    def _is_append_of(self, handle, header, state):
+        """
+        Check that the file still starts with the rows already folded in.
+
+        Args:
+        - handle (file): Binary handle of the data file.
+        - header (bytes): The file's current header line.
+        - state (dict): The stored state.
+
+        Returns:
+        - bool: True if only appends happened since the state was written.
+        """
+        offset = state['offset']
+        if state.get('version') != STATE_VERSION or \
+                state['header'] != header.decode('utf-8') or \
+                os.fstat(handle.fileno()).st_size < offset:
+            return False
+        handle.seek(max(len(header), offset - TAIL_BYTES))
+        tail = handle.read(offset - handle.tell())
+        return hashlib.sha256(tail).hexdigest() == state['tail_sha256']
+
+    def _read_state(self):
+        """
+        Load the stored state.
+
+        Returns:
+        - dict: The stored state, or None if there is none.
+        """
+        if not os.path.exists(self.state_path):
+            return None
+        with open(self.state_path, encoding='utf-8') as handle:
+            return json.load(handle)
+
+    def _write_state(self, state):
+        """
+        Atomically write the state as JSON.
+
+        Args:
+        - state (dict): The state to store.
+        """
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f'{self.state_path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as handle:
+            json.dump(state, handle)
+        os.replace(tmp_path, self.state_path)
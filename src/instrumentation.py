@@ -0,0 +1,335 @@
+#!/usr/bin/python3
+"""
+This module provides opt-in instrumentation of the analysis hot paths.
+
+Functions and methods decorated with `instrumented` emit one JSON-lines
+record per call with its wall time, CPU time, rows processed and resident
+memory delta once recording is enabled with `enable` (or the
+`NEWS_INSTRUMENTATION` environment variable naming the output file). Single
+methods can additionally be run under cProfile or tracemalloc (see
+`NEWS_PROFILE` and `NEWS_TRACEMALLOC`). While recording is disabled the
+decorator costs one attribute check per call. `measure` times a single
+call, optionally with its traced peak memory, for the batch timing
+summary and the benchmark suite.
+"""
+import contextvars
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+import pandas as pd
+
+ENV_VARIABLE = 'NEWS_INSTRUMENTATION'
+# Comma-separated call names to profile or trace when enabled from the
+# environment.
+PROFILE_VARIABLE = 'NEWS_PROFILE'
+TRACEMALLOC_VARIABLE = 'NEWS_TRACEMALLOC'
+TRACEMALLOC_TOP = 10
+
+
+class InstrumentationConfig:
+    """
+    Where instrumentation records go and which calls get deep capture.
+
+    Attributes:
+    - output_path (str): JSON-lines file the records are appended to, or
+    None while recording is disabled.
+    - profile (set): Names of the calls run under cProfile.
+    - trace_memory (set): Names of the calls run under tracemalloc.
+    - profile_dir (str): Directory the cProfile stats files are written to.
+    """
+    def __init__(self):
+        """
+        Initialize the InstrumentationConfig object, disabled.
+        """
+        self.output_path = None
+        self.profile = set()
+        self.trace_memory = set()
+        self.profile_dir = None
+        self.lock = threading.Lock()
+
+
+CONFIG = InstrumentationConfig()
+_DEPTH = contextvars.ContextVar('instrumentation_depth', default=0)
+
+
+def enable(output_path, profile=(), trace_memory=(), profile_dir=None):
+    """
+    Start recording instrumented calls.
+
+    Call names are '<Class>.<method>' for methods, using the class of the
+    instance, and '<module>.<function>' for functions, e.g.
+    'PublisherAnalysis.extract_domains' or 'data_loader.parse_date_column'.
+
+    Args:
+    - output_path (str): JSON-lines file the records are appended to.
+    - profile (iterable): Names of the calls to run under cProfile.
+    - trace_memory (iterable): Names of the calls to run under tracemalloc.
+    - profile_dir (str): Directory for the cProfile stats files. Defaults
+    to the directory of `output_path`.
+    """
+    CONFIG.output_path = os.path.expanduser(output_path)
+    CONFIG.profile = set(profile)
+    CONFIG.trace_memory = set(trace_memory)
+    CONFIG.profile_dir = profile_dir or os.path.dirname(
+        os.path.abspath(CONFIG.output_path))
+
+
+def disable():
+    """
+    Stop recording instrumented calls.
+    """
+    CONFIG.output_path = None
+    CONFIG.profile = set()
+    CONFIG.trace_memory = set()
+
+
+def resident_memory():
+    """
+    Read the resident set size of the current process.
+
+    Returns:
+    - int: Resident memory in bytes, or None where /proc is unavailable.
+    """
+    try:
+        with open('/proc/self/statm', encoding='ascii') as handle:
+            return int(handle.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return None
+
+
+def call_name(func, args):
+    """
+    Name an instrumented call.
+
+    Args:
+    - func (callable): The undecorated function.
+    - args (tuple): Positional arguments of the call.
+
+    Returns:
+    - str: '<Class>.<method>' for methods and class methods,
+    '<module>.<function>' otherwise.
+    """
+    if '.' in func.__qualname__ and args:
+        owner = args[0] if isinstance(args[0], type) else type(args[0])
+        return f'{owner.__name__}.{func.__name__}'
+    return f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+
+def count_rows(args, result):
+    """
+    Find the number of rows an instrumented call processed.
+
+    Args:
+    - args (tuple): Positional arguments of the call.
+    - result: Return value of the call.
+
+    Returns:
+    - int: Rows of the instance's `data` for analysis methods, else of the
+    first DataFrame or Series argument or result; None if there is none.
+    """
+    data = getattr(args[0], 'data', None) if args else None
+    candidates = [data, *args, result]
+    if isinstance(result, tuple):
+        candidates.extend(result)
+    for candidate in candidates:
+        if isinstance(candidate, (pd.DataFrame, pd.Series)):
+            return len(candidate)
+    return None
+
+
+def write_record(record):
+    """
+    Append one record to the instrumentation output.
+
+    Args:
+    - record (dict): The record to write as a JSON line.
+    """
+    with CONFIG.lock:
+        with open(CONFIG.output_path, 'a', encoding='utf-8') as handle:
+            handle.write(json.dumps(record, default=str) + '\n')
+
+
+def instrumented(func):
+    """
+    Decorate a function or method so its calls are recorded while
+    instrumentation is enabled.
+
+    Args:
+    - func (callable): The function to instrument.
+
+    Returns:
+    - callable: The wrapped function.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if CONFIG.output_path is None:
+            return func(*args, **kwargs)
+        return _record_call(func, args, kwargs)
+    return wrapper
+
+
+def _record_call(func, args, kwargs):
+    """
+    Run one instrumented call and write its record.
+
+    Args:
+    - func (callable): The undecorated function.
+    - args (tuple): Positional arguments of the call.
+    - kwargs (dict): Keyword arguments of the call.
+
+    Returns:
+    - The return value of the call.
+    """
+    name = call_name(func, args)
+    record = {'call': name, 'depth': _DEPTH.get(), 'pid': os.getpid(),
+              'started': time.time()}
+    profiler = cProfile.Profile() if name in CONFIG.profile else None
+    # tracemalloc may already be running for an enclosing call.
+    trace = name in CONFIG.trace_memory and not tracemalloc.is_tracing()
+    if trace:
+        tracemalloc.start()
+    memory = resident_memory()
+    token = _DEPTH.set(record['depth'] + 1)
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        if profiler is not None:
+            result = profiler.runcall(func, *args, **kwargs)
+        else:
+            result = func(*args, **kwargs)
+    except Exception as error:
+        record['error'] = repr(error)
+        raise
+    else:
+        record['rows'] = count_rows(args, result)
+    finally:
+        record['wall_seconds'] = time.perf_counter() - wall
+        record['cpu_seconds'] = time.process_time() - cpu
+        _DEPTH.reset(token)
+        after = resident_memory()
+        record['memory_delta_mb'] = None if memory is None else \
+            (after - memory) / 2 ** 20
+        if profiler is not None:
+            record['profile_path'] = _dump_profile(profiler, name)
+        if trace:
+            record.update(_tracemalloc_summary())
+            tracemalloc.stop()
+        write_record(record)
+    return result
+
+
+def _dump_profile(profiler, name):
+    """
+    Write the stats of a profiled call to the profile directory.
+
+    Args:
+    - profiler (cProfile.Profile): Profiler that ran the call.
+    - name (str): Name of the call.
+
+    Returns:
+    - str: Path of the stats file, readable with `pstats`.
+    """
+    os.makedirs(CONFIG.profile_dir, exist_ok=True)
+    path = os.path.join(
+        CONFIG.profile_dir,
+        f'{name}.{os.getpid()}.{time.time_ns()}.prof')
+    profiler.dump_stats(path)
+    return path
+
+
+def _tracemalloc_summary():
+    """
+    Summarize the allocations traced during a call.
+
+    Returns:
+    - dict: The `tracemalloc_peak_mb` and the `tracemalloc_top` source
+    lines still holding the most memory.
+    """
+    _, peak = tracemalloc.get_traced_memory()
+    stats = tracemalloc.take_snapshot().statistics('lineno')
+    return {
+        'tracemalloc_peak_mb': peak / 2 ** 20,
+        'tracemalloc_top': [
+            {'line': str(stat.traceback), 'size_mb': stat.size / 2 ** 20}
+            for stat in stats[:TRACEMALLOC_TOP]]}
+
+
+def measure(func, args=(), kwargs=None, memory=True):
+    """
+    Call a function and measure its wall time and peak memory.
+
+    `tracemalloc` roughly doubles the cost of allocation-heavy code such
+    as CSV parsing, so the time comes from an untraced call and the peak
+    memory from a second, traced call.
+
+    Args:
+    - func (callable): The function to call.
+    - args (tuple): Positional arguments passed to `func`.
+    - kwargs (dict): Keyword arguments passed to `func`.
+    - memory (bool): Also measure the peak memory.
+
+    Returns:
+    - tuple: The result of the untraced call and a dict with its `seconds`
+    and, when `memory` is set, the `peak_mb` of allocations traced by
+    `tracemalloc`, which covers NumPy and pandas buffers.
+    """
+    kwargs = kwargs or {}
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    metrics = {'seconds': time.perf_counter() - start}
+    if memory:
+        tracemalloc.start()
+        try:
+            func(*args, **kwargs)
+            metrics['peak_mb'] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        finally:
+            tracemalloc.stop()
+    return result, metrics
+
+
+def read_records(path):
+    """
+    Read instrumentation records.
+
+    Args:
+    - path (str): JSON-lines file written while instrumentation was on.
+
+    Returns:
+    - pandas DataFrame: One row per recorded call.
+    """
+    with open(os.path.expanduser(path), encoding='utf-8') as handle:
+        return pd.DataFrame([json.loads(line) for line in handle if line])
+
+
+def summarize(records):
+    """
+    Aggregate instrumentation records per call name.
+
+    Args:
+    - records (pandas DataFrame): Records from `read_records`.
+
+    Returns:
+    - pandas DataFrame: Per call name, the number of `calls`, the total
+    and mean wall time, the total CPU time, the rows processed, the rows
+    per second and the largest memory delta, slowest first.
+    """
+    summary = records.groupby('call').agg(
+        calls=('wall_seconds', 'size'),
+        wall_seconds=('wall_seconds', 'sum'),
+        mean_wall_seconds=('wall_seconds', 'mean'),
+        cpu_seconds=('cpu_seconds', 'sum'),
+        rows=('rows', 'sum'),
+        max_memory_delta_mb=('memory_delta_mb', 'max'))
+    summary['rows_per_second'] = summary['rows'] / summary['wall_seconds']
+    return summary.sort_values('wall_seconds', ascending=False)
+
+
+if os.environ.get(ENV_VARIABLE):
+    enable(os.environ[ENV_VARIABLE],
+           profile=filter(None, os.environ.get(PROFILE_VARIABLE, '').split(
+               ',')),
+           trace_memory=filter(None, os.environ.get(
+               TRACEMALLOC_VARIABLE, '').split(',')))
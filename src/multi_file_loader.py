@@ -0,0 +1,217 @@
+#!/usr/bin/python3
+"""
+This module loads the financial news dataset from many CSV files, such as
+daily or per-partner exports, given as a glob pattern or a list of paths.
+
+Files are read and parsed concurrently in a thread pool (the CSV parser
+and the date parsing release the GIL for most of their work) with a
+bounded number of files read ahead, so the first files can be analysed
+while later ones are still loading. Every file is checked for the
+required columns and rows already seen in an earlier file, by `url` or by
+the unnamed index column, are dropped.
+"""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import glob
+from itertools import islice
+import os
+import numpy as np
+import pandas as pd
+from src.data_loader import NEWS_COLUMNS, concat_chunks, load_news_data
+from src.instrumentation import instrumented
+
+# Name pandas gives the unnamed index column written by DataFrame.to_csv.
+INDEX_COLUMN = 'Unnamed: 0'
+DEDUP_KEYS = {'url': 'url', 'index': INDEX_COLUMN}
+DEFAULT_PREFETCH = 2
+GLOB_CHARACTERS = '*?['
+
+
+def is_file_set(data_path):
+    """
+    Check whether a data path names several files.
+
+    Args:
+    - data_path (str or list): A path, a glob pattern or a list of them;
+    anything else, such as an open file, is a single file.
+
+    Returns:
+    - bool: True for lists, tuples and glob patterns.
+    """
+    if isinstance(data_path, (list, tuple)):
+        return True
+    return isinstance(data_path, (str, os.PathLike)) and any(
+        char in str(data_path) for char in GLOB_CHARACTERS)
+
+
+def expand_paths(paths):
+    """
+    Expand glob patterns into the files they match.
+
+    Args:
+    - paths (str or list): A path, a glob pattern or a list of them.
+
+    Returns:
+    - list: Matching file paths, each pattern's matches sorted, without
+    repeats.
+
+    Raises:
+    - FileNotFoundError: If nothing matches.
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+    expanded = []
+    for path in paths:
+        path = os.path.expanduser(str(path))
+        if is_file_set(path):
+            expanded.extend(sorted(glob.glob(path)))
+        else:
+            expanded.append(path)
+    if not expanded:
+        raise FileNotFoundError(f"no dataset files match {paths}")
+    return list(dict.fromkeys(expanded))
+
+
+def check_schema(path, columns):
+    """
+    Check that a CSV file has the columns to be read.
+
+    Args:
+    - path (str): The CSV file.
+    - columns (list): Required columns.
+
+    Raises:
+    - ValueError: If a required column is missing from the header.
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    missing = [column for column in columns if column not in header]
+    if missing:
+        raise ValueError(f"{path} is missing columns {missing}; "
+                         f"its header is {list(header)}")
+
+
+def read_news_file(path, columns):
+    """
+    Check and load one file with the typed loader.
+
+    Args:
+    - path (str): The CSV file.
+    - columns (list): Columns to read.
+
+    Returns:
+    - pandas DataFrame: The typed rows of the file.
+    """
+    check_schema(path, columns)
+    return load_news_data(path, columns)
+
+
+def drop_seen(frame, key, seen):
+    """
+    Drop rows whose key was seen before, in this or an earlier frame.
+
+    Rows with a missing key are kept.
+
+    Args:
+    - frame (pandas DataFrame): Rows of one file.
+    - key (str): Column identifying an article.
+    - seen (set): Hashes of the keys seen so far; updated in place.
+
+    Returns:
+    - pandas DataFrame: The new rows, with the number of dropped rows in
+    `attrs['duplicates']`.
+    """
+    values = frame[key]
+    hashes = pd.util.hash_array(values.to_numpy(dtype=object))
+    repeated = pd.Series(hashes).duplicated().to_numpy() | np.fromiter(
+        (value in seen for value in hashes.tolist()), bool, len(hashes))
+    repeated &= values.notna().to_numpy()
+    seen.update(hashes[values.notna().to_numpy()].tolist())
+    duplicates = int(repeated.sum())
+    if duplicates:
+        frame = frame[~repeated]
+    frame.attrs['duplicates'] = duplicates
+    return frame
+
+
+def iter_news_files(paths, columns=None, dedup_on='url', workers=None,
+                    prefetch=DEFAULT_PREFETCH):
+    """
+    Read dataset files concurrently and yield them in order.
+
+    At most `workers + prefetch` files are being read or waiting to be
+    consumed at any time, which bounds memory to that many files.
+
+    Args:
+    - paths (str or list): A path, a glob pattern or a list of them.
+    - columns (list): Columns to read. Defaults to every news column.
+    - dedup_on (str): 'url', 'index' (the unnamed index column) or None
+    to keep repeated rows. The unnamed index restarts in every export, so
+    it only identifies rows across files split from one export.
+    - workers (int): Number of reading threads. Defaults to the number of
+    CPUs, at most the number of files.
+    - prefetch (int): Number of files read ahead of the consumer beyond
+    those being read.
+
+    Yields:
+    - pandas DataFrame: The typed, deduplicated rows of the next file,
+    with the number of dropped rows in `attrs['duplicates']`.
+    """
+    if dedup_on is not None and dedup_on not in DEDUP_KEYS:
+        raise ValueError(f"dedup_on must be one of {sorted(DEDUP_KEYS)} "
+                         f"or None, got {dedup_on!r}")
+    paths = expand_paths(paths)
+    columns = list(columns or NEWS_COLUMNS)
+    key = DEDUP_KEYS.get(dedup_on)
+    read_columns = columns if key is None or key in columns \
+        else columns + [key]
+    workers = workers or min(len(paths), os.cpu_count())
+    remaining = iter(paths)
+    seen = set()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque(
+            pool.submit(read_news_file, path, read_columns)
+            for path in islice(remaining, workers + prefetch))
+        try:
+            while pending:
+                frame = pending.popleft().result()
+                path = next(remaining, None)
+                if path is not None:
+                    pending.append(
+                        pool.submit(read_news_file, path, read_columns))
+                if key is None:
+                    frame.attrs['duplicates'] = 0
+                    yield frame
+                    continue
+                frame = drop_seen(frame, key, seen)
+                yield frame if key in columns else frame.drop(columns=key)
+        finally:
+            # A consumer that stops early should not wait for files it
+            # will never see.
+            for future in pending:
+                future.cancel()
+
+
+@instrumented
+def load_news_files(paths, columns=None, dedup_on='url', workers=None,
+                    prefetch=DEFAULT_PREFETCH):
+    """
+    Load and concatenate dataset files.
+
+    Args:
+    - paths (str or list): A path, a glob pattern or a list of them.
+    - columns (list): Columns to read. Defaults to every news column.
+    - dedup_on (str): 'url', 'index' or None; see `iter_news_files`.
+    - workers (int): Number of reading threads.
+    - prefetch (int): Number of files read ahead of the consumer.
+
+    Returns:
+    - pandas DataFrame: The typed rows of every file with a fresh
+    RangeIndex, the total of dropped rows in `attrs['duplicates']` and,
+    when `date` is read, of unparseable dates in `attrs['bad_dates']`.
+    """
+    frames = list(iter_news_files(paths, columns, dedup_on, workers,
+                                  prefetch))
+    data = concat_chunks(frames)
+    data.attrs['duplicates'] = sum(
+        frame.attrs['duplicates'] for frame in frames)
+    return data
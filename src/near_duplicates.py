@@ -0,0 +1,289 @@
+#!/usr/bin/python3
+"""
+This module provides `StoryClusterer`, which groups syndicated and
+templated copies of the same story into near-duplicate clusters without
+comparing every pair of headlines.
+
+Each distinct headline gets a MinHash signature of its word shingles,
+computed for a batch of shingles at a time with NumPy. Locality-sensitive
+hashing then buckets headlines whose signatures agree on a whole band of
+rows. Candidates are verified by their estimated Jaccard similarity and
+joined into connected components. The work grows linearly with the number
+of rows. Only headlines published in the same window of days are joined,
+so a daily roundup such as 'Stocks That Hit 52-Week Highs On Friday' is
+one story per day rather than one story for the whole dataset.
+"""
+import numpy as np
+import pandas as pd
+from scipy import sparse as sp
+from scipy.sparse.csgraph import connected_components
+from src.frequency_matrix import day_numbers
+from src.instrumentation import instrumented
+from src.news_statistics import ensure_datetime
+
+DEFAULT_PERMUTATIONS = 128
+DEFAULT_BANDS = 32
+DEFAULT_THRESHOLD = 0.6
+MAX_HASH = (1 << 32) - 1
+# Shingles hashed against every permutation, or candidate pairs compared,
+# at a time; bounds the temporary arrays to about 100 MB.
+SHINGLE_BATCH = 100000
+
+
+def headline_shingles(headlines, size=2):
+    """
+    Hash the word shingles of headlines.
+
+    Headlines are lowercased and split into runs of letters and digits;
+    a headline with fewer than `size` words has its words as shingles.
+
+    Args:
+    - headlines (pandas Series): Distinct, non-missing headlines.
+    - size (int): Number of consecutive words per shingle.
+
+    Returns:
+    - tuple: The 32-bit hash of every shingle as uint64, grouped by
+    headline in order, and the number of distinct shingles of each
+    headline.
+    """
+    words = headlines.reset_index(drop=True).str.lower().str.findall(
+        r'[a-z0-9]+').explode().dropna()
+    docs = words.index.to_numpy()
+    words = words.to_numpy(dtype=object)
+    # Words of a headline are contiguous, so a shingle starts wherever the
+    # word `size - 1` places later belongs to the same headline.
+    starts = np.flatnonzero(docs[size - 1:] == docs[:len(docs) - size + 1])
+    shingles, owners = words[starts], docs[starts]
+    for offset in range(1, size):
+        shingles = shingles + ' ' + words[starts + offset]
+    lengths = np.bincount(docs, minlength=len(headlines))
+    # Headlines too short for a full shingle fall back to their words.
+    short = np.isin(docs, np.flatnonzero(lengths < size))
+    if size > 1 and short.any():
+        shingles = np.concatenate([shingles, words[short]])
+        owners = np.concatenate([owners, docs[short]])
+    order = np.argsort(owners, kind='stable')
+    hashes = pd.util.hash_array(shingles[order]) & np.uint64(MAX_HASH)
+    owners = owners[order]
+    # Repeated shingles of a headline count once.
+    pairs = pd.DataFrame({'doc': owners, 'hash': hashes}).drop_duplicates()
+    return pairs['hash'].to_numpy(), np.bincount(
+        pairs['doc'].to_numpy(), minlength=len(headlines))
+
+
+def minhash_signatures(hashes, counts, permutations=DEFAULT_PERMUTATIONS,
+                       seed=1):
+    """
+    Compute the MinHash signature of every headline.
+
+    Permutation i maps a 32-bit shingle hash h to the high 32 bits of
+    a_i * h + b_i modulo 2^64 (multiply-add-shift hashing with odd a_i),
+    and the signature keeps the minimum per headline.
+
+    Args:
+    - hashes (numpy array): 32-bit shingle hashes grouped by headline.
+    - counts (numpy array): Number of shingles of each headline.
+    - permutations (int): Length of the signatures.
+    - seed (int): Seed of the permutation coefficients.
+
+    Returns:
+    - numpy array: Headlines x permutations uint32 signatures; headlines
+    without shingles have all-max rows.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, 1 << 63, (permutations, 1), dtype=np.uint64) * \
+        np.uint64(2) + np.uint64(1)
+    b = rng.integers(0, 1 << 63, (permutations, 1), dtype=np.uint64)
+    signatures = np.full((len(counts), permutations), MAX_HASH,
+                         dtype=np.uint32)
+    ends = np.cumsum(counts)
+    docs = np.flatnonzero(counts)
+    start_doc = 0
+    while start_doc < len(docs):
+        first = ends[docs[start_doc]] - counts[docs[start_doc]]
+        stop_doc = max(start_doc + 1, int(np.searchsorted(
+            ends[docs], first + SHINGLE_BATCH, side='right')))
+        batch = docs[start_doc:stop_doc]
+        # Permutations along the rows keep each headline's shingles
+        # contiguous for the reduction.
+        values = (a * hashes[first:ends[batch[-1]]] + b) >> np.uint64(32)
+        offsets = ends[batch] - counts[batch] - first
+        signatures[batch] = np.minimum.reduceat(values, offsets, axis=1).T
+        start_doc = stop_doc
+    return signatures
+
+
+def first_positions(codes):
+    """
+    Find where each code of `pandas.factorize` first appears.
+
+    Args:
+    - codes (numpy array): Codes numbered by first appearance.
+
+    Returns:
+    - numpy array: Position of the first occurrence of each code.
+    """
+    if not len(codes):
+        return np.empty(0, dtype='int64')
+    return np.flatnonzero(np.diff(np.maximum.accumulate(codes),
+                                  prepend=-1) > 0)
+
+
+def similar(signatures, left, right, threshold):
+    """
+    Check pairs of headlines by the share of their signatures that agree,
+    which estimates their Jaccard similarity.
+
+    Args:
+    - signatures (numpy array): MinHash signatures of the headlines.
+    - left (numpy array): First headline of each pair.
+    - right (numpy array): Second headline of each pair.
+    - threshold (float): Minimum estimated similarity.
+
+    Returns:
+    - numpy array: Whether each pair reaches the threshold.
+    """
+    matched = np.empty(len(left), dtype=bool)
+    # Compared in batches so only a slice of the pairs' signatures is
+    # gathered at a time.
+    for start in range(0, len(left), SHINGLE_BATCH):
+        stop = start + SHINGLE_BATCH
+        matched[start:stop] = (signatures[left[start:stop]] ==
+                               signatures[right[start:stop]]).mean(
+            axis=1) >= threshold
+    return matched
+
+
+class StoryClusterer:
+    """
+    Assign a story ID to every row, shared by near-duplicate headlines
+    published in the same window of days.
+
+    Parameters:
+    - threshold (float): Estimated Jaccard similarity of the word
+    shingles above which two headlines are the same story.
+    - window_days (int): Length of the windows, in calendar days since
+    the epoch, within which headlines are joined, or None to ignore dates.
+    - shingle_size (int): Number of consecutive words per shingle.
+    - permutations (int): Length of the MinHash signatures.
+    - bands (int): Number of LSH bands; must divide `permutations`. More
+    bands find more candidate pairs of lower similarity.
+    - seed (int): Seed of the MinHash permutations.
+    """
+    def __init__(self, threshold=DEFAULT_THRESHOLD, window_days=1,
+                 shingle_size=2, permutations=DEFAULT_PERMUTATIONS,
+                 bands=DEFAULT_BANDS, seed=1):
+        """
+        Initialize the StoryClusterer object.
+
+        Args:
+        - threshold (float): Minimum estimated Jaccard similarity.
+        - window_days (int): Day window length, or None.
+        - shingle_size (int): Words per shingle.
+        - permutations (int): MinHash signature length.
+        - bands (int): Number of LSH bands.
+        - seed (int): Seed of the MinHash permutations.
+        """
+        if permutations % bands:
+            raise ValueError(f"bands ({bands}) must divide permutations "
+                             f"({permutations})")
+        self.threshold = threshold
+        self.window_days = window_days
+        self.shingle_size = shingle_size
+        self.permutations = permutations
+        self.bands = bands
+        self.seed = seed
+        self.report = {}
+
+    @instrumented
+    def cluster(self, data):
+        """
+        Cluster the rows of the financial news data into stories.
+
+        Args:
+        - data (pandas DataFrame): Data with a `headline` column, and a
+        `date` column unless `window_days` is None.
+
+        Returns:
+        - pandas Series: Integer story ID of each row, aligned with `data`
+        and numbered by first appearance. Rows without a headline are
+        their own story. The number of `rows`, distinct `headlines`,
+        `candidates` checked, `matches` kept and `stories` are recorded
+        in `report`.
+        """
+        codes, uniques = pd.factorize(data['headline'])
+        hashes, counts = headline_shingles(
+            pd.Series(np.asarray(uniques, dtype=object)), self.shingle_size)
+        signatures = minhash_signatures(
+            hashes, counts, self.permutations, self.seed)
+        if self.window_days is None:
+            windows = np.zeros(len(data), dtype='int64')
+        else:
+            windows = day_numbers(ensure_datetime(data)) // self.window_days
+        windows, window_values = pd.factorize(windows)
+        width = max(len(window_values), 1)
+        # Items are the distinct (headline, window) pairs, packed into one
+        # integer so they factorize without building tuples.
+        present = codes >= 0
+        item_of_row = np.full(len(data), -1, dtype='int64')
+        item_of_row[present], items = pd.factorize(
+            codes[present].astype('int64') * width + windows[present])
+        item_codes, item_windows = np.divmod(items, width)
+        sources, targets = self._candidates(
+            signatures, item_codes, item_windows, width,
+            counts[item_codes] > 0)
+        matched = similar(signatures, item_codes[sources],
+                          item_codes[targets], self.threshold)
+        graph = sp.coo_matrix(
+            (np.ones(int(matched.sum()), dtype='int8'),
+             (sources[matched], targets[matched])),
+            shape=(len(items), len(items)))
+        _, labels = connected_components(graph, directed=False)
+        row_labels = np.where(
+            present, labels[np.maximum(item_of_row, 0)],
+            len(items) + np.cumsum(~present) - 1)
+        stories, _ = pd.factorize(row_labels)
+        self.report = {'rows': len(data), 'headlines': len(uniques),
+                       'candidates': len(sources),
+                       'matches': int(matched.sum()),
+                       'stories': int(stories.max()) + 1 if len(data) else 0}
+        return pd.Series(stories, index=data.index, name='story_id')
+
+    def _candidates(self, signatures, item_codes, item_windows, width,
+                    hashable):
+        """
+        Find candidate pairs of items with locality-sensitive hashing.
+
+        In each band, items of one window whose signatures agree on every
+        row of the band share a bucket, and each is paired with the
+        bucket's first item.
+
+        Args:
+        - signatures (numpy array): Signatures of the distinct headlines.
+        - item_codes (numpy array): Headline of each item.
+        - item_windows (numpy array): Window code of each item.
+        - width (int): Number of window codes.
+        - hashable (numpy array): Whether each item's headline has
+        shingles; the others are never candidates.
+
+        Returns:
+        - tuple: Source and target item arrays of the distinct candidate
+        pairs.
+        """
+        rows = self.permutations // self.bands
+        candidates = np.flatnonzero(hashable)
+        pairs = []
+        for band in range(self.bands):
+            band_codes, _ = pd.factorize(pd.util.hash_pandas_object(
+                pd.DataFrame(signatures[:, band * rows:(band + 1) * rows]),
+                index=False))
+            buckets, _ = pd.factorize(
+                band_codes[item_codes[candidates]].astype('int64') * width +
+                item_windows[candidates])
+            leader = candidates[first_positions(buckets)[buckets]]
+            paired = leader != candidates
+            pairs.append(candidates[paired] * len(item_codes) +
+                         leader[paired])
+        pairs = pd.unique(np.concatenate(pairs)) if pairs else \
+            np.empty(0, dtype='int64')
+        return np.divmod(pairs, len(item_codes))
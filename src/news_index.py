@@ -0,0 +1,212 @@
+#!/usr/bin/python3
+"""
+This module provides `NewsIndex`, a (stock, date) index over the financial
+news data for narrow interactive queries such as "articles for TSLA in
+March 2020".
+
+The rows are ordered once by ticker and publication time, and an offset
+table records where each ticker's block starts, so a query is a binary
+search for the ticker's date bounds followed by a slice of the ordered row
+positions. Query results are kept in a bounded LRU cache.
+"""
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from src.news_statistics import ensure_datetime
+
+DEFAULT_CACHE_SIZE = 256
+
+
+def timestamp_ns(value, tz):
+    """
+    Convert a query bound to nanoseconds since the epoch.
+
+    Args:
+    - value (str or datetime): The bound; naive values are taken to be in
+    the timezone of the data.
+    - tz (tzinfo): Timezone of the indexed dates, or None when they are
+    naive.
+
+    Returns:
+    - int: The bound in the same nanosecond scale as the indexed dates.
+    """
+    value = pd.Timestamp(value)
+    if tz is not None:
+        value = value.tz_localize(tz) if value.tz is None else \
+            value.tz_convert(tz)
+    elif value.tz is not None:
+        value = value.tz_convert('UTC').tz_localize(None)
+    return value.value
+
+
+class NewsIndex:
+    """
+    Row positions of the financial news data ordered by (stock, date).
+
+    Queries take a ticker and a half-open [start, end) range of
+    publication times; either bound may be omitted. Results are cached
+    per index under the query arguments, so bounds must be hashable, and
+    must be treated as read-only.
+
+    Attributes:
+    - data (pandas DataFrame): The indexed data, in its original order.
+    - tickers (pandas Index): Sorted tickers.
+    - offsets (numpy array): Position in `positions` where each ticker's
+    block starts, followed by the total number of indexed rows.
+    - positions (numpy array): Row positions of `data` ordered by ticker
+    and then publication time; rows without a ticker are left out.
+    - dates (numpy array): Publication times of `positions` as int64
+    nanoseconds, NaT first within each ticker.
+    """
+    def __init__(self, data, cache_size=DEFAULT_CACHE_SIZE):
+        """
+        Initialize the NewsIndex object by ordering the rows once.
+
+        Args:
+        - data (pandas DataFrame): Data with `stock` and `date` columns.
+        - cache_size (int): Number of query results kept in the LRU cache.
+        """
+        dates = ensure_datetime(data)
+        codes, tickers = pd.factorize(data['stock'], sort=True)
+        self.tickers = pd.Index(np.asarray(tickers))
+        nanoseconds = dates.array.asi8
+        positions = np.lexsort((nanoseconds, codes))
+        self.positions = positions[codes[positions] >= 0]
+        self.dates = nanoseconds[self.positions]
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(
+            codes[codes >= 0], minlength=len(self.tickers)))])
+        self.data = data
+        self.tz = dates.dt.tz
+        self.cache_size = cache_size
+        self._results = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def bounds(self, stock, start=None, end=None):
+        """
+        Find the slice of `positions` holding a ticker's rows in a range.
+
+        Rows without a date only match a query without bounds.
+
+        Args:
+        - stock (str): The ticker.
+        - start (str or datetime): First publication time included.
+        - end (str or datetime): Publication time at which the range ends,
+        excluded.
+
+        Returns:
+        - tuple: Start and stop of the slice; equal when nothing matches.
+        """
+        try:
+            code = self.tickers.get_loc(stock)
+        except KeyError:
+            return 0, 0
+        lo, hi = self.offsets[code], self.offsets[code + 1]
+        block = self.dates[lo:hi]
+        if start is not None:
+            lo += np.searchsorted(block, timestamp_ns(start, self.tz))
+        elif end is not None:
+            # Undated rows sort first and fall in no bounded range.
+            lo += np.searchsorted(block, pd.NaT.value, side='right')
+        if end is not None:
+            hi = self.offsets[code] + np.searchsorted(
+                block, timestamp_ns(end, self.tz))
+        return int(lo), int(max(lo, hi))
+
+    def _cached(self, key, compute):
+        """
+        Serve a query result from the LRU cache, computing it on a miss.
+
+        Args:
+        - key (tuple): The query name and its arguments.
+        - compute (callable): Function of no arguments computing the
+        result.
+
+        Returns:
+        - object: The cached or computed result.
+        """
+        if key in self._results:
+            self._hits += 1
+            self._results.move_to_end(key)
+            return self._results[key]
+        self._misses += 1
+        result = compute()
+        self._results[key] = result
+        if len(self._results) > self.cache_size:
+            self._results.popitem(last=False)
+        return result
+
+    def articles(self, stock, start=None, end=None):
+        """
+        Rows of one ticker in a range of publication times.
+
+        Args:
+        - stock (str): The ticker.
+        - start (str or datetime): First publication time included.
+        - end (str or datetime): End of the range, excluded.
+
+        Returns:
+        - pandas DataFrame: The matching rows in publication order, with
+        their original index labels.
+        """
+        def compute():
+            lo, hi = self.bounds(stock, start, end)
+            return self.data.iloc[self.positions[lo:hi]]
+        return self._cached(('articles', stock, start, end), compute)
+
+    def count(self, stock, start=None, end=None):
+        """
+        Number of articles of one ticker in a range of publication times.
+
+        Args:
+        - stock (str): The ticker.
+        - start (str or datetime): First publication time included.
+        - end (str or datetime): End of the range, excluded.
+
+        Returns:
+        - int: The number of matching rows.
+        """
+        def compute():
+            lo, hi = self.bounds(stock, start, end)
+            return hi - lo
+        return self._cached(('count', stock, start, end), compute)
+
+    def top_publishers(self, stock, start=None, end=None, n=10):
+        """
+        Most frequent publishers of one ticker in a range of publication
+        times.
+
+        Args:
+        - stock (str): The ticker.
+        - start (str or datetime): First publication time included.
+        - end (str or datetime): End of the range, excluded.
+        - n (int): Number of publishers to return.
+
+        Returns:
+        - pandas Series: Articles per publisher, most frequent first.
+        """
+        def compute():
+            lo, hi = self.bounds(stock, start, end)
+            publishers = self.data['publisher']
+            if not isinstance(publishers.dtype, pd.CategoricalDtype):
+                return publishers.iloc[self.positions[lo:hi]].value_counts(
+                    ).head(n)
+            # Counting the codes of the slice avoids counting every
+            # category of the column.
+            codes = publishers.cat.codes.to_numpy()[self.positions[lo:hi]]
+            codes, counts = np.unique(codes[codes >= 0], return_counts=True)
+            top = np.argsort(-counts, kind='stable')[:n]
+            return pd.Series(counts[top], name='count', index=pd.Index(
+                publishers.cat.categories[codes[top]], name='publisher'))
+        return self._cached(('top_publishers', stock, start, end, n), compute)
+
+    def cache_info(self):
+        """
+        Describe the result cache, like `functools.lru_cache`.
+
+        Returns:
+        - dict: The `hits`, `misses`, number of cached results
+        (`currsize`) and `maxsize`.
+        """
+        return {'hits': self._hits, 'misses': self._misses,
+                'currsize': len(self._results), 'maxsize': self.cache_size}
@@ -0,0 +1,311 @@
+#!/usr/bin/python3
+"""
+This module provides the NewsStatistics class, which computes every
+aggregate used by the analysis classes in a single vectorized pass over
+the financial news data and keeps them for later reporting and plotting.
+"""
+from datetime import date
+import numpy as np
+import pandas as pd
+from src.data_loader import parse_date_column
+from src.instrumentation import instrumented
+
+DESCRIBE_INDEX = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+# Aggregates ordered by key rather than by frequency.
+SORTED_BY_KEY = ['length_counts', 'hour_counts']
+AGGREGATES = {
+    'length_counts': 'headline_length', 'publisher_counts': 'publisher',
+    'date_counts': 'date', 'hour_counts': 'hour', 'stock_counts': 'stock'}
+
+
+def count_values(values):
+    """
+    Count occurrences of each value, dropping unused categories.
+
+    Args:
+    - values (pandas Series): The values to count.
+
+    Returns:
+    - pandas Series: Occurrences per value, most frequent first.
+    """
+    counts = values.value_counts()
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        counts = counts[counts > 0]
+        counts.index = counts.index.astype(values.cat.categories.dtype)
+    return counts
+
+
+def ensure_datetime(data):
+    """
+    Parse the `date` column of a DataFrame in place unless it already
+    holds datetimes, so it is parsed at most once per dataset.
+
+    Args:
+    - data (pandas DataFrame): The financial news data.
+
+    Returns:
+    - pandas Series: The parsed `date` column. When it had to be parsed,
+    the number of unparseable dates is kept in `data.attrs['bad_dates']`.
+    """
+    if not pd.api.types.is_datetime64_any_dtype(data['date']):
+        data['date'], data.attrs['bad_dates'] = parse_date_column(
+            data['date'])
+    return data['date']
+
+
+class NewsStatistics:
+    """
+    Aggregates of the financial news data computed in one pass.
+
+    Attributes:
+    - rows (int): Number of rows the aggregates were computed from.
+    - length_counts (pandas Series): Number of headlines of each length.
+    - publisher_counts (pandas Series): Number of articles per publisher.
+    - date_counts (pandas Series): Number of articles per publication date.
+    - hour_counts (pandas Series): Number of articles per hour of the day.
+    - stock_counts (pandas Series): Number of articles per stock ticker.
+
+    Aggregates whose source column is missing are None. Because every
+    aggregate is a count, results computed on separate parts of the data
+    can be combined exactly with `merge`; the headline length counts act
+    as an exact, mergeable quantile sketch since lengths are bounded
+    integers.
+    """
+    def __init__(self, rows=0, length_counts=None, publisher_counts=None,
+                 date_counts=None, hour_counts=None, stock_counts=None):
+        """
+        Initialize the NewsStatistics object.
+
+        Args:
+        - rows (int): Number of rows the aggregates were computed from.
+        - length_counts (pandas Series): Headline length counts.
+        - publisher_counts (pandas Series): Articles per publisher.
+        - date_counts (pandas Series): Articles per publication date.
+        - hour_counts (pandas Series): Articles per hour of the day.
+        - stock_counts (pandas Series): Articles per stock ticker.
+        """
+        self.rows = rows
+        self.length_counts = length_counts
+        self.publisher_counts = publisher_counts
+        self.date_counts = date_counts
+        self.hour_counts = hour_counts
+        self.stock_counts = stock_counts
+
+    @classmethod
+    def empty(cls):
+        """
+        Create aggregates of no rows, with every aggregate an empty count.
+
+        Returns:
+        - NewsStatistics: Aggregates that other statistics can be merged
+        into and that report empty results.
+        """
+        return cls(**{name: pd.Series(dtype='int64', index=pd.Index(
+            [], name=key)) for name, key in AGGREGATES.items()})
+
+    @classmethod
+    @instrumented
+    def from_frame(cls, data):
+        """
+        Compute all aggregates from a DataFrame.
+
+        The `date` column is parsed in place if needed so later calls do
+        not parse it again.
+
+        Args:
+        - data (pandas DataFrame): The financial news data.
+
+        Returns:
+        - NewsStatistics: The computed aggregates.
+        """
+        stats = cls(rows=len(data))
+        if 'headline' in data:
+            lengths = data['headline'].str.len().value_counts().sort_index()
+            lengths.index = lengths.index.astype('int64')
+            stats.length_counts = lengths.rename_axis('headline_length')
+        if 'publisher' in data:
+            stats.publisher_counts = count_values(data['publisher'])
+        if 'stock' in data:
+            stats.stock_counts = count_values(data['stock'])
+        if 'date' in data:
+            dates = ensure_datetime(data)
+            # Counting normalized timestamps is much cheaper than counting
+            # one Python date object per row.
+            date_counts = dates.dt.normalize().value_counts()
+            date_counts.index = date_counts.index.date
+            stats.date_counts = date_counts.rename_axis('date')
+            hour_counts = dates.dt.hour.value_counts().sort_index()
+            hour_counts.index = hour_counts.index.astype('int64')
+            stats.hour_counts = hour_counts.rename_axis('hour')
+        return stats
+
+    def merge(self, other):
+        """
+        Combine these aggregates with ones computed on other rows.
+
+        Args:
+        - other (NewsStatistics): Aggregates of a disjoint set of rows.
+
+        Returns:
+        - NewsStatistics: Aggregates of both sets of rows.
+        """
+        merged = NewsStatistics(rows=self.rows + other.rows)
+        for name in AGGREGATES:
+            left, right = getattr(self, name), getattr(other, name)
+            if left is None or right is None:
+                counts = right if left is None else left
+            else:
+                counts = left.add(right, fill_value=0).astype('int64')
+                counts = counts.sort_index() if name in SORTED_BY_KEY \
+                    else counts.sort_values(ascending=False, kind='stable')
+            setattr(merged, name, counts)
+        return merged
+
+    def equals(self, other):
+        """
+        Check whether two sets of aggregates hold the same counts.
+
+        The order of equally frequent keys is not compared.
+
+        Args:
+        - other (NewsStatistics): Aggregates to compare with.
+
+        Returns:
+        - bool: True if the row count and every aggregate are equal.
+        """
+        if self.rows != other.rows:
+            return False
+        for name in AGGREGATES:
+            left, right = getattr(self, name), getattr(other, name)
+            if (left is None) != (right is None) or (
+                    left is not None and left.to_dict() != right.to_dict()):
+                return False
+        return True
+
+    def length_moments(self):
+        """
+        Running moments of the headline lengths.
+
+        Returns:
+        - dict: count, sum, sum of squares, min and max of the lengths.
+        """
+        lengths = self.length_counts.index.to_numpy(dtype='int64')
+        counts = self.length_counts.to_numpy(dtype='int64')
+        if not counts.sum():
+            return {'count': 0, 'sum': 0, 'sum_sq': 0,
+                    'min': None, 'max': None}
+        return {'count': int(counts.sum()),
+                'sum': int((lengths * counts).sum()),
+                'sum_sq': int((lengths ** 2 * counts).sum()),
+                'min': int(lengths.min()), 'max': int(lengths.max())}
+
+    def to_dict(self):
+        """
+        Convert the aggregates to a JSON-serializable dict.
+
+        Returns:
+        - dict: The row count and, per aggregate, its keys and counts.
+        """
+        state = {'rows': self.rows}
+        for name in AGGREGATES:
+            counts = getattr(self, name)
+            if counts is not None:
+                keys = counts.index.tolist()
+                if name == 'date_counts':
+                    keys = [key.isoformat() for key in keys]
+                state[name] = {'keys': keys, 'counts': counts.tolist()}
+        return state
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Rebuild aggregates from the output of `to_dict`.
+
+        Args:
+        - state (dict): Aggregates as returned by `to_dict`.
+
+        Returns:
+        - NewsStatistics: The rebuilt aggregates.
+        """
+        stats = cls(rows=state['rows'])
+        for name in AGGREGATES:
+            if name in state:
+                keys = state[name]['keys']
+                if name == 'date_counts':
+                    keys = [date.fromisoformat(key) for key in keys]
+                setattr(stats, name, pd.Series(
+                    state[name]['counts'], dtype='int64',
+                    index=pd.Index(keys, name=AGGREGATES[name])))
+        return stats
+
+    @property
+    def headline_stats(self):
+        """
+        Basic statistics for headline lengths, equal to
+        `Series.describe()` on the per-row lengths.
+
+        Returns:
+        - pandas Series: count, mean, std, min, quartiles and max.
+        """
+        return describe_counts(self.length_counts, 'headline_length')
+
+    def top_publishers(self, n=10):
+        """
+        Return the publishers with the most articles.
+
+        Args:
+        - n (int): Number of top publishers to return.
+
+        Returns:
+        - pandas Series: Top publishers and their article counts.
+        """
+        return self.publisher_counts.head(n)
+
+
+def describe_counts(counts, name=None):
+    """
+    Compute `Series.describe()` statistics from value counts.
+
+    Args:
+    - counts (pandas Series): Occurrences indexed by numeric value.
+    - name (str): Name of the returned Series.
+
+    Returns:
+    - pandas Series: count, mean, std, min, 25%, 50%, 75% and max.
+    """
+    counts = counts[counts > 0].sort_index()
+    values = counts.index.to_numpy(dtype='float64')
+    weights = counts.to_numpy(dtype='float64')
+    total = weights.sum()
+    if total == 0:
+        return pd.Series(
+            [0.0] + [np.nan] * 7, index=DESCRIBE_INDEX, name=name)
+    mean = (values * weights).sum() / total
+    std = np.sqrt((weights * (values - mean) ** 2).sum() / (total - 1)) \
+        if total > 1 else np.nan
+    quartiles = weighted_quantiles(values, weights, [0.25, 0.5, 0.75])
+    return pd.Series(
+        [total, mean, std, values[0], *quartiles, values[-1]],
+        index=DESCRIBE_INDEX, name=name)
+
+
+def weighted_quantiles(values, weights, quantiles):
+    """
+    Linearly interpolated quantiles of values repeated `weights` times,
+    matching numpy's default quantile method.
+
+    Args:
+    - values (numpy array): Sorted distinct values.
+    - weights (numpy array): Number of occurrences of each value.
+    - quantiles (list): Quantiles to compute, between 0 and 1.
+
+    Returns:
+    - list: One float per requested quantile.
+    """
+    cumulative = np.cumsum(weights)
+    positions = np.asarray(quantiles) * (cumulative[-1] - 1)
+    lower = values[np.searchsorted(
+        cumulative, np.floor(positions), side='right')]
+    upper = values[np.searchsorted(
+        cumulative, np.ceil(positions), side='right')]
+    return list(lower + (upper - lower) * (positions - np.floor(positions)))
@@ -0,0 +1,95 @@
+#!/usr/bin/python3
+"""
+This module provides the out-of-core backend of the analysis classes for
+datasets that do not fit in memory.
+
+The CSV file is streamed in typed chunks of bounded size, or a set of
+files one file at a time. Every chunk is
+reduced to mergeable `NewsStatistics` (or to codes of a mapped column)
+before the next one is read, so peak memory depends on the chunk size
+and the number of distinct keys, not on the number of rows.
+"""
+import numpy as np
+import pandas as pd
+from src.data_loader import DEFAULT_CHUNKSIZE, iter_news_chunks
+from src.instrumentation import instrumented
+from src.multi_file_loader import is_file_set, iter_news_files
+from src.news_statistics import NewsStatistics
+
+
+def iter_frames(data_path, columns=None, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Stream the dataset as typed DataFrames of bounded size.
+
+    Args:
+    - data_path (str or list): A CSV file, or a glob pattern or list of
+    files read concurrently and deduplicated on `url`.
+    - columns (list): Columns to read.
+    - chunksize (int): Maximum number of rows per chunk of a single file.
+
+    Returns:
+    - iterator: Chunks of a single file, or whole files of a file set.
+    """
+    if is_file_set(data_path):
+        return iter_news_files(data_path, columns)
+    return iter_news_chunks(data_path, columns, chunksize)
+
+
+@instrumented
+def streaming_statistics(data_path, columns=None,
+                         chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Compute NewsStatistics by streaming the dataset in chunks.
+
+    Args:
+    - data_path (str or list): The path to the CSV file containing the
+    financial news data, or a glob pattern or list of such files.
+    - columns (list): Columns to read. Aggregates of the other columns
+    are None.
+    - chunksize (int): Maximum number of rows held in memory at a time.
+
+    Returns:
+    - NewsStatistics: The aggregates of every row, equal to
+    `NewsStatistics.from_frame` on the fully loaded data.
+    """
+    stats = NewsStatistics()
+    for chunk in iter_frames(data_path, columns, chunksize):
+        stats = stats.merge(NewsStatistics.from_frame(chunk))
+    return stats
+
+
+@instrumented
+def streaming_map(data_path, column, func, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Apply a function to every value of one column by streaming the dataset.
+
+    `func` runs once per distinct value and the rows only keep an integer
+    code into the distinct results.
+
+    Args:
+    - data_path (str or list): The path to the CSV file containing the
+    financial news data, or a glob pattern or list of such files.
+    - column (str): The column to map, e.g. 'publisher'.
+    - func (callable): Function of one value. Missing values, and values
+    it maps to None or NaN, are missing in the result.
+    - chunksize (int): Maximum number of rows held in memory at a time.
+
+    Returns:
+    - pandas Series: Categorical with one mapped value per row, in file
+    order.
+    """
+    mapped, results, codes = {}, {}, []
+    for chunk in iter_frames(data_path, [column], chunksize):
+        chunk_codes, values = pd.factorize(chunk[column])
+        lookup = np.empty(len(values) + 1, dtype='int32')
+        # Missing values have code -1, which picks the trailing -1.
+        lookup[-1] = -1
+        for i, value in enumerate(values):
+            if value not in mapped:
+                result = func(value)
+                mapped[value] = -1 if pd.isna(result) else \
+                    results.setdefault(result, len(results))
+            lookup[i] = mapped[value]
+        codes.append(lookup[chunk_codes])
+    codes = np.concatenate(codes) if codes else np.empty(0, dtype='int32')
+    return pd.Series(pd.Categorical.from_codes(codes, list(results)))
@@ -0,0 +1,129 @@
+#!/usr/bin/python3
+"""
+This module provides partitioned, multi-process computation of the
+aggregates behind `descriptive_statistics`, `top_publishers` and
+`publication_frequency_over_time`.
+
+The CSV file is split into byte ranges of whole lines. Each worker reads
+its own ranges, parses them with the typed loader and reduces them to
+`NewsStatistics`, so parsing, encoding and counting all happen in the
+pool and only the small aggregates are sent back. Every aggregate is a
+count, so the merged result is exact. As with `IncrementalAggregator`,
+records are assumed not to contain embedded newlines.
+
+Measured on 1M synthetic rows (`headline`, `publisher`, `date`, `stock`)
+on a single CPU: the serial path takes 5.5 s. With 2 workers the parent
+process spends 0.2 s of CPU, mostly imports, and the workers 5.9 s
+between them, so nearly all of the work is split. One core runs the
+workers one after the other, so the pool takes 6.3 s there (6.9 s with 4
+workers); a speedup needs as many free cores as workers. Until one is
+measured, the analysis classes compute their aggregates serially.
+"""
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from src.data_loader import load_news_data
+from src.instrumentation import instrumented
+from src.news_statistics import NewsStatistics
+
+STATISTICS_COLUMNS = ['headline', 'publisher', 'date', 'stock']
+
+
+def file_ranges(data_path, partitions=4):
+    """
+    Split the rows of a CSV file into byte ranges of whole lines.
+
+    Args:
+    - data_path (str): The path to the CSV file containing the financial
+    news data.
+    - partitions (int): Number of ranges of similar size to produce.
+
+    Returns:
+    - tuple: The header line and a list of non-empty (start, stop) byte
+    ranges that together cover every row.
+    """
+    with open(data_path, 'rb') as handle:
+        header = handle.readline()
+        size = os.fstat(handle.fileno()).st_size
+        starts = [len(header)]
+        step = (size - len(header)) / partitions
+        for part in range(1, partitions):
+            # The line holding the byte before the target belongs to the
+            # previous range.
+            handle.seek(len(header) + int(step * part) - 1)
+            handle.readline()
+            starts.append(max(starts[-1], handle.tell()))
+    starts.append(size)
+    return header, [(start, stop) for start, stop in zip(starts, starts[1:])
+                    if stop > start]
+
+
+def count_range(data_path, header, start, stop, columns=None):
+    """
+    Parse one byte range of a CSV file and compute its aggregates.
+
+    Args:
+    - data_path (str): The path to the CSV file.
+    - header (bytes): The file's header line.
+    - start (int): Offset of the range's first line.
+    - stop (int): Offset just past the range's last line.
+    - columns (list): Columns to read. Defaults to `STATISTICS_COLUMNS`.
+
+    Returns:
+    - NewsStatistics: The aggregates of the rows in the range.
+    """
+    with open(data_path, 'rb') as handle:
+        handle.seek(start)
+        block = handle.read(stop - start)
+    return NewsStatistics.from_frame(load_news_data(
+        io.BytesIO(header + block), columns or STATISTICS_COLUMNS))
+
+
+@instrumented
+def parallel_statistics(data_path, columns=None, workers=None):
+    """
+    Compute NewsStatistics over byte ranges of a file in a process pool.
+
+    Args:
+    - data_path (str): The path to the CSV file containing the financial
+    news data.
+    - columns (list): Columns to read. Defaults to `STATISTICS_COLUMNS`;
+    aggregates of the other columns are None.
+    - workers (int): Number of worker processes. Defaults to the number of
+    CPUs; with one worker the ranges are read in process.
+
+    Returns:
+    - NewsStatistics: The merged aggregates of every row.
+    """
+    workers = workers or os.cpu_count()
+    # A few ranges per worker keep the pool busy when workers run at
+    # different speeds, and bound the bytes each holds at a time.
+    header, ranges = file_ranges(data_path, partitions=workers * 4)
+    args = ([data_path] * len(ranges), [header] * len(ranges),
+            [start for start, _ in ranges], [stop for _, stop in ranges],
+            [columns] * len(ranges))
+    if workers <= 1 or len(ranges) <= 1:
+        results = list(map(count_range, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(count_range, *args))
+    return reduce(NewsStatistics.merge, results, NewsStatistics())
+
+
+def matches_serial(data_path, columns=None, workers=None):
+    """
+    Check that the parallel path reproduces the serial aggregates.
+
+    Args:
+    - data_path (str): The path to the CSV file.
+    - columns (list): Columns to read.
+    - workers (int): Number of worker processes.
+
+    Returns:
+    - bool: True if every aggregate matches `NewsStatistics.from_frame`
+    on the fully loaded file.
+    """
+    return parallel_statistics(data_path, columns, workers).equals(
+        NewsStatistics.from_frame(load_news_data(
+            data_path, columns or STATISTICS_COLUMNS)))
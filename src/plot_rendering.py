@@ -0,0 +1,223 @@
+#!/usr/bin/python3
+"""
+This module provides the drawing functions shared by the analysis plots and
+`FigureRenderer`, a headless renderer that writes figures to PNG/SVG files
+on the non-interactive Agg canvas, reusing one figure per process.
+"""
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import os
+import pandas as pd
+from matplotlib.artist import setp
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from src.instrumentation import instrumented
+
+RenderJob = namedtuple(
+    'RenderJob', ['path', 'draw', 'args', 'figsize'],
+    defaults=[(), (12, 6)])
+
+
+def draw_headline_lengths(ax, length_counts):
+    """
+    Draw the distribution of headline lengths.
+
+    Args:
+    - ax (matplotlib Axes): Axes to draw on.
+    - length_counts (pandas Series): Number of headlines of each length.
+    """
+    ax.hist(length_counts.index, weights=length_counts.values,
+            bins=30, color='skyblue', edgecolor='black')
+    ax.set_xlabel('Headline Length')
+    ax.set_ylabel('Frequency')
+    ax.set_title('Distribution of Headline Lengths')
+    ax.grid(axis='y', alpha=0.75)
+
+
+def draw_top_publishers(ax, top_publishers,
+                        title='Top 10 Publishers by Article Count'):
+    """
+    Draw a bar plot of article counts per publisher.
+
+    Args:
+    - ax (matplotlib Axes): Axes to draw on.
+    - top_publishers (pandas Series): Articles per publisher.
+    - title (str): Plot title.
+    """
+    top_publishers.plot(
+        kind='bar', color='skyblue', edgecolor='black', ax=ax)
+    ax.set_xlabel('Publisher')
+    ax.set_ylabel('Number of Articles')
+    ax.set_title(title)
+    setp(ax.get_xticklabels(), rotation=45, ha='right')
+    ax.grid(axis='y', alpha=0.75)
+
+
+def draw_date_distribution(ax, date_counts):
+    """
+    Draw a histogram of publication dates.
+
+    Args:
+    - ax (matplotlib Axes): Axes to draw on.
+    - date_counts (pandas Series): Number of articles per date.
+    """
+    ax.hist(pd.to_datetime(date_counts.index), weights=date_counts.values,
+            bins=50, color='skyblue', edgecolor='black')
+    ax.set_xlabel('Publication Date')
+    ax.set_ylabel('Frequency')
+    ax.set_title('Publication Date Distribution')
+    ax.tick_params(axis='x', labelrotation=45)
+    ax.grid(axis='y', alpha=0.75)
+
+
+def draw_publication_frequency(ax, publication_frequency,
+                               title='Publication Frequency Over Time'):
+    """
+    Draw the number of articles published per day.
+
+    Args:
+    - ax (matplotlib Axes): Axes to draw on.
+    - publication_frequency (pandas Series): Articles per date.
+    - title (str): Plot title.
+    """
+    publication_frequency.plot(kind='line', ax=ax)
+    ax.set_title(title)
+    ax.set_xlabel('Date')
+    ax.set_ylabel('Number of Articles Published')
+    ax.grid(True)
+
+
+def draw_publication_times(ax, publication_times):
+    """
+    Draw the number of articles published in each hour of the day.
+
+    Args:
+    - ax (matplotlib Axes): Axes to draw on.
+    - publication_times (pandas Series): Articles per hour.
+    """
+    publication_times.plot(kind='bar', ax=ax)
+    ax.set_title('Publication Times Analysis')
+    ax.set_xlabel('Hour of the Day')
+    ax.set_ylabel('Number of Articles Published')
+    ax.tick_params(axis='x', labelrotation=0)
+
+
+def draw_article_spikes(ax, daily_publication_frequency, spikes):
+    """
+    Draw the daily publication frequency with spike days highlighted.
+
+    Args:
+    - ax (matplotlib Axes): Axes to draw on.
+    - daily_publication_frequency (pandas Series): Articles per date.
+    - spikes (pandas Series): The spike days and their article counts.
+    """
+    daily_publication_frequency.plot(kind='line', ax=ax)
+    spikes.plot(marker='o', linestyle='', color='r', markersize=8,
+                label='Spikes', ax=ax)
+    ax.set_title('Publication Frequency with Spikes')
+    ax.set_xlabel('Date')
+    ax.set_ylabel('Number of Articles Published')
+    ax.legend()
+    ax.grid(True)
+
+
+class FigureRenderer:
+    """
+    Render plots to image files without a GUI.
+
+    A single Figure attached to an Agg canvas is cleared and reused for
+    every plot, so rendering many plots neither opens windows nor
+    accumulates figures in pyplot's global registry. The file format
+    follows the extension of the output path (e.g. .png or .svg).
+
+    Parameters:
+    - dpi (int): Resolution of raster outputs.
+    """
+    def __init__(self, dpi=100):
+        """
+        Initialize the FigureRenderer object.
+
+        Args:
+        - dpi (int): Resolution of raster outputs.
+        """
+        self.dpi = dpi
+        self.figure = Figure()
+        FigureCanvasAgg(self.figure)
+
+    @instrumented
+    def render(self, path, draw, args=(), figsize=(12, 6)):
+        """
+        Draw one plot on the reused figure and save it.
+
+        Args:
+        - path (str): Output file; its extension selects the format.
+        - draw (callable): Drawing function taking an Axes and `args`.
+        - args (tuple): Pre-aggregated data passed to `draw`.
+        - figsize (tuple): Figure width and height in inches.
+
+        Returns:
+        - str: The written path.
+        """
+        self.figure.clear()
+        self.figure.set_size_inches(figsize)
+        draw(self.figure.add_subplot(), *args)
+        self.figure.tight_layout()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.figure.savefig(path, dpi=self.dpi)
+        return path
+
+
+_WORKER_RENDERER = None
+
+
+def _init_worker(dpi):
+    """
+    Create the renderer reused by every job of a worker process.
+
+    Args:
+    - dpi (int): Resolution of raster outputs.
+    """
+    global _WORKER_RENDERER  # pylint: disable=global-statement
+    _WORKER_RENDERER = FigureRenderer(dpi)
+
+
+def _render_job(job):
+    """
+    Render one job with the worker's renderer.
+
+    Args:
+    - job (RenderJob): The plot to render.
+
+    Returns:
+    - str: The written path.
+    """
+    return _WORKER_RENDERER.render(job.path, job.draw, job.args, job.figsize)
+
+
+@instrumented
+def render_batch(jobs, workers=None, dpi=100):
+    """
+    Render many plots to files, optionally in a pool of processes.
+
+    Each worker keeps one reusable figure, so memory stays bounded by the
+    number of workers rather than the number of plots.
+
+    Args:
+    - jobs (list): RenderJob entries; their `draw` functions must be
+    module-level so they can be sent to worker processes.
+    - workers (int): Number of worker processes. Renders in the calling
+    process when None or 1.
+    - dpi (int): Resolution of raster outputs.
+
+    Returns:
+    - list: The written paths, in job order.
+    """
+    if not workers or workers <= 1:
+        renderer = FigureRenderer(dpi)
+        return [renderer.render(job.path, job.draw, job.args, job.figsize)
+                for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(dpi,)) as pool:
+        return list(pool.map(_render_job, jobs, chunksize=8))
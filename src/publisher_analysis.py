@@ -3,9 +3,15 @@
 This module contains a class called `PublisherAnalysis` which
 analyze publishers in the financial news dataset
 """
-import tldextract
 import matplotlib.pyplot as plt
+from src.data_loader import DEFAULT_CHUNKSIZE
 from src.financial_news_analysis import FinancialNewsAnalysis
+from src.instrumentation import instrumented
+from src.out_of_core import streaming_map
+from src.plot_rendering import draw_top_publishers
+# extract_domain is re-exported for callers that import it from here.
+from src.publisher_table import (  # pylint: disable=unused-import
+    PublisherTable, extract_domain, publisher_domain)
 
 
 class PublisherAnalysis(FinancialNewsAnalysis):
@@ -15,6 +21,87 @@ class PublisherAnalysis(FinancialNewsAnalysis):
     Inherits from FinancialNewsAnalysis for access to dataset and basic
     analysis methods.
     """
+    analysis_columns = ['publisher', 'stock']
+    # Feather file of the persistent publisher dimension table; None keeps
+    # the table in memory.
+    publisher_table_path = None
+
+    def __init__(self, data_path, *args, publisher_table=None, **kwargs):
+        """
+        Initialize the PublisherAnalysis object.
+
+        Args:
+        - data_path (str): The path to the CSV file containing the financial
+        news data.
+        - publisher_table (str): Feather file of the publisher dimension
+        table, built on first use and extended with new publishers.
+        - *args, **kwargs: Passed on to FinancialNewsAnalysis.
+        """
+        super().__init__(data_path, *args, **kwargs)
+        self.publisher_table_path = publisher_table
+        self._publisher_table = None
+
+    @classmethod
+    def from_frame(cls, data, *args, publisher_table=None, **kwargs):
+        """
+        Create a publisher analysis over an already loaded DataFrame.
+
+        Args:
+        - data (pandas DataFrame): The financial news data, or None.
+        - publisher_table (str): Feather file of the publisher dimension
+        table.
+        - *args, **kwargs: Passed on to `FinancialNewsAnalysis.from_frame`.
+
+        Returns:
+        - PublisherAnalysis: The analysis over `data`.
+        """
+        analysis = super().from_frame(data, *args, **kwargs)
+        analysis.publisher_table_path = publisher_table
+        analysis._publisher_table = None
+        return analysis
+
+    @FinancialNewsAnalysis.data.setter
+    def data(self, data):
+        """
+        Replace the financial news data; its publishers are added to the
+        dimension table on next use.
+
+        Args:
+        - data (pandas DataFrame): The new financial news data.
+        """
+        FinancialNewsAnalysis.data.fset(self, data)
+        self._publishers_added = False
+
+    def publisher_table(self):
+        """
+        The publisher dimension table, extended once per dataset with the
+        publishers of `data`.
+
+        Returns:
+        - PublisherTable: Table covering every publisher of `data`.
+        """
+        if self._publisher_table is None:
+            self._publisher_table = PublisherTable(self.publisher_table_path)
+        if not self._publishers_added:
+            if self.data is None:
+                self._publisher_table.extend(
+                    self.statistics().publisher_counts.index)
+            else:
+                self._publisher_table.extend(self.data['publisher'])
+            self._publishers_added = True
+        return self._publisher_table
+
+    def publisher_ids(self):
+        """
+        Integer publisher ID of every article.
+
+        Returns:
+        - numpy array: One `publisher_id` of `publisher_table()` per row of
+        `data`, -1 where the publisher is missing.
+        """
+        return self.publisher_table().ids(self.data['publisher'])
+
+    @instrumented
     def top_publishers(self, n=10):
         """
         Calculate the top publishers contributing to the news feed.
@@ -26,35 +113,55 @@ class PublisherAnalysis(FinancialNewsAnalysis):
         - pandas Series: Top publishers and the number of articles
         published by each.
         """
-        top_publishers = self.data['publisher'].value_counts().head(n)
-        return top_publishers
+        return self.statistics().top_publishers(n)
 
+    @instrumented
     def extract_domains(self):
         """
         Extract unique domains from email addresses used as publisher names.
 
         Returns:
         - pandas Series: Unique domains extracted from publisher email
-        addresses.
+        addresses. In out-of-core mode the domains are streamed from the
+        file and returned as a categorical, one code per row.
         """
-        def extract_domain(email):
-            """
-            Extract the domain from an email address.
+        if self.data is None:
+            return streaming_map(
+                self.data_path, 'publisher', publisher_domain,
+                self.chunksize or DEFAULT_CHUNKSIZE).rename('publisher_domain')
+        # Each distinct publisher is normalized once, when it is added to
+        # the dimension table, and the rows only look up their integer ID.
+        ids = self.publisher_ids()
+        self.data['publisher_domain'] = self._publisher_table.attribute(
+            ids, 'domain')
+        return self.data['publisher_domain']
 
-            Args:
-                - email (str): Email address from which to extract the domain.
+    @instrumented
+    def publisher_groups(self, by='name'):
+        """
+        Count articles per normalized publisher name, type or domain.
 
-            Returns:
-                - str: Extracted domain from the email address.
-            """
-            ext = tldextract.extract(email)
-            return ext.domain
+        Publishers such as 'Benzinga Newsdesk' and 'Benzinga_Newsdesk'
+        share a normalized name and are counted together.
 
-        self.data['publisher_domain'] = self.data['publisher'].apply(
-            extract_domain)
-        return self.data['publisher_domain']
+        Args:
+        - by (str): 'name', 'kind' ('person', 'desk' or 'email') or
+        'domain' (email publishers only).
+
+        Returns:
+        - pandas Series: Articles per value of `by`, most frequent first.
+        """
+        if self.data is None:
+            # Out of core, the per-publisher counts stand in for the rows.
+            table = self.publisher_table()
+            counts = self.statistics().publisher_counts
+            return table.group_counts(
+                table.ids(counts.index), by, counts.to_numpy())
+        ids = self.publisher_ids()
+        return self._publisher_table.group_counts(ids, by)
 
-    def plot_publisher_distribution(self, top_publishers):
+    @instrumented
+    def plot_publisher_distribution(self, top_publishers, output_path=None):
         """
         Plot the distribution of publishers based on the number of articles
         published.
@@ -62,12 +169,14 @@ class PublisherAnalysis(FinancialNewsAnalysis):
         Args:
         - top_publishers (pandas Series): Top publishers and the number of
         articles published by each.
+        - output_path (str): Write the figure to this PNG/SVG file instead
+        of showing it.
         """
+        if output_path is not None:
+            self.figure_renderer().render(
+                output_path, draw_top_publishers,
+                (top_publishers, 'Top Publishers'))
+            return
         plt.figure(figsize=(12, 6))
-        top_publishers.plot(kind='bar')
-        plt.title('Top Publishers')
-        plt.xlabel('Publisher')
-        plt.ylabel('Number of Articles Published')
-        plt.xticks(rotation=45)
-        plt.grid(axis='y')
+        draw_top_publishers(plt.gca(), top_publishers, 'Top Publishers')
         plt.show()
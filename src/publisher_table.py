@@ -0,0 +1,229 @@
+#!/usr/bin/python3
+"""
+This module provides `PublisherTable`, a persistent dimension table of
+publishers. Each distinct raw `publisher` string gets a stable integer ID,
+a normalized name, a type (person, desk or email) and, for email
+addresses only, a domain. The table is built once, extended with the
+publishers it has not seen yet and stored as a Feather file, so publisher
+grouping and domain analysis become integer-indexed lookups.
+"""
+from functools import lru_cache
+import os
+import re
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+import tldextract
+from src.instrumentation import instrumented
+
+# With no suffix list URLs tldextract uses the public-suffix list snapshot
+# bundled with the package, so extraction never touches the network or
+# the on-disk suffix list cache.
+OFFLINE_EXTRACTOR = tldextract.TLDExtract(suffix_list_urls=(), cache_dir=None)
+TABLE_COLUMNS = ['publisher', 'name', 'kind', 'domain']
+PUBLISHER_KINDS = ['person', 'desk', 'email']
+EMAIL_PATTERN = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+# Words that mark a publisher name as an editorial desk rather than a
+# person, e.g. 'Benzinga Newsdesk' or 'Zacks Equity Research'.
+DESK_WORDS = {'desk', 'newsdesk', 'insights', 'staff', 'team', 'news',
+              'research', 'editor', 'editors', 'wire', 'newswire',
+              'markets', 'analysts', 'pro'}
+
+
+@lru_cache(maxsize=65536)
+def extract_domain(email):
+    """
+    Extract the domain from an email address.
+
+    Results are kept in a bounded LRU cache shared by every analysis.
+
+    Args:
+        - email (str): Email address from which to extract the domain.
+
+    Returns:
+        - str: Extracted domain from the email address.
+    """
+    return OFFLINE_EXTRACTOR(email).domain
+
+
+def normalize_publisher(publisher):
+    """
+    Describe a raw publisher string.
+
+    Underscores and runs of whitespace become single spaces, so
+    'Benzinga_Newsdesk' and 'Benzinga  Newsdesk' share the name
+    'Benzinga Newsdesk'. Email addresses are lowercased.
+
+    Args:
+    - publisher (str): Raw value of the `publisher` column.
+
+    Returns:
+    - tuple: The normalized name, the kind ('person', 'desk' or 'email')
+    and the domain, which is None unless the publisher is an email
+    address.
+    """
+    name = ' '.join(str(publisher).replace('_', ' ').split())
+    if EMAIL_PATTERN.match(name):
+        name = name.lower()
+        return name, 'email', extract_domain(name)
+    if DESK_WORDS.intersection(name.lower().split()):
+        return name, 'desk', None
+    return name, 'person', None
+
+
+def publisher_domain(publisher):
+    """
+    Domain of a publisher that is an email address.
+
+    Args:
+    - publisher (str): Raw value of the `publisher` column.
+
+    Returns:
+    - str: The domain, or None when the publisher is not an email address.
+    """
+    return normalize_publisher(publisher)[2]
+
+
+class PublisherTable:
+    """
+    Persistent, append-only dimension table of publishers.
+
+    `table` has one row per distinct raw publisher, indexed by its
+    `publisher_id`, with the `publisher`, its normalized `name`, `kind`
+    and `domain`. IDs are assigned in order of first appearance and never
+    change, so codes computed against an older table stay valid.
+
+    Parameters:
+    - path (str): Feather file the table is read from and saved to, or None
+    to keep it in memory only.
+    """
+    def __init__(self, path=None):
+        """
+        Initialize the PublisherTable object, reading the stored table.
+
+        Args:
+        - path (str): Feather file holding the table, or None.
+        """
+        self.path = None if path is None else os.path.expanduser(path)
+        if self.path is not None and os.path.exists(self.path):
+            table = feather.read_feather(self.path)
+        else:
+            table = pd.DataFrame({column: pd.Series(dtype=object)
+                                  for column in TABLE_COLUMNS})
+        self.table = table.rename_axis('publisher_id')
+        self._index = pd.Index(self.table['publisher'])
+
+    def __len__(self):
+        """
+        Number of publishers in the table.
+
+        Returns:
+        - int: The number of rows.
+        """
+        return len(self.table)
+
+    @instrumented
+    def extend(self, publishers):
+        """
+        Add the publishers the table has not seen yet and save it.
+
+        Only new publishers are normalized; the table is written only when
+        it grew.
+
+        Args:
+        - publishers (array-like): Raw publisher values; duplicates and
+        missing values are ignored.
+
+        Returns:
+        - int: The number of publishers added.
+        """
+        _, publishers = pd.factorize(pd.Series(publishers))
+        new = [publisher for publisher in publishers
+               if publisher not in self._index]
+        if not new:
+            return 0
+        rows = pd.DataFrame(
+            [(publisher, *normalize_publisher(publisher))
+             for publisher in new], columns=TABLE_COLUMNS,
+            index=pd.RangeIndex(len(self), len(self) + len(new)))
+        self.table = pd.concat([self.table, rows]).rename_axis(
+            'publisher_id')
+        self._index = pd.Index(self.table['publisher'])
+        self.save()
+        return len(new)
+
+    def ids(self, publishers):
+        """
+        Look up the ID of every value of a publisher column.
+
+        Each distinct value is looked up once and the result is broadcast
+        through the factorized codes.
+
+        Args:
+        - publishers (pandas Series): Raw publisher values, object or
+        categorical.
+
+        Returns:
+        - numpy array: One int64 `publisher_id` per value, -1 for missing
+        values and for publishers not in the table.
+        """
+        codes, uniques = pd.factorize(publishers)
+        # Missing values have code -1, which picks the trailing -1.
+        return np.append(self._index.get_indexer(
+            np.asarray(uniques, dtype=object)), -1)[codes]
+
+    def attribute(self, ids, column):
+        """
+        Map publisher IDs to one attribute of the table.
+
+        Args:
+        - ids (numpy array): IDs from `ids`, -1 for unknown publishers.
+        - column (str): 'publisher', 'name', 'kind' or 'domain'.
+
+        Returns:
+        - numpy array: The attribute of each ID, NaN where it is missing or
+        the ID is -1.
+        """
+        values = np.append(self.table[column].to_numpy(
+            dtype=object, na_value=np.nan), np.nan)
+        return values[ids]
+
+    def group_counts(self, ids, by='name', weights=None):
+        """
+        Count articles per publisher attribute from their IDs.
+
+        Args:
+        - ids (numpy array): One publisher ID per article.
+        - by (str): 'name', 'kind' or 'domain'.
+        - weights (numpy array): Articles behind each ID, when `ids` holds
+        one entry per publisher rather than per article.
+
+        Returns:
+        - pandas Series: Articles per value of `by`, most frequent first.
+        Articles whose publisher has no value of `by` are not counted.
+        """
+        if by not in ['name', 'kind', 'domain']:
+            raise ValueError(
+                f"by must be 'name', 'kind' or 'domain', got {by!r}")
+        known = ids >= 0
+        per_publisher = np.bincount(
+            ids[known], None if weights is None else weights[known],
+            minlength=len(self)).astype('int64')
+        counts = pd.Series(per_publisher, index=self.table[by].to_numpy())
+        counts = counts[counts.index.notna()]
+        counts = counts.groupby(level=0, sort=False).sum()
+        return counts.sort_values(
+            ascending=False, kind='stable').rename_axis(by)
+
+    def save(self):
+        """
+        Atomically write the table to `path`, if one is set.
+        """
+        if self.path is None:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f'{self.path}.tmp'
+        feather.write_feather(self.table.reset_index(drop=True), tmp_path)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,242 @@
+#!/usr/bin/python3
+"""
+This module provides `HeadlineSentiment`, a batched headline sentiment
+scorer that scores each distinct headline once, keeps the scores in an
+on-disk cache keyed by headline hash, and can spread the scoring over a
+pool of processes, and `SentimentAnalysis`, which attaches the scores to
+the financial news data.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+from src.financial_news_analysis import FinancialNewsAnalysis
+from src.instrumentation import instrumented
+
+DEFAULT_BATCH_SIZE = 20000
+
+_VADER = None
+
+
+def vader_scores(headlines):
+    """
+    Score headlines with NLTK's VADER compound polarity.
+
+    The analyzer is created once per process. It needs the `vader_lexicon`
+    resource (`nltk.download('vader_lexicon')`).
+
+    Args:
+    - headlines (list): Headlines to score.
+
+    Returns:
+    - list: Compound polarity of each headline, from -1 to 1.
+    """
+    global _VADER  # pylint: disable=global-statement
+    if _VADER is None:
+        # pylint: disable=import-outside-toplevel
+        from nltk.sentiment.vader import SentimentIntensityAnalyzer
+        _VADER = SentimentIntensityAnalyzer()
+    return [_VADER.polarity_scores(headline)['compound']
+            for headline in headlines]
+
+
+def headline_hashes(headlines):
+    """
+    Hash headlines to stable 64-bit keys.
+
+    Args:
+    - headlines (numpy array): Headlines as Python strings.
+
+    Returns:
+    - numpy array: One uint64 hash per headline, identical across runs.
+    """
+    return pd.util.hash_array(
+        np.asarray(headlines, dtype=object), categorize=False)
+
+
+def scorer_key(scorer, version=None):
+    """
+    Identify a scorer in the score cache.
+
+    Args:
+    - scorer (callable): The scoring function.
+    - version (str): Version of the scorer, changed when its scores
+    change without its name changing.
+
+    Returns:
+    - str: The scorer's qualified name, followed by the version if any.
+    """
+    key = f'{scorer.__module__}.{scorer.__qualname__}'
+    return key if version is None else f'{key}:{version}'
+
+
+class HeadlineSentiment:
+    """
+    Score headlines in batches, once per distinct headline.
+
+    Identical headlines are collapsed before scoring, and the scores of
+    distinct headlines are kept in a Feather file keyed by headline hash,
+    so a re-run only scores headlines it has not seen before. The file
+    records which scorer wrote it; a cache written by another scorer, or
+    another version of it, is discarded.
+
+    Parameters:
+    - scorer (callable): Module-level function mapping a list of headlines
+    to a list of scores. Defaults to `vader_scores`.
+    - cache_path (str): Feather file holding the cached scores. Nothing is
+    cached when None.
+    - workers (int): Number of scoring processes. Serial when None or 1.
+    - batch_size (int): Number of headlines per scoring batch.
+    - scorer_version (str): Version of the scorer stored with the cache.
+    """
+    def __init__(self, scorer=vader_scores, cache_path=None, workers=None,
+                 batch_size=DEFAULT_BATCH_SIZE, scorer_version=None):
+        """
+        Initialize the HeadlineSentiment object.
+
+        Args:
+        - scorer (callable): Module-level function mapping a list of
+        headlines to a list of scores.
+        - cache_path (str): Feather file holding the cached scores.
+        - workers (int): Number of scoring processes. Serial when None
+        or 1.
+        - batch_size (int): Number of headlines per scoring batch.
+        - scorer_version (str): Version of the scorer stored with the
+        cache.
+        """
+        self.scorer = scorer
+        self.scorer_key = scorer_key(scorer, scorer_version)
+        self.cache_path = cache_path and os.path.expanduser(cache_path)
+        self.workers = workers
+        self.batch_size = batch_size
+        self.report = None
+
+    @instrumented
+    def score(self, headlines):
+        """
+        Score a column of headlines.
+
+        Args:
+        - headlines (pandas Series): The headlines; missing values get a
+        missing score.
+
+        Returns:
+        - pandas Series: Score of each headline, aligned with `headlines`.
+        The counts of `rows`, `unique` headlines, `cached` and newly
+        `scored` headlines are recorded in `report`.
+        """
+        codes, uniques = pd.factorize(headlines)
+        uniques = np.asarray(uniques, dtype=object)
+        hashes = headline_hashes(uniques)
+        cached = self.read_cache()
+        # Headlines scored as NaN are cached too, so only hashes absent
+        # from the cache (position -1, the trailing NaN) are scored.
+        positions = cached.index.get_indexer(hashes)
+        scores = np.append(cached.to_numpy(), np.nan)[positions]
+        missing = np.flatnonzero(positions < 0)
+        if len(missing):
+            scores[missing] = self._score_batches(uniques[missing].tolist())
+            self.write_cache(pd.concat([cached, pd.Series(
+                scores[missing], index=hashes[missing])]))
+        self.report = {'rows': len(codes), 'unique': len(uniques),
+                       'cached': len(uniques) - len(missing),
+                       'scored': len(missing)}
+        # Missing headlines have code -1, which picks the trailing NaN.
+        return pd.Series(np.append(scores, np.nan)[codes],
+                         index=headlines.index, name='sentiment')
+
+    def _score_batches(self, headlines):
+        """
+        Run the scorer over batches of headlines.
+
+        Args:
+        - headlines (list): Distinct headlines to score.
+
+        Returns:
+        - numpy array: Scores in the order of `headlines`.
+        """
+        batches = [headlines[offset:offset + self.batch_size]
+                   for offset in range(0, len(headlines), self.batch_size)]
+        if not self.workers or self.workers <= 1 or len(batches) == 1:
+            results = list(map(self.scorer, batches))
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                results = list(pool.map(self.scorer, batches))
+        return np.concatenate(
+            [np.asarray(batch, dtype='float64') for batch in results])
+
+    def read_cache(self):
+        """
+        Read the cached scores.
+
+        Returns:
+        - pandas Series: Scores indexed by distinct headline hashes; empty
+        when the cache was written by another scorer.
+        """
+        empty = pd.Series(dtype='float64', index=pd.Index([], dtype='uint64'))
+        if self.cache_path is None or not os.path.exists(self.cache_path):
+            return empty
+        table = feather.read_table(self.cache_path)
+        metadata = table.schema.metadata or {}
+        if metadata.get(b'scorer', b'').decode() != self.scorer_key:
+            return empty
+        scores = pd.Series(table['score'].to_numpy(),
+                           index=table['hash'].to_numpy())
+        return scores[~scores.index.duplicated(keep='last')]
+
+    def write_cache(self, scores):
+        """
+        Atomically replace the cached scores.
+
+        Args:
+        - scores (pandas Series): Scores indexed by headline hash; only the
+        last score of a repeated hash is kept.
+        """
+        if self.cache_path is None:
+            return
+        scores = scores[~scores.index.duplicated(keep='last')]
+        directory = os.path.dirname(self.cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f'{self.cache_path}.tmp'
+        feather.write_feather(pa.table({
+            'hash': pa.array(scores.index.to_numpy(), pa.uint64()),
+            'score': pa.array(scores.to_numpy(), pa.float64())},
+            metadata={'scorer': self.scorer_key}), tmp_path)
+        os.replace(tmp_path, self.cache_path)
+
+
+class SentimentAnalysis(FinancialNewsAnalysis):
+    """
+    A class for scoring the sentiment of financial news headlines.
+
+    Inherits from FinancialNewsAnalysis for access to dataset and basic
+    analysis methods.
+    """
+    analysis_columns = ['headline', 'date', 'stock']
+
+    @instrumented
+    def add_sentiment(self, scorer=vader_scores, cache_path=None,
+                      workers=None, scorer_version=None):
+        """
+        Score every headline and attach the scores as a `sentiment` column
+        of `data`.
+
+        Args:
+        - scorer (callable): Module-level function mapping a list of
+        headlines to a list of scores.
+        - cache_path (str): Feather file holding the cached scores.
+        - workers (int): Number of scoring processes. Serial when None
+        or 1.
+        - scorer_version (str): Version of the scorer stored with the
+        cache.
+
+        Returns:
+        - dict: The scoring report of `HeadlineSentiment.score`.
+        """
+        sentiment = HeadlineSentiment(scorer, cache_path, workers,
+                                      scorer_version=scorer_version)
+        self.data['sentiment'] = sentiment.score(self.data['headline'])
+        return sentiment.report
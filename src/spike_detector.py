@@ -0,0 +1,285 @@
+#!/usr/bin/python3
+"""
+This module provides `StreamingSpikeDetector`, a live counterpart of
+`TimeSeriesAnalysis.analyze_article_spikes`: instead of comparing each day
+with the mean + 2 standard deviations of the whole history, it compares a
+ticker's running count for the current day with the statistics of its
+recent days, and emits a spike event as soon as the count crosses that
+threshold. A replay harness feeds a CSV file through the detector.
+"""
+from collections import deque, namedtuple
+import time
+import numpy as np
+import pandas as pd
+from src.data_loader import load_news_data
+from src.instrumentation import instrumented
+
+NS_PER_DAY = 86400 * 10 ** 9
+
+SpikeEvent = namedtuple(
+    'SpikeEvent', ['stock', 'date', 'articles', 'threshold', 'zscore'])
+
+
+class TickerState:
+    """
+    Per-ticker state of the streaming spike detector.
+
+    Attributes:
+    - day (int): Current day, as days since the epoch (UTC).
+    - count (int): Articles seen for the current day so far.
+    - threshold (float): Count the current day must exceed to be a spike,
+    or None while there is not enough history.
+    - emitted (bool): Whether the current day has already been reported.
+    - history (deque): (day, count) pairs of the closed days with articles
+    inside the rolling window.
+    - total (float): Sum of `history`, or the running mean in EWM mode.
+    - total_sq (float): Sum of squares of `history`, or the running
+    variance in EWM mode.
+    - closed (int): Number of closed days seen.
+    """
+    __slots__ = ['day', 'count', 'threshold', 'emitted', 'history',
+                 'total', 'total_sq', 'closed']
+
+    def __init__(self):
+        """
+        Initialize the TickerState object.
+        """
+        self.day = None
+        self.count = 0
+        self.threshold = None
+        self.emitted = False
+        self.history = deque()
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.closed = 0
+
+
+class StreamingSpikeDetector:
+    """
+    Detect article-count spikes per ticker on a live stream of articles.
+
+    Each ticker keeps the counts of its last `window` days (O(window)
+    state, days without articles are implicit) together with their running
+    sum and sum of squares, or an
+    exponentially weighted mean and variance when `alpha` is given. A day
+    is a spike once its count exceeds mean + `n_std` standard deviations
+    of the previous days; the event is emitted on the article that crosses
+    the threshold, so the work per article is constant. A spike also needs
+    at least `min_articles` articles, so a single article on an otherwise
+    silent ticker is not reported. Days are UTC days and articles older
+    than a ticker's current day are counted as late and ignored.
+
+    Parameters:
+    - window (int): Number of previous days in the rolling statistics.
+    - n_std (float): Standard deviations above the mean that make a spike.
+    - min_periods (int): Closed days required before spikes are reported.
+    - alpha (float): Use exponentially weighted statistics with this
+    smoothing factor instead of the rolling window.
+    - min_articles (int): Smallest daily count that can be a spike.
+    """
+    def __init__(self, window=30, n_std=2.0, min_periods=7, alpha=None,
+                 min_articles=3):
+        """
+        Initialize the StreamingSpikeDetector object.
+
+        Args:
+        - window (int): Number of previous days in the rolling statistics.
+        - n_std (float): Standard deviations above the mean that make a
+        spike.
+        - min_periods (int): Closed days required before spikes are
+        reported.
+        - alpha (float): Use exponentially weighted statistics with this
+        smoothing factor instead of the rolling window.
+        - min_articles (int): Smallest daily count that can be a spike.
+        """
+        self.window = window
+        self.n_std = n_std
+        self.min_periods = min_periods
+        self.alpha = alpha
+        self.min_articles = min_articles
+        self.states = {}
+        self.late = 0
+
+    def update(self, stock, timestamp):
+        """
+        Feed one article into the detector.
+
+        Args:
+        - stock (str): Ticker of the article.
+        - timestamp (datetime-like): Publication time of the article.
+
+        Returns:
+        - SpikeEvent: The spike this article completes, or None.
+        """
+        return self._update(stock, pd.Timestamp(timestamp).value // NS_PER_DAY)
+
+    def update_batch(self, stocks, timestamps):
+        """
+        Feed a micro-batch of articles, in arrival order.
+
+        Args:
+        - stocks (array-like): Tickers of the articles.
+        - timestamps (pandas Series): Publication times of the articles.
+
+        Returns:
+        - list: The SpikeEvents emitted by the batch.
+        """
+        days = pd.to_datetime(timestamps, utc=True).to_numpy(
+            dtype='datetime64[ns]').astype('int64') // NS_PER_DAY
+        events = []
+        for stock, day in zip(stocks, days.tolist()):
+            event = self._update(stock, day)
+            if event is not None:
+                events.append(event)
+        return events
+
+    def _update(self, stock, day):
+        """
+        Count one article for a ticker on a given day.
+
+        Args:
+        - stock (str): Ticker of the article.
+        - day (int): Publication day, as days since the epoch.
+
+        Returns:
+        - SpikeEvent: The spike this article completes, or None.
+        """
+        state = self.states.get(stock)
+        if state is None:
+            state = self.states[stock] = TickerState()
+            state.day = day
+        elif day > state.day:
+            self._advance(state, day)
+        elif day < state.day:
+            self.late += 1
+            return None
+        state.count += 1
+        if state.emitted or state.threshold is None or \
+                state.count <= state.threshold:
+            return None
+        state.emitted = True
+        mean, std = self._moments(state)
+        return SpikeEvent(
+            stock, pd.Timestamp(day * NS_PER_DAY, tz='UTC').date(),
+            state.count, state.threshold,
+            (state.count - mean) / std if std else np.inf)
+
+    def _advance(self, state, day):
+        """
+        Close a ticker's current day, and the empty days after it, and
+        start `day`.
+
+        Args:
+        - state (TickerState): The ticker's state.
+        - day (int): The new current day.
+        """
+        if self.alpha is not None:
+            self._close_ewm(state, state.count, day - state.day - 1)
+        else:
+            self._close_rolling(state, state.count, day)
+        state.day, state.count, state.emitted = day, 0, False
+        if state.closed >= self.min_periods:
+            mean, std = self._moments(state)
+            state.threshold = max(
+                mean + self.n_std * std, self.min_articles - 1)
+        else:
+            state.threshold = None
+
+    def _close_rolling(self, state, count, day):
+        """
+        Fold a finished day into the rolling window ending before `day`.
+
+        Only days with articles are stored; days without any count as
+        zeros through the number of days in the window, so a gap of any
+        length costs constant time.
+
+        Args:
+        - state (TickerState): The ticker's state.
+        - count (int): Articles published on the finished day.
+        - day (int): The new current day.
+        """
+        if count:
+            state.history.append((state.day, count))
+            state.total += count
+            state.total_sq += count ** 2
+        state.closed += day - state.day
+        while state.history and state.history[0][0] < day - self.window:
+            _, oldest = state.history.popleft()
+            state.total -= oldest
+            state.total_sq -= oldest ** 2
+
+    def _close_ewm(self, state, count, empty_days):
+        """
+        Fold a finished day, then `empty_days` days without articles, into
+        the exponentially weighted mean and variance.
+
+        Args:
+        - state (TickerState): The ticker's state.
+        - count (int): Articles published on the finished day.
+        - empty_days (int): Number of following days without articles.
+        """
+        alpha = self.alpha
+        if state.closed == 0:
+            state.total, state.total_sq = float(count), 0.0
+        else:
+            delta = count - state.total
+            state.total += alpha * delta
+            state.total_sq = (1 - alpha) * (
+                state.total_sq + alpha * delta ** 2)
+        # Closed form of `empty_days` zero updates: the mean decays by
+        # (1 - alpha) per day and the variance absorbs the removed mass.
+        decay = (1 - alpha) ** empty_days
+        state.total_sq = decay * (
+            state.total_sq + state.total ** 2 * (1 - decay))
+        state.total *= decay
+        state.closed += 1 + empty_days
+
+    def _moments(self, state):
+        """
+        Mean and standard deviation of a ticker's previous days.
+
+        Args:
+        - state (TickerState): The ticker's state.
+
+        Returns:
+        - tuple: The mean and the (sample) standard deviation.
+        """
+        if self.alpha is not None:
+            return state.total, np.sqrt(max(state.total_sq, 0.0))
+        n = min(state.closed, self.window)
+        mean = state.total / n
+        variance = (state.total_sq - n * mean ** 2) / (n - 1) if n > 1 else 0
+        return mean, np.sqrt(max(variance, 0.0))
+
+
+@instrumented
+def replay_csv(data_path, detector, batch_size=1000):
+    """
+    Replay a ratings CSV through a detector in publication order.
+
+    Args:
+    - data_path (str): The path to the CSV file containing the financial
+    news data.
+    - detector (StreamingSpikeDetector): The detector to feed.
+    - batch_size (int): Number of articles per micro-batch.
+
+    Returns:
+    - tuple: The list of emitted SpikeEvents and a report dict with the
+    number of `articles` and `events`, the replay `seconds` and the
+    `articles_per_second` and `events_per_second` rates.
+    """
+    data = load_news_data(data_path, ['date', 'stock']).dropna(
+        subset=['date']).sort_values('date', kind='stable')
+    stocks = data['stock'].to_numpy()
+    dates = data['date']
+    events = []
+    start = time.perf_counter()
+    for offset in range(0, len(data), batch_size):
+        events.extend(detector.update_batch(
+            stocks[offset:offset + batch_size],
+            dates.iloc[offset:offset + batch_size]))
+    seconds = time.perf_counter() - start
+    return events, {
+        'articles': len(data), 'events': len(events), 'seconds': seconds,
+        'articles_per_second': len(data) / seconds if seconds else np.inf,
+        'events_per_second': len(events) / seconds if seconds else np.inf}
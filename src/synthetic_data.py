@@ -0,0 +1,161 @@
+#!/usr/bin/python3
+"""
+This module generates seeded synthetic analyst-rating datasets with the
+schema of `raw_analyst_ratings.csv`, for benchmarking the analysis classes
+at sizes the sample file does not reach.
+
+Publishers and tickers follow Zipf-like distributions, as in the real
+data where a few newsdesks and large caps dominate. Headlines are drawn
+from templates so that many repeat verbatim, and dates mix timestamps with
+-04:00/-05:00 offsets and offset-less midnight values.
+"""
+import string
+import numpy as np
+import pandas as pd
+
+SYNTHETIC_COLUMNS = ['headline', 'url', 'publisher', 'date', 'stock']
+N_PUBLISHERS = 1000
+N_TICKERS = 6000
+# Share of publishers named by an email address, and of offset-less dates.
+EMAIL_SHARE = 0.1
+MIDNIGHT_SHARE = 0.1
+FIRST_DAY = pd.Timestamp('2011-01-01')
+N_DAYS = 3500
+GENERATION_BLOCK = 100000
+DOMAINS = ['benzinga.com', 'gmail.com', 'investing.com', 'reuters.co.uk',
+           'marketwatch.com']
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+TEMPLATES = [
+    'Stocks That Hit 52-Week Highs On {weekday}',
+    'Stocks That Hit 52-Week Lows On {weekday}',
+    '{n} Biggest Movers From {weekday}',
+    '{ticker} Shares Are Trading Higher After Q{quarter} Results',
+    'Analyst Upgrades {ticker} To Buy, Raises Price Target To ${price}',
+    'Analyst Downgrades {ticker} To Sell, Lowers Price Target To ${price}',
+    '{ticker} Q{quarter} EPS ${eps} Beats ${estimate} Estimate, '
+    'Sales Beat Estimate',
+    'Shares of several companies in the sector, including {ticker}, are '
+    'trading lower as markets fall amid renewed economic concerns.']
+
+
+def zipf_weights(n, exponent=1.1):
+    """
+    Build normalized Zipf weights for `n` ranked items.
+
+    Args:
+    - n (int): Number of items.
+    - exponent (float): Skew; larger values concentrate more mass on the
+    first items.
+
+    Returns:
+    - numpy array: Probabilities summing to one, largest first.
+    """
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+
+def make_pools(seed=0):
+    """
+    Build the publisher and ticker pools shared by every chunk.
+
+    Args:
+    - seed (int): Seed of the random generator.
+
+    Returns:
+    - tuple: Arrays of publisher names and of tickers.
+    """
+    rng = np.random.default_rng(seed)
+    letters = np.array(list(string.ascii_uppercase))
+    tickers = set()
+    while len(tickers) < N_TICKERS:
+        tickers.add(''.join(rng.choice(letters, rng.integers(1, 5))))
+    tickers = np.array(sorted(tickers))
+    rng.shuffle(tickers)
+    publishers = []
+    for i in range(N_PUBLISHERS):
+        if rng.random() < EMAIL_SHARE:
+            publishers.append(
+                f'writer{i}@{DOMAINS[rng.integers(len(DOMAINS))]}')
+        else:
+            publishers.append(f'Writer {i} {letters[i % 26]}.')
+    publishers[:3] = ['Benzinga Newsdesk', 'Lisa Levin', 'Benzinga Insights']
+    return np.array(publishers, dtype=object), tickers
+
+
+def generate_ratings(rows, seed=0, start=0, pools=None):
+    """
+    Generate synthetic analyst-rating rows.
+
+    Args:
+    - rows (int): Number of rows to generate.
+    - seed (int): Seed of the random generator.
+    - start (int): Number of the first row, so that consecutive calls
+    produce consecutive chunks of one dataset.
+    - pools (tuple): Publisher and ticker pools from `make_pools`; built
+    from `seed` when None.
+
+    Returns:
+    - pandas DataFrame: Rows with the `SYNTHETIC_COLUMNS`, indexed from
+    `start`.
+    """
+    publishers, tickers = pools if pools is not None else make_pools(seed)
+    rng = np.random.default_rng([seed, start])
+    stock = tickers[rng.choice(len(tickers), rows, p=zipf_weights(
+        len(tickers)))]
+    publisher = publishers[rng.choice(
+        len(publishers), rows, p=zipf_weights(len(publishers), 1.3))]
+    # Later years carry more articles, as in the real feed.
+    days = FIRST_DAY + pd.to_timedelta(np.floor(
+        N_DAYS * rng.random(rows) ** 0.5).astype('int64'), unit='D')
+    seconds = pd.to_timedelta(rng.integers(6 * 3600, 20 * 3600, rows),
+                              unit='s')
+    summer = days.month.isin(range(4, 11))
+    offsets = np.where(summer, '-04:00', '-05:00')
+    stamps = pd.Series((days + seconds).strftime('%Y-%m-%d %H:%M:%S'))
+    midnight = rng.random(rows) < MIDNIGHT_SHARE
+    date = np.where(midnight, stamps.str[:10] + ' 00:00:00',
+                    stamps + offsets)
+
+    template = rng.integers(len(TEMPLATES), size=rows)
+    headline = np.empty(rows, dtype=object)
+    weekday = np.array(WEEKDAYS)[rng.integers(5, size=rows)]
+    n = rng.integers(20, 80, rows)
+    quarter = rng.integers(1, 5, rows)
+    price = rng.integers(5, 400, rows)
+    eps = np.round(rng.random(rows) * 3, 2).tolist()
+    estimate = np.round(np.array(eps) - 0.05, 2).tolist()
+    for i in range(rows):
+        headline[i] = TEMPLATES[template[i]].format(
+            weekday=weekday[i], n=n[i], ticker=stock[i], quarter=quarter[i],
+            price=price[i], eps=eps[i], estimate=estimate[i])
+    index = np.arange(start, start + rows)
+    url = [f'https://www.benzinga.com/news/{number}/synthetic'
+           for number in index + 10 ** 7]
+    return pd.DataFrame({
+        'headline': headline, 'url': url, 'publisher': publisher,
+        'date': date, 'stock': stock}, index=index)
+
+
+def write_ratings_csv(path, rows, seed=0):
+    """
+    Write a synthetic dataset to CSV in the layout of the real file.
+
+    Rows are generated and appended in blocks of `GENERATION_BLOCK`, so
+    memory stays bounded for 10M-row files and a file is a prefix of any
+    larger file written with the same seed.
+
+    Args:
+    - path (str): Destination CSV file.
+    - rows (int): Number of rows to write.
+    - seed (int): Seed of the random generator.
+
+    Returns:
+    - str: The written path.
+    """
+    pools = make_pools(seed)
+    generate_ratings(0, seed, 0, pools).to_csv(path)
+    for start in range(0, rows, GENERATION_BLOCK):
+        generate_ratings(
+            min(GENERATION_BLOCK, rows - start), seed, start, pools).to_csv(
+            path, mode='a', header=False)
+    return path
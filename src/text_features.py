@@ -0,0 +1,495 @@
+#!/usr/bin/python3
+"""
+This module provides `HeadlineFeatures`, which turns the headlines into
+sparse text features and topics in bounded memory.
+
+Headlines are streamed from the chunked reader and vectorized chunk by
+chunk with a stateless `HashingVectorizer`, so no vocabulary has to be
+built first and new headlines map to the same columns. Each chunk feeds
+the document frequencies of the TF-IDF weighting and a `partial_fit` of
+an online LDA or mini-batch NMF topic model before the next chunk is
+read. The count matrix, document frequencies and fitted topic model are
+persisted per source and settings and reused until a source file
+changes. `TextFeatureAnalysis` exposes the features to the batch CLI.
+"""
+import hashlib
+import json
+import os
+import joblib
+import numpy as np
+import pandas as pd
+from scipy import sparse as sp
+from sklearn.decomposition import LatentDirichletAllocation, MiniBatchNMF
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+from src.data_loader import DEFAULT_CHUNKSIZE
+from src.financial_news_analysis import FinancialNewsAnalysis
+from src.instrumentation import instrumented
+from src.multi_file_loader import expand_paths
+from src.out_of_core import iter_frames
+
+DEFAULT_FEATURES = 2 ** 18
+DEFAULT_TOPICS = 10
+TOPIC_MODELS = ['nmf', 'lda']
+# Rows per topic model update. Larger batches than scikit-learn's default
+# of 128 make online LDA several times faster per headline.
+TOPIC_BATCH_SIZE = 4096
+# Words remembered to name the hashed columns of topic terms.
+MAX_VOCABULARY = 100000
+# Bump when the persisted layout changes.
+FEATURES_VERSION = 1
+
+
+def headline_vectorizer(n_features=DEFAULT_FEATURES):
+    """
+    Build the stateless vectorizer of headline term counts.
+
+    Args:
+    - n_features (int): Number of hashed columns.
+
+    Returns:
+    - HashingVectorizer: Lowercased word counts without English stop
+    words, as non-negative float32 values.
+    """
+    return HashingVectorizer(
+        n_features=n_features, stop_words='english', alternate_sign=False,
+        norm=None, dtype=np.float32)
+
+
+def make_topic_model(kind, n_topics, seed=0):
+    """
+    Build an incremental topic model.
+
+    Args:
+    - kind (str): 'nmf' for mini-batch non-negative matrix factorization
+    or 'lda' for online latent Dirichlet allocation.
+    - n_topics (int): Number of topics.
+    - seed (int): Random seed.
+
+    Returns:
+    - estimator: An unfitted scikit-learn model with `partial_fit`.
+    """
+    if kind == 'lda':
+        return LatentDirichletAllocation(
+            n_components=n_topics, learning_method='online',
+            batch_size=TOPIC_BATCH_SIZE, random_state=seed)
+    if kind == 'nmf':
+        return MiniBatchNMF(n_components=n_topics,
+                            batch_size=TOPIC_BATCH_SIZE, random_state=seed)
+    raise ValueError(f"topic_model must be one of {TOPIC_MODELS}, "
+                     f"got {kind!r}")
+
+
+def source_key(data_path, settings):
+    """
+    Key the persisted features of a source and its settings.
+
+    Args:
+    - data_path (str or list): A CSV file, or a glob pattern or list of
+    files.
+    - settings (dict): JSON-serializable feature settings.
+
+    Returns:
+    - str: Hex key that changes when a file's path, size or mtime, or the
+    settings, change.
+    """
+    digest = hashlib.sha256(json.dumps(settings, sort_keys=True).encode())
+    for path in expand_paths(data_path):
+        stat = os.stat(path)
+        digest.update(
+            f'{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}'
+            .encode())
+    return digest.hexdigest()[:16]
+
+
+def frame_key(headlines, settings):
+    """
+    Key the persisted features of in-memory headlines and their settings.
+
+    Args:
+    - headlines (pandas Series): The headlines, in order.
+    - settings (dict): JSON-serializable feature settings.
+
+    Returns:
+    - str: Hex key that changes when any headline, their order or the
+    settings change.
+    """
+    digest = hashlib.sha256(json.dumps(settings, sort_keys=True).encode())
+    digest.update(pd.util.hash_pandas_object(
+        headlines, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+class HeadlineFeatures:
+    """
+    Hashed term counts, TF-IDF weights and topics of the headlines.
+
+    Parameters:
+    - n_features (int): Number of hashed columns.
+    - n_topics (int): Number of topics.
+    - topic_model (str): 'nmf' or 'lda'. NMF, about five times faster, is
+    fed row-normalized term frequencies, as the IDF weights are only known
+    after the last chunk.
+    - cache_dir (str): Directory the features are persisted in. Nothing
+    is persisted when None.
+    - chunksize (int): Maximum number of headlines held in memory at a
+    time.
+    - seed (int): Random seed of the topic model.
+
+    Attributes:
+    - counts (scipy.sparse.csr_matrix): Term counts, one row per headline
+    in file or frame order (missing headlines have empty rows).
+    - document_frequencies (numpy array): Headlines containing each
+    hashed column.
+    - model (estimator): The fitted topic model.
+    - vocabulary (dict): Hashed column of up to `MAX_VOCABULARY` words
+    seen in the headlines, used to name topic terms.
+    - report (dict): Rows read and whether the features were reused.
+    """
+    def __init__(self, n_features=DEFAULT_FEATURES, n_topics=DEFAULT_TOPICS,
+                 topic_model='nmf', cache_dir=None,
+                 chunksize=DEFAULT_CHUNKSIZE, seed=0):
+        """
+        Initialize the HeadlineFeatures object.
+
+        Args:
+        - n_features (int): Number of hashed columns.
+        - n_topics (int): Number of topics.
+        - topic_model (str): 'nmf' or 'lda'.
+        - cache_dir (str): Directory of the persisted features, or None.
+        - chunksize (int): Maximum number of headlines per chunk.
+        - seed (int): Random seed of the topic model.
+        """
+        self.vectorizer = headline_vectorizer(n_features)
+        self.settings = {'version': FEATURES_VERSION,
+                         'n_features': n_features, 'n_topics': n_topics,
+                         'topic_model': topic_model, 'seed': seed}
+        self.model = make_topic_model(topic_model, n_topics, seed)
+        self.cache_dir = None if cache_dir is None else \
+            os.path.expanduser(cache_dir)
+        self.chunksize = chunksize
+        self.counts = None
+        self.document_frequencies = None
+        self.vocabulary = {}
+        self.report = {}
+
+    @instrumented
+    def fit(self, data_path):
+        """
+        Compute the features of every headline of a dataset, or read them
+        back when they were persisted for the same files and settings.
+
+        Args:
+        - data_path (str or list): A CSV file, or a glob pattern or list of
+        files read with the multi-file loader.
+
+        Returns:
+        - HeadlineFeatures: self.
+        """
+        key = None if self.cache_dir is None else \
+            source_key(data_path, self.settings)
+        if self._reuse(key):
+            return self
+        return self._fit_chunks(
+            key, (chunk['headline'] for chunk in iter_frames(
+                data_path, ['headline'], self.chunksize)))
+
+    @instrumented
+    def fit_frame(self, data):
+        """
+        Compute the features of headlines already in memory, in chunks, or
+        read them back when they were persisted for the same headlines and
+        settings.
+
+        Args:
+        - data (pandas DataFrame): Data with a `headline` column.
+
+        Returns:
+        - HeadlineFeatures: self.
+        """
+        headlines = data['headline']
+        key = None if self.cache_dir is None else \
+            frame_key(headlines, self.settings)
+        if self._reuse(key):
+            return self
+        return self._fit_chunks(
+            key, (headlines.iloc[start:start + self.chunksize]
+                  for start in range(0, len(headlines), self.chunksize)))
+
+    def _reuse(self, key):
+        """
+        Read back persisted features.
+
+        Args:
+        - key (str): Key of the persisted features, or None.
+
+        Returns:
+        - bool: True if the features were read.
+        """
+        if key is None or not self.load(key):
+            return False
+        self.report = {'rows': self.counts.shape[0], 'cached': True}
+        return True
+
+    def _fit_chunks(self, key, chunks):
+        """
+        Vectorize chunks of headlines and update the topic model with each.
+
+        Args:
+        - key (str): Key of the persisted features, or None.
+        - chunks (iterable): Headline Series, in order.
+
+        Returns:
+        - HeadlineFeatures: self.
+        """
+        blocks = []
+        frequencies = np.zeros(self.vectorizer.n_features, dtype='int64')
+        for chunk in chunks:
+            headlines = chunk.fillna('').to_numpy(dtype=object)
+            counts = self.vectorizer.transform(headlines)
+            frequencies += np.bincount(
+                counts.indices, minlength=len(frequencies))
+            if counts.nnz:
+                self.model.partial_fit(self.topic_input(counts))
+            if len(self.vocabulary) < MAX_VOCABULARY:
+                for word, column in self.term_columns(headlines).items():
+                    if len(self.vocabulary) >= MAX_VOCABULARY:
+                        break
+                    self.vocabulary.setdefault(word, column)
+            blocks.append(counts)
+        self.counts = sp.vstack(blocks, format='csr') if blocks else \
+            sp.csr_matrix((0, len(frequencies)), dtype=np.float32)
+        self.document_frequencies = frequencies
+        self.report = {'rows': self.counts.shape[0], 'cached': False}
+        if key is not None:
+            self.save(key)
+        return self
+
+    def term_columns(self, headlines):
+        """
+        Find the hashed column of every word of some headlines.
+
+        Args:
+        - headlines (array-like): Headlines to take the words from.
+
+        Returns:
+        - dict: Word to column index.
+        """
+        analyze = self.vectorizer.build_analyzer()
+        words = sorted({word for headline in headlines
+                        for word in analyze(headline)})
+        if not words:
+            return {}
+        return dict(zip(words, self.vectorizer.transform(
+            words).indices.tolist()))
+
+    def transform(self, headlines):
+        """
+        Term counts of new headlines, in the columns of `counts`.
+
+        Args:
+        - headlines (array-like): Headlines; missing values are not
+        allowed.
+
+        Returns:
+        - scipy.sparse.csr_matrix: One row per headline.
+        """
+        return self.vectorizer.transform(headlines)
+
+    def topic_input(self, counts):
+        """
+        Prepare term counts for the topic model.
+
+        Args:
+        - counts (scipy.sparse.csr_matrix): Term counts.
+
+        Returns:
+        - scipy.sparse.csr_matrix: The counts for LDA, or their
+        L2-normalized rows for NMF.
+        """
+        if self.settings['topic_model'] == 'nmf':
+            return normalize(counts)
+        return counts
+
+    def tfidf(self, counts=None):
+        """
+        Weight term counts by inverse document frequency.
+
+        Uses the smoothed IDF of scikit-learn's `TfidfTransformer`,
+        ln((1 + n) / (1 + df)) + 1, and L2-normalized rows.
+
+        Args:
+        - counts (scipy.sparse.csr_matrix): Term counts, from `transform`.
+        Defaults to `counts` of the fitted headlines.
+
+        Returns:
+        - scipy.sparse.csr_matrix: The TF-IDF matrix.
+        """
+        counts = self.counts if counts is None else counts
+        idf = np.log((1 + self.counts.shape[0]) /
+                     (1 + self.document_frequencies)) + 1
+        return normalize(counts @ sp.diags(idf.astype(np.float32)))
+
+    @instrumented
+    def document_topics(self, counts=None):
+        """
+        Topic weights of every headline.
+
+        The rows are transformed `chunksize` at a time.
+
+        Args:
+        - counts (scipy.sparse.csr_matrix): Term counts, from `transform`.
+        Defaults to `counts` of the fitted headlines.
+
+        Returns:
+        - numpy array: Headlines x topics weights; LDA rows sum to 1.
+        """
+        counts = self.counts if counts is None else counts
+        if counts.shape[0] == 0:
+            return np.empty((0, self.settings['n_topics']))
+        return np.vstack([
+            self.model.transform(self.topic_input(
+                counts[start:start + self.chunksize]))
+            for start in range(0, counts.shape[0], self.chunksize)])
+
+    def top_terms(self, n=10):
+        """
+        The highest-weighted terms of each topic.
+
+        Args:
+        - n (int): Number of terms per topic.
+
+        Returns:
+        - list: One list of terms per topic. Columns without a known word
+        are shown as '#<column>'.
+        """
+        names = {}
+        for word, column in self.vocabulary.items():
+            names.setdefault(column, word)
+        return [[names.get(column, f'#{column}')
+                 for column in np.argsort(weights)[::-1][:n]]
+                for weights in self.model.components_]
+
+    def paths(self, key):
+        """
+        Locate the persisted files of a key.
+
+        Args:
+        - key (str): Key from `source_key`.
+
+        Returns:
+        - dict: Paths of the `counts`, `frequencies`, `model` and `meta`
+        files.
+        """
+        stem = os.path.join(self.cache_dir, f'{key}.headlines')
+        return {'counts': f'{stem}.counts.npz',
+                'frequencies': f'{stem}.df.npy',
+                'model': f'{stem}.model.joblib', 'meta': f'{stem}.json'}
+
+    def load(self, key):
+        """
+        Read persisted features.
+
+        Args:
+        - key (str): Key from `source_key`.
+
+        Returns:
+        - bool: True if they were found and read.
+        """
+        paths = self.paths(key)
+        # The metadata is written last, so its presence marks a complete
+        # set of files.
+        if not os.path.exists(paths['meta']):
+            return False
+        with open(paths['meta'], encoding='utf-8') as handle:
+            meta = json.load(handle)
+        if meta['settings'] != self.settings:
+            return False
+        self.counts = sp.load_npz(paths['counts']).tocsr()
+        self.document_frequencies = np.load(paths['frequencies'])
+        self.model = joblib.load(paths['model'])
+        self.vocabulary = meta['vocabulary']
+        return True
+
+    def save(self, key):
+        """
+        Atomically persist the features.
+
+        Args:
+        - key (str): Key from `source_key`.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        paths = self.paths(key)
+        writers = [
+            ('counts', lambda handle: sp.save_npz(
+                handle, self.counts, compressed=False)),
+            ('frequencies',
+             lambda handle: np.save(handle, self.document_frequencies)),
+            ('model', lambda handle: joblib.dump(self.model, handle)),
+            ('meta', lambda handle: handle.write(json.dumps({
+                'settings': self.settings,
+                'vocabulary': self.vocabulary}).encode()))]
+        for name, write in writers:
+            tmp_path = f'{paths[name]}.tmp'
+            with open(tmp_path, 'wb') as handle:
+                write(handle)
+            os.replace(tmp_path, paths[name])
+
+
+def topic_summary(features, n_terms=10):
+    """
+    Describe the topics of fitted headline features.
+
+    Args:
+    - features (HeadlineFeatures): Fitted features.
+    - n_terms (int): Number of terms listed per topic.
+
+    Returns:
+    - pandas DataFrame: Per topic, its top `terms`, the number of
+    `headlines` it dominates and their `share` of the headlines with at
+    least one term.
+    """
+    weights = features.document_topics()
+    dominant = weights[features.counts.getnnz(axis=1) > 0].argmax(axis=1)
+    headlines = np.bincount(dominant, minlength=weights.shape[1])
+    return pd.DataFrame({
+        'terms': [', '.join(terms) for terms in features.top_terms(n_terms)],
+        'headlines': headlines,
+        'share': headlines / max(len(dominant), 1)},
+        index=pd.RangeIndex(weights.shape[1], name='topic'))
+
+
+class TextFeatureAnalysis(FinancialNewsAnalysis):
+    """
+    A class for extracting text features and topics from the headlines.
+
+    Inherits from FinancialNewsAnalysis for access to dataset and basic
+    analysis methods.
+    """
+    analysis_columns = ['headline']
+
+    @instrumented
+    def headline_features(self, n_topics=DEFAULT_TOPICS, topic_model='nmf',
+                          cache_dir=None):
+        """
+        Vectorize the headlines and fit a topic model, chunk by chunk.
+
+        The rows of `data` are used when they are in memory, so a frame
+        shared through `from_frame`, a file set or `unique_stories` is
+        analyzed as loaded; otherwise `data_path` is streamed.
+
+        Args:
+        - n_topics (int): Number of topics.
+        - topic_model (str): 'nmf' or 'lda'.
+        - cache_dir (str): Directory the features are persisted in and
+        reused from.
+
+        Returns:
+        - HeadlineFeatures: The fitted features.
+        """
+        features = HeadlineFeatures(
+            n_topics=n_topics, topic_model=topic_model, cache_dir=cache_dir,
+            chunksize=self.chunksize or DEFAULT_CHUNKSIZE)
+        if self.data is not None:
+            return features.fit_frame(self.data)
+        return features.fit(self.data_path)
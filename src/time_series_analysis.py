@@ -3,9 +3,17 @@
 This module contains a class called `TimeSeriesAnalysis` that
 analyzes time series data of financial news articles.
 """
+import os
 import matplotlib.pyplot as plt
 import pandas as pd
 from src.financial_news_analysis import FinancialNewsAnalysis
+from src.forecasting import VolumeForecaster, daily_series
+from src.frequency_matrix import FrequencyMatrix
+from src.instrumentation import instrumented
+from src.news_statistics import ensure_datetime
+from src.plot_rendering import (
+    RenderJob, draw_article_spikes, draw_publication_frequency,
+    draw_publication_times)
 
 
 class TimeSeriesAnalysis(FinancialNewsAnalysis):
@@ -16,7 +24,21 @@ class TimeSeriesAnalysis(FinancialNewsAnalysis):
     - data_path (str): The path to the dataset CSV file.
     - data (DataFrame): The DataFrame containing the financial news data.
     """
+    analysis_columns = ['date', 'stock']
 
+    def daily_counts(self):
+        """
+        Count the articles published on each date.
+
+        The count comes from the memoized aggregates of the dataset, so the
+        rows are grouped at most once until `data` is replaced.
+
+        Returns:
+        - pd.Series: Number of articles per date, in date order.
+        """
+        return self.statistics().date_counts.sort_index()
+
+    @instrumented
     def publication_frequency_over_time(self):
         """
         Calculate the publication frequency of articles over time.
@@ -25,80 +47,175 @@ class TimeSeriesAnalysis(FinancialNewsAnalysis):
         - publication_frequency (pd.Series): A pandas Series with the
         publication frequency for each date.
         """
-        # Convert 'date' column to datetime
-        self.data['date'] = pd.to_datetime(self.data['date'], errors='coerce')
+        return self.daily_counts()
+
+    @instrumented
+    def publication_times(self):
+        """
+        Count the articles published in each hour of the day.
+
+        Returns:
+        - pd.Series: Number of articles per hour of the day.
+        """
+        return self.statistics().hour_counts
+
+    @instrumented
+    def article_spikes(self, n_std=2):
+        """
+        Find the dates whose publication count is a spike, i.e. above the
+        mean daily count plus `n_std` standard deviations.
+
+        Args:
+        - n_std (float): Number of standard deviations above the mean a
+        day's count must exceed.
+
+        Returns:
+        - pd.DataFrame: One row per spike date with the number of
+        `articles`, the `threshold` it exceeded and its `zscore`.
+        """
+        daily_publication_frequency = self.daily_counts()
+        mean_publication = daily_publication_frequency.mean()
+        std_dev_publication = daily_publication_frequency.std()
+        threshold = mean_publication + n_std * std_dev_publication
+        spikes = daily_publication_frequency[
+            daily_publication_frequency > threshold]
+        return pd.DataFrame({
+            'articles': spikes,
+            'threshold': threshold,
+            'zscore': (spikes - mean_publication) / std_dev_publication})
+
+    @instrumented
+    def frequency_matrix(self, dense=False):
+        """
+        Build the tickers x days matrix of article counts.
+
+        Args:
+        - dense (bool): Store the counts in a NumPy array instead of a
+        SciPy CSR matrix.
+
+        Returns:
+        - FrequencyMatrix: Article counts per ticker and calendar day.
+        """
+        return FrequencyMatrix.from_frame(self.data, dense)
 
-        # Group by date and count the number of articles published each day
-        publication_frequency = self.data.groupby(
-            self.data['date'].dt.date).size()
+    @instrumented
+    def forecast_publication_frequency(self, by='stock', top=None,
+                                       forecaster=None):
+        """
+        Forecast the daily publication frequency of every ticker or
+        publisher, one model per series.
 
-        return publication_frequency
+        Args:
+        - by (str): 'stock' or 'publisher'; the column must be loaded.
+        - top (int): Only forecast this many keys with the most articles.
+        - forecaster (VolumeForecaster): Fitting settings, such as the
+        horizon, process pool and fit cache. Defaults to Prophet fitted
+        serially without a cache.
 
-    def plot_publication_frequency(self, publication_frequency):
+        Returns:
+        - pd.DataFrame: One row per key and forecast day, as returned by
+        `VolumeForecaster.forecast`.
+        """
+        forecaster = forecaster or VolumeForecaster()
+        return forecaster.forecast(daily_series(
+            self.data, by, top, forecaster.min_active_days))
+
+    @instrumented
+    def plot_publication_frequency(self, publication_frequency,
+                                   output_path=None):
         """
         Plot the publication frequency over time.
 
         Args:
         - publication_frequency (pd.Series): A pandas Series with the
         publication frequency for each date.
+        - output_path (str): Write the figure to this PNG/SVG file instead
+        of showing it.
         """
-        plt.figure(figsize=(15, 6))
-        publication_frequency.plot(kind='line')
-        plt.title('Publication Frequency Over Time')
-        plt.xlabel('Date')
-        plt.ylabel('Number of Articles Published')
-        plt.grid(True)
-        plt.show()
+        self._plot(draw_publication_frequency, (publication_frequency,),
+                   (15, 6), output_path)
 
-    def analyze_publication_times(self):
+    @instrumented
+    def analyze_publication_times(self, output_path=None):
         """
         Analyzes the distribution of publication times throughout the day.
         Plots a bar chart showing the number of articles published in
         each hour.
-        """
-        # Extract the hour component from the 'date' column
-        self.data['hour'] = self.data['date'].dt.hour
 
-        # Group by hour and count the number of articles published in each hour
-        publication_times = self.data.groupby('hour').size()
+        Args:
+        - output_path (str): Write the figure to this PNG/SVG file instead
+        of showing it.
 
-        # Plotting publication times
-        plt.figure(figsize=(12, 6))
-        publication_times.plot(kind='bar')
-        plt.title('Publication Times Analysis')
-        plt.xlabel('Hour of the Day')
-        plt.ylabel('Number of Articles Published')
-        plt.xticks(rotation=0)
-        plt.show()
+        Returns:
+        - pd.Series: Number of articles published in each hour.
+        """
+        publication_times = self.publication_times()
+        self._plot(draw_publication_times, (publication_times,),
+                   (12, 6), output_path)
+        return publication_times
 
-    def analyze_article_spikes(self):
+    @instrumented
+    def analyze_article_spikes(self, output_path=None):
         """
         Identifies spikes in article publications related to specific
         market events.
         Plots the publication frequency over time, highlighting the spikes.
+
+        Args:
+        - output_path (str): Write the figure to this PNG/SVG file instead
+        of showing it.
+
+        Returns:
+        - pd.DataFrame: The spike table returned by `article_spikes`.
         """
-        # Calculate daily publication frequency
-        daily_publication_frequency = self.data.groupby(
-            self.data['date'].dt.date).size()
+        spikes = self.article_spikes()
+        self._plot(draw_article_spikes,
+                   (self.daily_counts(), spikes['articles']),
+                   (15, 6), output_path)
+        return spikes
+
+    @instrumented
+    def render_ticker_reports(self, output_dir, workers=None, fmt='png'):
+        """
+        Write a publication frequency plot for every ticker.
 
-        # Calculate the mean and standard deviation of daily
-        # publication frequency
-        mean_publication = daily_publication_frequency.mean()
-        std_dev_publication = daily_publication_frequency.std()
+        The per-ticker daily counts are computed in one grouping pass and
+        the plots are rendered headless, optionally in a process pool.
+
+        Args:
+        - output_dir (str): Directory receiving one file per ticker.
+        - workers (int): Number of rendering processes.
+        - fmt (str): Image format, e.g. 'png' or 'svg'.
 
-        # Find spikes where the publication frequency is above
-        # the mean + 2 standard deviations
-        spikes = daily_publication_frequency[daily_publication_frequency > (
-            mean_publication + 2 * std_dev_publication)]
-
-        # Plot the spikes
-        plt.figure(figsize=(15, 6))
-        daily_publication_frequency.plot(kind='line')
-        spikes.plot(
-            marker='o', linestyle='', color='r', markersize=8, label='Spikes')
-        plt.title('Publication Frequency with Spikes')
-        plt.xlabel('Date')
-        plt.ylabel('Number of Articles Published')
-        plt.legend()
-        plt.grid(True)
+        Returns:
+        - list: Paths of the written figures.
+        """
+        dates = ensure_datetime(self.data).dt.normalize()
+        daily = self.data.groupby(
+            [self.data['stock'], dates], observed=True).size()
+        jobs = [
+            RenderJob(
+                os.path.join(
+                    output_dir, f"{str(ticker).replace(os.sep, '_')}.{fmt}"),
+                draw_publication_frequency,
+                (counts.droplevel(0), f'Publication Frequency: {ticker}'),
+                (15, 6))
+            for ticker, counts in daily.groupby(level=0, observed=True)]
+        return self._render_jobs(jobs, workers)
+
+    def _plot(self, draw, args, figsize, output_path):
+        """
+        Show a plot, or write it to a file when a path is given.
+
+        Args:
+        - draw (callable): Drawing function taking an Axes and `args`.
+        - args (tuple): Pre-aggregated data passed to `draw`.
+        - figsize (tuple): Figure width and height in inches.
+        - output_path (str): Output file, or None to show the plot.
+        """
+        if output_path is not None:
+            self.figure_renderer().render(output_path, draw, args, figsize)
+            return
+        plt.figure(figsize=figsize)
+        draw(plt.gca(), *args)
         plt.show()
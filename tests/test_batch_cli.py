@@ -0,0 +1,169 @@
+#!/usr/bin/python3
+"""
+This module contains tests for the batch command line interface.
+"""
+import os
+import tempfile
+import unittest
+import inspect
+from unittest.mock import patch
+import pandas as pd
+import pycodestyle
+from src.batch_cli import ANALYSES, BatchOutput, main, run_batch
+from tests.test_forecasting import mean_forecast
+from tests.test_publisher_analysis import check_docstring
+import src
+MODULE_DOC = src.batch_cli.__doc__
+
+
+class TestBatchCliDocs(unittest.TestCase):
+    """
+    Tests to check the documentation and style of the batch_cli module.
+    """
+    def setUp(self):
+        """Set up for docstring tests"""
+        self.base_funcs = inspect.getmembers(
+            src.batch_cli, inspect.isfunction) + inspect.getmembers(
+            BatchOutput, inspect.isfunction)
+
+    def test_pep8_conformance(self):
+        """Test that src/batch_cli.py conforms to PEP8."""
+        for path in ['src/batch_cli.py', 'scripts/analyze.py',
+                     'tests/test_batch_cli.py']:
+            with self.subTest(path=path):
+                errors = pycodestyle.Checker(path).check_all()
+                self.assertEqual(errors, 0)
+
+    def test_module_docstring(self):
+        """Test for the existence of module docstring"""
+        self.assertIsNot(MODULE_DOC, None,
+                         "batch_cli.py needs a docstring")
+        self.assertTrue(len(MODULE_DOC) > 1,
+                        "batch_cli.py needs a docstring")
+
+    def test_func_docstrings(self):
+        """
+        Test for the presence of docstrings in batch_cli functions.
+        """
+        for func in self.base_funcs:
+            with self.subTest(function=func):
+                check_docstring(func[1])
+
+
+class TestBatchCli(unittest.TestCase):
+    """Unit tests for the batch command line interface"""
+    def setUp(self):
+        """Create a scratch output directory"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.data_path = 'data/raw_analyst_ratings.csv'
+
+    def tearDown(self):
+        """Remove the scratch output directory"""
+        self.tmp_dir.cleanup()
+
+    def test_one_load_for_every_analysis(self):
+        """Test that the file is parsed and aggregated only once"""
+        with patch('src.financial_news_analysis.load_news_data',
+                   wraps=src.data_loader.load_news_data) as load, \
+                patch('src.financial_news_analysis.NewsStatistics.from_frame',
+                      wraps=src.news_statistics.NewsStatistics.from_frame) \
+                as from_frame, \
+                patch('src.time_series_analysis.plt.show') as show:
+            timings = run_batch(self.data_path, output_dir=self.tmp_dir.name)
+        load.assert_called_once()
+        self.assertEqual(sorted(load.call_args.args[1]),
+                         ['date', 'headline', 'publisher', 'stock'])
+        from_frame.assert_called_once()
+        show.assert_not_called()
+        self.assertEqual(list(timings), [
+            'load', 'statistics', 'descriptive', 'publishers', 'domains',
+            'time_series'])
+
+    def test_outputs_written(self):
+        """Test the tables and figures of a CSV/SVG run"""
+        with patch('builtins.print'):
+            main([self.data_path, '-o', self.tmp_dir.name,
+                  '-a', 'publishers', 'time_series',
+                  '--table-format', 'csv', '--figure-format', 'svg'])
+        tables = os.path.join(self.tmp_dir.name, 'tables')
+        figures = os.path.join(self.tmp_dir.name, 'figures')
+        self.assertEqual(sorted(os.listdir(tables)), [
+            'article_spikes.csv', 'publication_frequency.csv',
+            'publication_times.csv', 'top_publishers.csv'])
+        self.assertEqual(sorted(os.listdir(figures)), [
+            'article_spikes.svg', 'publication_frequency.svg',
+            'publication_times.svg', 'publisher_distribution.svg'])
+        top = pd.read_csv(os.path.join(tables, 'top_publishers.csv'),
+                          index_col=0)
+        self.assertEqual(top.iloc[0, 0], 41)
+        self.assertEqual(top.index[0], 'Benzinga Newsdesk')
+
+    def test_unknown_analysis(self):
+        """Test that unknown analyses are rejected before loading"""
+        with self.assertRaises(ValueError):
+            run_batch(self.data_path, ['sentiment'], self.tmp_dir.name)
+        self.assertIn('ticker_reports', ANALYSES)
+        with self.assertRaises(ValueError):
+            run_batch(self.data_path, ['ticker_reports'], self.tmp_dir.name,
+                      out_of_core=True)
+        with self.assertRaises(ValueError):
+            run_batch(self.data_path, ['forecasts'], self.tmp_dir.name,
+                      out_of_core=True)
+
+    def test_unique_stories(self):
+        """Test a run over one row per near-duplicate story"""
+        timings = run_batch(self.data_path, ['descriptive'],
+                            self.tmp_dir.name, 'csv', unique_stories=True)
+        self.assertEqual(list(timings), [
+            'load', 'unique_stories', 'statistics', 'descriptive'])
+        dates = pd.read_csv(os.path.join(
+            self.tmp_dir.name, 'tables', 'date_counts.csv'), index_col=0)
+        # The sample repeats headlines only on different days.
+        self.assertEqual(dates.iloc[:, 0].sum(), 100)
+        with self.assertRaises(ValueError):
+            run_batch(self.data_path, ['descriptive'], self.tmp_dir.name,
+                      out_of_core=True, unique_stories=True)
+
+    def test_topics(self):
+        """Test the headline topics table and the persisted features"""
+        run_batch(self.data_path, ['topics'], self.tmp_dir.name, 'csv')
+        topics = pd.read_csv(os.path.join(
+            self.tmp_dir.name, 'tables', 'headline_topics.csv'), index_col=0)
+        self.assertEqual(len(topics), 10)
+        self.assertEqual(topics['headlines'].sum(), 100)
+        self.assertTrue(os.listdir(os.path.join(
+            self.tmp_dir.name, 'text_features')))
+
+    def test_forecasts(self):
+        """Test per-ticker forecasts are written and their fits cached"""
+        with patch('src.batch_cli.prophet_forecast', mean_forecast):
+            run_batch(self.data_path, ['forecasts'], self.tmp_dir.name,
+                      'csv')
+        forecasts = pd.read_csv(os.path.join(
+            self.tmp_dir.name, 'tables', 'ticker_forecasts.csv'))
+        self.assertEqual(forecasts['key'].unique().tolist(), ['A'])
+        self.assertEqual(len(forecasts), 30)
+        self.assertEqual(len(os.listdir(os.path.join(
+            self.tmp_dir.name, 'forecast_cache'))), 1)
+        totals = pd.read_csv(os.path.join(
+            self.tmp_dir.name, 'tables', 'ticker_forecast_totals.csv'),
+            index_col=0)
+        self.assertAlmostEqual(totals.loc['A', 'yhat'],
+                               forecasts['yhat'].sum())
+
+    def test_out_of_core_matches_in_memory(self):
+        """Test that a streamed run writes the same tables"""
+        for out_of_core in [False, True]:
+            with patch('src.time_series_analysis.plt.show'):
+                run_batch(self.data_path, ['publishers', 'domains'],
+                          os.path.join(self.tmp_dir.name, str(out_of_core)),
+                          'csv', out_of_core=out_of_core)
+        for name in ['top_publishers', 'publisher_domains']:
+            tables = [pd.read_csv(os.path.join(
+                self.tmp_dir.name, str(out_of_core), 'tables', f'{name}.csv'),
+                index_col=0).iloc[:, 0] for out_of_core in [False, True]]
+            self.assertEqual(tables[0].to_dict(), tables[1].to_dict())
+
+
+if __name__ == '__main__':
+    unittest.main()
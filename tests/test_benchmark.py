@@ -0,0 +1,93 @@
+#!/usr/bin/python3
+"""
+This module contains tests for the analysis benchmark suite.
+"""
+import os
+import tempfile
+import unittest
+import inspect
+import pycodestyle
+from src.benchmark import (
+    SUITE, compare, load_baselines, run_suite, save_baseline)
+from src.synthetic_data import write_ratings_csv
+from tests.test_publisher_analysis import check_docstring
+import src
+MODULE_DOC = src.benchmark.__doc__
+
+
+class TestBenchmarkDocs(unittest.TestCase):
+    """
+    Tests to check the documentation and style of the benchmark module.
+    """
+    def setUp(self):
+        """Set up for docstring tests"""
+        self.base_funcs = inspect.getmembers(
+            src.benchmark, inspect.isfunction)
+
+    def test_pep8_conformance(self):
+        """Test that src/benchmark.py conforms to PEP8."""
+        for path in ['src/benchmark.py', 'scripts/benchmark.py',
+                     'tests/test_benchmark.py']:
+            with self.subTest(path=path):
+                errors = pycodestyle.Checker(path).check_all()
+                self.assertEqual(errors, 0)
+
+    def test_module_docstring(self):
+        """Test for the existence of module docstring"""
+        self.assertIsNot(MODULE_DOC, None,
+                         "benchmark.py needs a docstring")
+        self.assertTrue(len(MODULE_DOC) > 1,
+                        "benchmark.py needs a docstring")
+
+    def test_func_docstrings(self):
+        """
+        Test for the presence of docstrings in benchmark functions.
+        """
+        for func in self.base_funcs:
+            with self.subTest(function=func):
+                check_docstring(func[1])
+
+
+class TestBenchmark(unittest.TestCase):
+    """Unit tests for the benchmark suite"""
+    def setUp(self):
+        """Write a small synthetic dataset"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.data_path = os.path.join(self.tmp_dir.name, 'ratings.csv')
+        write_ratings_csv(self.data_path, 2000)
+
+    def tearDown(self):
+        """Remove the scratch directory"""
+        self.tmp_dir.cleanup()
+
+    def test_suite_covers_every_step(self):
+        """Test that every class is loaded and every method is timed"""
+        results = run_suite(self.data_path)
+        expected = [f'{name}.{step}' for name, _, methods in SUITE
+                    for step in ['load'] + methods]
+        self.assertEqual(list(results), expected)
+        for metrics in results.values():
+            self.assertGreaterEqual(metrics['seconds'], 0)
+            self.assertGreater(metrics['peak_mb'], 0)
+        self.assertEqual(list(run_suite(self.data_path, memory=False)[
+            'publisher.load']), ['seconds'])
+
+    def test_baselines_round_trip_and_compare(self):
+        """Test stored baselines and regression detection"""
+        path = os.path.join(self.tmp_dir.name, 'baselines.json')
+        self.assertEqual(load_baselines(path), {})
+        save_baseline(path, 2000, {
+            'a.load': {'seconds': 1.0, 'peak_mb': 100.0},
+            'a.fast': {'seconds': 0.001, 'peak_mb': 1.0}})
+        baseline = load_baselines(path)['2000']
+        results = {
+            'a.load': {'seconds': 2.0, 'peak_mb': 120.0},
+            'a.fast': {'seconds': 0.01, 'peak_mb': 1.0},
+            'a.new': {'seconds': 9.0}}
+        self.assertEqual(compare(results, baseline),
+                         [('a.load', 'seconds', 1.0, 2.0)])
+        self.assertEqual(compare(results, baseline, tolerance=3), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+#!/usr/bin/python3
+"""
+This module contains tests for `CorrelationAnalysis` news volume versus
+price return correlations.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+import inspect
+import numpy as np
+import pandas as pd
+import pycodestyle
+from src.correlation_analysis import CorrelationAnalysis, load_prices
+from tests.test_publisher_analysis import check_docstring
+import src
+MODULE_DOC = src.correlation_analysis.__doc__
+
+
+class TestCorrelationAnalysisDocs(unittest.TestCase):
+    """
+    Tests to check the documentation and style of CorrelationAnalysis
+    class.
+    """
+    def setUp(self):
+        """Set up for docstring tests"""
+        self.base_funcs = inspect.getmembers(
+            CorrelationAnalysis, inspect.isfunction) + inspect.getmembers(
+            src.correlation_analysis, inspect.isfunction)
+
+    def test_pep8_conformance(self):
+        """Test that src/correlation_analysis.py conforms to PEP8."""
+        for path in ['src/correlation_analysis.py',
+                     'tests/test_correlation_analysis.py']:
+            with self.subTest(path=path):
+                errors = pycodestyle.Checker(path).check_all()
+                self.assertEqual(errors, 0)
+
+    def test_module_docstring(self):
+        """Test for the existence of module docstring"""
+        self.assertIsNot(MODULE_DOC, None,
+                         "correlation_analysis.py needs a docstring")
+        self.assertTrue(len(MODULE_DOC) > 1,
+                        "correlation_analysis.py needs a docstring")
+
+    def test_class_docstring(self):
+        """Test for the CorrelationAnalysis class docstring"""
+        self.assertIsNot(CorrelationAnalysis.__doc__, None,
+                         "CorrelationAnalysis class needs a docstring")
+        self.assertTrue(len(CorrelationAnalysis.__doc__) >= 1,
+                        "CorrelationAnalysis class needs a docstring")
+
+    def test_func_docstrings(self):
+        """
+        Test for the presence of docstrings in CorrelationAnalysis methods.
+        """
+        for func in self.base_funcs:
+            with self.subTest(function=func):
+                check_docstring(func[1])
+
+
+class TestCorrelationAnalysis(unittest.TestCase):
+    """Unit tests for CorrelationAnalysis class"""
+    def setUp(self):
+        """Write synthetic news and price files"""
+        self.tmp_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(11)
+        days = pd.bdate_range('2021-01-04', periods=120)
+        tickers = [f'T{i}' for i in range(6)]
+        closes = 100 * np.exp(np.cumsum(
+            rng.normal(0, 0.02, (len(days), len(tickers))), axis=0))
+        prices = pd.DataFrame(closes, index=days, columns=tickers)
+        prices.iloc[5:9, 2] = np.nan
+        long = prices.stack().rename('Close').reset_index()
+        long.columns = ['Date', 'Ticker', 'Close']
+        self.price_path = os.path.join(self.tmp_dir, 'prices.csv')
+        long.to_csv(self.price_path, index=False)
+        rows = rng.integers(0, len(days), 3000)
+        cols = rng.integers(0, len(tickers) + 1, 3000)
+        self.news = pd.DataFrame({
+            'date': days[rows] + pd.Timedelta(hours=10),
+            'stock': [f'T{i}' for i in cols]})
+        self.prices = prices
+
+    def tearDown(self):
+        """Remove the scratch directory"""
+        shutil.rmtree(self.tmp_dir)
+
+    def test_load_prices_formats(self):
+        """Test CSV and Parquet price files give the same wide frame"""
+        parquet_path = os.path.join(self.tmp_dir, 'prices.parquet')
+        pd.read_csv(self.price_path).to_parquet(parquet_path)
+        from_csv = load_prices(self.price_path)
+        pd.testing.assert_frame_equal(from_csv, load_prices(parquet_path))
+        self.assertEqual(from_csv.shape, (120, 6))
+
+    def test_matches_per_ticker_loop(self):
+        """Test batched correlations against pandas, ticker by ticker"""
+        analysis = CorrelationAnalysis('data/raw_analyst_ratings.csv')
+        analysis.data = self.news
+        result = analysis.news_return_correlation(
+            self.price_path, lags=(0, 2, -1))
+        self.assertEqual(len(result), 18)
+        counts = self.news.groupby(
+            [self.news['date'].dt.normalize(), 'stock']).size().unstack(
+            fill_value=0).reindex(self.prices.index, fill_value=0)
+        returns = self.prices.pct_change(fill_method=None)
+        for ticker in self.prices.columns:
+            for lag in (0, 2, -1):
+                with self.subTest(ticker=ticker, lag=lag):
+                    x = counts[ticker].astype(float)
+                    y = returns[ticker].shift(-lag)
+                    row = result.loc[(ticker, lag)]
+                    self.assertAlmostEqual(
+                        row['pearson'], x.corr(y), places=10)
+                    self.assertAlmostEqual(
+                        row['spearman'], x.corr(y, method='spearman'),
+                        places=10)
+                    self.assertEqual(
+                        row['observations'], (x.notna() & y.notna()).sum())
+
+    def test_tickers_without_prices_are_dropped(self):
+        """Test that only tickers with both news and prices are kept"""
+        analysis = CorrelationAnalysis('data/raw_analyst_ratings.csv')
+        analysis.data = self.news
+        news, returns = analysis.aligned_series(self.price_path)
+        self.assertNotIn('T6', news.columns)
+        self.assertEqual(news.columns.tolist(), returns.columns.tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+#!/usr/bin/python3
+"""
+This module contains tests for the typed, chunked dataset loader.
+"""
+import os
+import tempfile
+import unittest
+import inspect
+import pandas as pd
+import pycodestyle
+from src.data_loader import (
+    concat_chunks, fold_chunks, iter_news_chunks, load_news_data,
+    parse_date_column)
+from tests.test_publisher_analysis import check_docstring
+import src
+MODULE_DOC = src.data_loader.__doc__
+
+
+class TestDataLoaderDocs(unittest.TestCase):
+    """
+    Tests to check the documentation and style of the data_loader module.
+    """
+    def setUp(self):
+        """Set up for docstring tests"""
+        self.base_funcs = inspect.getmembers(
+            src.data_loader, inspect.isfunction)
+
+    def test_pep8_conformance(self):
+        """Test that src/data_loader.py conforms to PEP8."""
+        for path in ['src/data_loader.py',
+                     'tests/test_data_loader.py']:
+            with self.subTest(path=path):
+                errors = pycodestyle.Checker(path).check_all()
+                self.assertEqual(errors, 0)
+
+    def test_module_docstring(self):
+        """Test for the existence of module docstring"""
+        self.assertIsNot(MODULE_DOC, None,
+                         "data_loader.py needs a docstring")
+        self.assertTrue(len(MODULE_DOC) > 1,
+                        "data_loader.py needs a docstring")
+
+    def test_func_docstrings(self):
+        """
+        Test for the presence of docstrings in data_loader functions.
+        """
+        for func in self.base_funcs:
+            with self.subTest(function=func):
+                check_docstring(func[1])
+
+
+class TestDataLoader(unittest.TestCase):
+    """Unit tests for the data_loader functions"""
+    def setUp(self):
+        """Set up the path to the sample dataset"""
+        self.data_path = 'data/raw_analyst_ratings.csv'
+
+    def test_column_projection_and_dtypes(self):
+        """Test that only requested columns are read, with compact dtypes"""
+        data = load_news_data(
+            self.data_path, columns=['publisher', 'date', 'stock'])
+        self.assertEqual(list(data.columns), ['publisher', 'date', 'stock'])
+        self.assertIsInstance(data['publisher'].dtype, pd.CategoricalDtype)
+        self.assertIsInstance(data['stock'].dtype, pd.CategoricalDtype)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(data['date']))
+        self.assertEqual(len(data), 100)
+
+    def test_chunks_are_bounded(self):
+        """Test that iter_news_chunks never yields more than chunksize rows"""
+        sizes = [len(chunk) for chunk in iter_news_chunks(
+            self.data_path, columns=['publisher'], chunksize=30)]
+        self.assertEqual(sizes, [30, 30, 30, 10])
+
+    def test_chunked_load_matches_single_pass(self):
+        """Test that a chunked load equals a single-pass load"""
+        columns = ['headline', 'publisher', 'date', 'stock']
+        whole = load_news_data(self.data_path, columns)
+        chunked = load_news_data(self.data_path, columns, chunksize=17)
+        self.assertIsInstance(chunked['publisher'].dtype, pd.CategoricalDtype)
+        pd.testing.assert_frame_equal(
+            whole.astype({'publisher': str, 'stock': str}),
+            chunked.astype({'publisher': str, 'stock': str}))
+
+    def test_concat_chunks_unions_categories(self):
+        """Test that categories from different chunks are unioned"""
+        first = pd.DataFrame({'stock': pd.Categorical(['A', 'A'])})
+        second = pd.DataFrame({'stock': pd.Categorical(['B'])})
+        data = concat_chunks([first, second])
+        self.assertIsInstance(data['stock'].dtype, pd.CategoricalDtype)
+        self.assertEqual(data['stock'].tolist(), ['A', 'A', 'B'])
+
+    def test_fold_chunks_matches_concat(self):
+        """Test that folding chunks gives the concatenated frame"""
+        chunks = [
+            pd.DataFrame({'stock': pd.Categorical(['B', None, 'A']),
+                          'headline': ['x', 'y', 'z']}),
+            pd.DataFrame({'stock': pd.Categorical(['C', 'A']),
+                          'headline': ['u', 'v']})]
+        data = fold_chunks(iter(chunks))
+        pd.testing.assert_frame_equal(data, concat_chunks(chunks))
+        self.assertEqual(list(data['stock'].cat.categories), ['A', 'B', 'C'])
+        self.assertTrue(fold_chunks(iter([])).empty)
+
+    def test_parse_dates_with_mixed_offsets(self):
+        """Test the fixed-format path against per-value inference"""
+        dates = pd.Series([
+            '2020-06-05 10:30:54-04:00', '2020-01-03 10:30:54-05:00',
+            '2020-05-22 00:00:00', '2020-05-22T08:00:00.250+0200',
+            '2020-05-22', 'not a date', None, '2020-06-05 10:30:54+0a:00'])
+        parsed, bad = parse_date_column(dates)
+        self.assertEqual(str(parsed.dtype), 'datetime64[ns, UTC]')
+        pd.testing.assert_series_equal(parsed, pd.to_datetime(
+            dates, errors='coerce', utc=True, format='mixed'))
+        self.assertEqual(parsed[0].hour, 14)
+        self.assertEqual(parsed[1].hour, 15)
+        self.assertEqual(bad, 2)
+
+    def test_bad_dates_are_counted(self):
+        """Test that loads record how many dates could not be parsed"""
+        self.assertEqual(load_news_data(
+            self.data_path, ['date']).attrs['bad_dates'], 0)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            data_path = os.path.join(tmp_dir, 'ratings.csv')
+            pd.DataFrame({'date': [
+                '2020-06-05 10:30:54-04:00', 'x', 'y']}).to_csv(data_path)
+            data = load_news_data(data_path, ['date'], chunksize=2)
+        self.assertEqual(data.attrs['bad_dates'], 2)
+
+    def test_invalid_data_path(self):
+        """Test handling of invalid data path"""
+        with self.assertRaises(FileNotFoundError):
+            load_news_data('invalid_path_to_data.csv')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/python3
+"""
+This module contains tests for the `DatasetCache` columnar cache.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+import inspect
+from unittest.mock import patch
+import pandas as pd
+import pycodestyle
+from src.dataset_cache import DatasetCache
+from src.financial_news_analysis import FinancialNewsAnalysis
+from tests.test_publisher_analysis import check_docstring
+import src
+MODULE_DOC = src.dataset_cache.__doc__
+
+
+class TestDatasetCacheDocs(unittest.TestCase):
+    """
+    Tests to check the documentation and style of DatasetCache class.
+    """
+    def setUp(self):
+        """Set up for docstring tests"""
+        self.base_funcs = inspect.getmembers(
+            DatasetCache, inspect.isfunction)
+
+    def test_pep8_conformance(self):
+        """Test that src/dataset_cache.py conforms to PEP8."""
+        for path in ['src/dataset_cache.py',
+                     'tests/test_dataset_cache.py']:
+            with self.subTest(path=path):
+                errors = pycodestyle.Checker(path).check_all()
+                self.assertEqual(errors, 0)
+
+    def test_module_docstring(self):
+        """Test for the existence of module docstring"""
+        self.assertIsNot(MODULE_DOC, None,
+                         "dataset_cache.py needs a docstring")
+        self.assertTrue(len(MODULE_DOC) > 1,
+                        "dataset_cache.py needs a docstring")
+
+    def test_class_docstring(self):
+        """Test for the DatasetCache class docstring"""
+        self.assertIsNot(DatasetCache.__doc__, None,
+                         "DatasetCache class needs a docstring")
+        self.assertTrue(len(DatasetCache.__doc__) >= 1,
+                        "DatasetCache class needs a docstring")
+
+    def test_func_docstrings(self):
+        """
+        Test for the presence of docstrings in DatasetCache methods.
+        """
+        for func in self.base_funcs:
+            with self.subTest(function=func):
+                check_docstring(func[1])
+
+
+class TestDatasetCache(unittest.TestCase):
+    """Unit tests for DatasetCache class"""
+    def setUp(self):
+        """Copy the sample dataset into a scratch directory"""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.data_path = os.path.join(self.tmp_dir, 'ratings.csv')
+        shutil.copy('data/raw_analyst_ratings.csv', self.data_path)
+        self.cache = DatasetCache(os.path.join(self.tmp_dir, 'cache'))
+
+    def tearDown(self):
+        """Remove the scratch directory"""
+        shutil.rmtree(self.tmp_dir)
+
+    def test_cold_then_warm_load(self):
+        """Test that the second load is served from the cache"""
+        cold, cold_report = self.cache.load(self.data_path)
+        warm, warm_report = self.cache.load(self.data_path)
+        self.assertEqual(cold_report['source'], 'csv')
+        self.assertEqual(warm_report['source'], 'cache')
+        self.assertEqual(
+            warm_report['cold_seconds'], cold_report['seconds'])
+        self.assertEqual(warm_report['bad_dates'], 0)
+        self.assertEqual(warm.attrs['bad_dates'], 0)
+        self.assertIsInstance(warm['publisher'].dtype, pd.CategoricalDtype)
+        pd.testing.assert_frame_equal(cold, warm)
+
+    def test_column_projection(self):
+        """Test that cached loads return only the requested columns"""
+        self.cache.load(self.data_path)
+        data, _ = self.cache.load(self.data_path, columns=['date', 'stock'])
+        self.assertEqual(list(data.columns), ['date', 'stock'])
+
+    def test_touch_without_change_keeps_cache(self):
+        """Test that a new mtime with identical content is still a hit"""
+        self.cache.load(self.data_path)
+        stat = os.stat(self.data_path)
+        os.utime(self.data_path, ns=(stat.st_atime_ns,
+                                     stat.st_mtime_ns + 10 ** 9))
+        _, report = self.cache.load(self.data_path)
+        self.assertEqual(report['source'], 'cache')
+
+    def test_changed_source_invalidates(self):
+        """Test that changing the source file rebuilds the cache"""
+        self.cache.load(self.data_path)
+        with open(self.data_path, 'a', encoding='utf-8') as handle:
+            handle.write('100,100,Extra headline,https://example.com,'
+                         'Lisa Levin,2020-06-05 10:30:54-04:00,A\n')
+        data, report = self.cache.load(self.data_path)
+        self.assertEqual(report['source'], 'csv')
+        self.assertEqual(len(data), 101)
+
+    def test_analysis_uses_cache(self):
+        """Test that FinancialNewsAnalysis loads through the cache"""
+        cache_dir = os.path.join(self.tmp_dir, 'cache')
+        FinancialNewsAnalysis(self.data_path, cache_dir=cache_dir)
+        with patch('src.data_loader.pd.read_csv') as mock_read_csv:
+            fns = FinancialNewsAnalysis(self.data_path, cache_dir=cache_dir)
+            mock_read_csv.assert_not_called()
+        self.assertEqual(fns.load_report['source'], 'cache')
+        self.assertEqual(
+            list(fns.data.columns), FinancialNewsAnalysis.analysis_columns)
+
+
+if __name__ == '__main__':
+    unittest.main()
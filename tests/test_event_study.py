@@ -0,0 +1,200 @@
+#!/usr/bin/python3
+"""
+This module contains tests for the vectorized event study.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+import inspect
+import numpy as np
+import pandas as pd
+import pycodestyle
+from src.correlation_analysis import CorrelationAnalysis
+from src.event_study import EventStudy, market_events
+from tests.test_publisher_analysis import check_docstring
+import src
+MODULE_DOC = src.event_study.__doc__
+
+
+def loop_abnormal(returns, stock, date, window, model, estimation):
+    """
+    Abnormal returns of one event, computed row by row.
+
+    Args:
+    - returns (pandas DataFrame): Daily returns, days x tickers.
+    - stock (str): The event ticker.
+    - date (str): The event date.
+    - window (int): Days on each side of the event.
+    - model (str): 'market', 'mean' or 'raw'.
+    - estimation (int): Estimation period of 'mean'.
+
+    Returns:
+    - list: One abnormal return per window day.
+    """
+    row = returns.index.searchsorted(pd.Timestamp(date))
+    column = returns[stock]
+    values = []
+    for day in range(row - window, row + window + 1):
+        if day < 0 or day >= len(returns):
+            values.append(np.nan)
+        elif model == 'market':
+            values.append(column.iloc[day] - returns.iloc[day].mean())
+        else:
+            values.append(column.iloc[day])
+    if model == 'mean':
+        start = row - window
+        expected = column.iloc[max(start - estimation, 0):start].mean() \
+            if start >= 0 else np.nan
+        values = [value - expected for value in values]
+    return values
+
+
+class TestEventStudyDocs(unittest.TestCase):
+    """
+    Tests to check the documentation and style of the event_study module.
+    """
+    def setUp(self):
+        """Set up for docstring tests"""
+        self.base_funcs = inspect.getmembers(
+            EventStudy, inspect.isfunction) + inspect.getmembers(
+            src.event_study, inspect.isfunction)
+
+    def test_pep8_conformance(self):
+        """Test that src/event_study.py conforms to PEP8."""
+        for path in ['src/event_study.py', 'tests/test_event_study.py']:
+            with self.subTest(path=path):
+                errors = pycodestyle.Checker(path).check_all()
+                self.assertEqual(errors, 0)
+
+    def test_module_docstring(self):
+        """Test for the existence of module docstring"""
+        self.assertIsNot(MODULE_DOC, None,
+                         "event_study.py needs a docstring")
+        self.assertTrue(len(MODULE_DOC) > 1,
+                        "event_study.py needs a docstring")
+
+    def test_func_docstrings(self):
+        """
+        Test for the presence of docstrings in event_study functions.
+        """
+        for func in self.base_funcs:
+            with self.subTest(function=func):
+                check_docstring(func[1])
+
+
+class TestEventStudy(unittest.TestCase):
+    """Unit tests for EventStudy"""
+    def setUp(self):
+        """Build random returns and events"""
+        rng = np.random.default_rng(5)
+        days = pd.bdate_range('2021-01-04', periods=80)
+        self.returns = pd.DataFrame(
+            rng.normal(0, 0.02, (len(days), 4)), index=days,
+            columns=['T0', 'T1', 'T2', 'T3'])
+        self.returns.iloc[10:13, 1] = np.nan
+        self.events = pd.DataFrame({
+            'stock': ['T0', 'T1', 'T2', 'T3', 'T1', 'T0'],
+            # A weekend, the first and the last day, and a missing price.
+            'date': ['2021-01-09', '2021-01-04', '2021-04-23', '2021-02-15',
+                     '2021-01-20', '2021-03-01']})
+
+    def test_matches_event_loop(self):
+        """Test every model against a loop over events"""
+        for model in ['market', 'mean', 'raw']:
+            study = EventStudy(self.returns, self.events, window=3,
+                               model=model, estimation=20)
+            for i, event in self.events.iterrows():
+                with self.subTest(model=model, event=i):
+                    np.testing.assert_allclose(
+                        study.abnormal[i], loop_abnormal(
+                            self.returns, event['stock'], event['date'], 3,
+                            model, 20))
+
+    def test_drops_unknown_events(self):
+        """Test events without prices or after the data are dropped"""
+        events = pd.concat([self.events, pd.DataFrame({
+            'stock': ['T9', 'T0'], 'date': ['2021-02-01', '2022-01-03']})])
+        study = EventStudy(self.returns, events)
+        self.assertEqual(len(study.events), len(self.events))
+        self.assertEqual(study.events['day'].iloc[0],
+                         pd.Timestamp('2021-01-11'))
+
+    def test_benchmark(self):
+        """Test a benchmark column replaces the equal-weighted market"""
+        study = EventStudy(self.returns, self.events.iloc[:1], window=1,
+                           benchmark='T3')
+        self.assertNotIn('T3', study.events['stock'].tolist())
+        expected = (self.returns['T0'] - self.returns['T3']).iloc[4:7]
+        np.testing.assert_allclose(study.abnormal[0], expected)
+
+    def test_summary(self):
+        """Test cumulative returns and their cross-event aggregates"""
+        study = EventStudy(self.returns, self.events, window=2)
+        cumulative = study.cumulative_abnormal_returns()
+        pd.testing.assert_frame_equal(
+            cumulative, study.abnormal_returns().cumsum(axis=1,
+                                                        skipna=False))
+        summary = study.summary()
+        self.assertEqual(summary.index.tolist(), [-2, -1, 0, 1, 2])
+        complete = cumulative[2].dropna()
+        self.assertEqual(summary.loc[2, 'events'], len(complete))
+        self.assertAlmostEqual(summary.loc[2, 'mean_car'], complete.mean())
+        self.assertAlmostEqual(summary.loc[2, 'car_std'], complete.std())
+        self.assertAlmostEqual(
+            summary.loc[2, 'car_t'],
+            complete.mean() / complete.std() * np.sqrt(len(complete)))
+
+    def test_market_events(self):
+        """Test market-wide dates become one event per ticker"""
+        events = market_events(['2021-01-05', '2021-01-06'], ['T0', 'T1'])
+        self.assertEqual(len(events), 4)
+        self.assertEqual(list(events.columns), ['stock', 'date'])
+
+
+class TestSpikeEventStudy(unittest.TestCase):
+    """Tests for CorrelationAnalysis.spike_event_study"""
+    def setUp(self):
+        """Write a price file and news with one spike per ticker"""
+        self.tmp_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(3)
+        days = pd.bdate_range('2021-01-04', periods=60)
+        prices = pd.DataFrame(100 * np.exp(np.cumsum(
+            rng.normal(0, 0.01, (len(days), 3)), axis=0)), index=days,
+            columns=['T0', 'T1', 'SPY'])
+        long = prices.stack().rename('close').reset_index()
+        long.columns = ['date', 'stock', 'close']
+        self.price_path = os.path.join(self.tmp_dir, 'prices.csv')
+        long.to_csv(self.price_path, index=False)
+        dates = list(days) * 2 + [days[20]] * 30 + [days[40]] * 30
+        stocks = ['T0'] * 60 + ['T1'] * 60 + ['T0'] * 30 + ['T1'] * 30
+        self.analysis = CorrelationAnalysis('data/raw_analyst_ratings.csv')
+        self.analysis.data = pd.DataFrame({
+            'date': pd.DatetimeIndex(dates) + pd.Timedelta(hours=12),
+            'stock': stocks})
+
+    def tearDown(self):
+        """Remove the scratch directory"""
+        shutil.rmtree(self.tmp_dir)
+
+    def test_per_ticker_spikes(self):
+        """Test each ticker's spike day becomes one event"""
+        study = self.analysis.spike_event_study(self.price_path, window=2)
+        self.assertEqual(
+            study.events[['stock', 'day']].values.tolist(),
+            [['T0', pd.Timestamp('2021-02-01')],
+             ['T1', pd.Timestamp('2021-03-01')]])
+        self.assertEqual(study.abnormal.shape, (2, 5))
+
+    def test_market_spikes(self):
+        """Test market-wide spikes apply to every non-benchmark ticker"""
+        self.analysis.data = self.analysis.data.assign(
+            date=self.analysis.data['date'].dt.tz_localize('UTC'))
+        study = self.analysis.spike_event_study(
+            self.price_path, per_ticker=False, n_std=1, benchmark='SPY')
+        self.assertEqual(sorted(study.events['stock']),
+                         ['T0', 'T0', 'T1', 'T1'])
+
+
+if __name__ == '__main__':
+    unittest.main()
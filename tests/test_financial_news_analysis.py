@@ -132,8 +132,10 @@ class TestFinancialNewsAnalysis(unittest.TestCase):
         self.assertEqual(publisher_counts['Joel Elconin'], 1)
 
         # Check publish date counts
+        # Seven rows carry a -04:00 offset and two are written without one;
+        # all nine are counted now that mixed offsets parse.
         date_counts.index = pd.to_datetime(date_counts.index)
-        self.assertEqual(date_counts['2020-05-22'], 7)
+        self.assertEqual(date_counts['2020-05-22'], 9)
         self.assertEqual(date_counts['2020-06-05'], 1)
         self.assertEqual(date_counts['2020-06-03'], 1)
         self.assertEqual(date_counts['2020-05-26'], 1)
@@ -163,6 +165,23 @@ class TestFinancialNewsAnalysis(unittest.TestCase):
         self.assertEqual(date_counts['2020-06-03'], 1)
         self.assertEqual(date_counts['2020-05-26'], 1)
 
+    def test_typed_initialization(self):
+        """Test the typed, chunked loading mode"""
+        fns = FinancialNewsAnalysis(self.data_path, chunksize=40)
+        self.assertEqual(
+            list(fns.data.columns), FinancialNewsAnalysis.analysis_columns)
+        self.assertIsInstance(fns.data['publisher'].dtype, pd.CategoricalDtype)
+        self.assertEqual(len(fns.data), 100)
+        _, publisher_counts, _ = fns.descriptive_statistics()
+        self.assertEqual(publisher_counts['Benzinga Newsdesk'], 41)
+
+    def test_statistics_memoized(self):
+        """Test that aggregates are reused until data is replaced"""
+        stats = self.financial_news_analysis.statistics()
+        self.assertIs(self.financial_news_analysis.statistics(), stats)
+        self.financial_news_analysis.data = sample_data.copy()
+        self.assertEqual(self.financial_news_analysis.statistics().rows, 3)
+
     def test_invalid_data_path(self):
         """Test handling of invalid data path"""
         # Test if an invalid data path raises an exception
@@ -0,0 +1,201 @@
+#!/usr/bin/python3
+"""
+This module contains tests for the per-ticker news volume forecaster.
+"""
+import unittest
+import inspect
+import os
+import tempfile
+from unittest.mock import patch
+import pandas as pd
+import pycodestyle
+from src.forecasting import VolumeForecaster, daily_series, forecast_summary
+from src.time_series_analysis import TimeSeriesAnalysis
+from tests.test_publisher_analysis import check_docstring
+import src
+MODULE_DOC = src.forecasting.__doc__
+DATA_PATH = 'data/raw_analyst_ratings.csv'
+
+
+def mean_forecast(series, horizon):
+    """
+    Forecast the mean daily count, a cheap stand-in for Prophet.
+
+    Args:
+    - series (pandas Series): Articles per day.
+    - horizon (int): Number of days to forecast.
+
+    Returns:
+    - tuple: The mean as the fitted parameters and the forecast.
+    """
+    mean = float(series.mean())
+    dates = pd.date_range(series.index[-1], periods=horizon + 1,
+                          freq='D')[1:]
+    return {'mean': mean}, pd.DataFrame({
+        'ds': dates, 'yhat': mean, 'yhat_lower': 0.0,
+        'yhat_upper': 2 * mean})
+
+
+def make_series(active_days, start='2020-01-01'):
+    """
+    Build a daily count series with one article every other day.
+
+    Args:
+    - active_days (int): Number of days with an article.
+    - start (str): First date.
+
+    Returns:
+    - pandas Series: Articles per day.
+    """
+    index = pd.date_range(start, periods=2 * active_days - 1, freq='D')
+    return pd.Series([1, 0] * (active_days - 1) + [1], index=index)
+
+
+class TestForecastingDocs(unittest.TestCase):
+    """
+    Tests to check the documentation and style of the forecasting module.
+    """
+    def setUp(self):
+        """Set up for docstring tests"""
+        self.base_funcs = inspect.getmembers(
+            src.forecasting.VolumeForecaster, inspect.isfunction) + \
+            inspect.getmembers(src.forecasting, inspect.isfunction)
+
+    def test_pep8_conformance(self):
+        """Test that src/forecasting.py conforms to PEP8."""
+        for path in ['src/forecasting.py', 'tests/test_forecasting.py']:
+            with self.subTest(path=path):
+                errors = pycodestyle.Checker(path).check_all()
+                self.assertEqual(errors, 0)
+
+    def test_module_docstring(self):
+        """Test for the existence of module docstring"""
+        self.assertIsNot(MODULE_DOC, None,
+                         "forecasting.py needs a docstring")
+        self.assertTrue(len(MODULE_DOC) > 1,
+                        "forecasting.py needs a docstring")
+
+    def test_func_docstrings(self):
+        """
+        Test for the presence of docstrings in forecasting functions.
+        """
+        for func in self.base_funcs:
+            with self.subTest(function=func):
+                check_docstring(func[1])
+
+
+class TestDailySeries(unittest.TestCase):
+    """
+    Tests for building the per-key daily count series.
+    """
+    def setUp(self):
+        """Load the sample dataset"""
+        self.data = pd.read_csv(DATA_PATH)
+
+    def test_counts_match_rows(self):
+        """Test every article is counted once, with gaps filled"""
+        series = daily_series(self.data)
+        self.assertEqual(sum(int(counts.sum()) for counts in
+                             series.values()), len(self.data))
+        for counts in series.values():
+            self.assertEqual(counts.index.freq, 'D')
+            self.assertIsNone(counts.index.tz)
+
+    def test_top_and_min_active_days(self):
+        """Test keys are ordered by articles and filtered"""
+        series = daily_series(self.data, top=2)
+        expected = self.data['stock'].value_counts().head(2)
+        self.assertEqual(list(series), list(expected.index))
+        active = {key: int((counts > 0).sum())
+                  for key, counts in daily_series(self.data).items()}
+        self.assertEqual(
+            set(daily_series(self.data, min_active_days=2)),
+            {key for key, days in active.items() if days >= 2})
+
+    def test_series_end_on_last_date(self):
+        """Test quiet days after a key's last article are zeros"""
+        data = pd.DataFrame({
+            'stock': ['A', 'A', 'B', 'B'],
+            'date': pd.to_datetime(['2020-01-01 10:00', '2020-01-02 11:00',
+                                    '2020-01-05 09:00', '2020-01-10 12:00'])})
+        series = daily_series(data)
+        self.assertEqual(series['A'].index[-1], pd.Timestamp('2020-01-10'))
+        self.assertEqual(series['A'].tolist(), [1, 1] + [0] * 8)
+        self.assertEqual(series['B'].index[0], pd.Timestamp('2020-01-05'))
+        self.assertEqual(series['B'].sum(), 2)
+        self.assertIsNone(series['B'].index.tz)
+
+
+class TestVolumeForecaster(unittest.TestCase):
+    """
+    Tests for fitting, skipping and caching per-key forecasts.
+    """
+    def setUp(self):
+        """Build two modelled series and a sparse one"""
+        self.series = {'AAA': make_series(10), 'BBB': make_series(12),
+                       'CCC': make_series(3)}
+
+    def test_skips_sparse_series(self):
+        """Test series with too few active days are not fitted"""
+        forecaster = VolumeForecaster(mean_forecast, horizon=5,
+                                      min_active_days=5)
+        forecasts = forecaster.forecast(self.series)
+        self.assertEqual(list(forecasts.columns),
+                         ['key', 'ds', 'yhat', 'yhat_lower', 'yhat_upper'])
+        self.assertEqual(forecasts['key'].value_counts().to_dict(),
+                         {'AAA': 5, 'BBB': 5})
+        self.assertEqual(forecaster.report, {
+            'series': 3, 'skipped': 1, 'cached': 0, 'fitted': 2})
+
+    def test_cache_avoids_refits(self):
+        """Test unchanged series are read back instead of refit"""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            forecaster = VolumeForecaster(mean_forecast, horizon=5,
+                                          min_active_days=5,
+                                          cache_dir=cache_dir)
+            first = forecaster.forecast(self.series)
+            self.assertEqual(len(os.listdir(cache_dir)), 2)
+            self.series['BBB'] = make_series(13)
+            with patch.object(forecaster, '_fit',
+                              wraps=forecaster._fit) as fit:
+                second = forecaster.forecast(self.series)
+            fit.assert_called_once()
+            self.assertEqual(len(fit.call_args.args[0]), 1)
+            self.assertEqual(forecaster.report, {
+                'series': 3, 'skipped': 1, 'cached': 1, 'fitted': 1})
+            pd.testing.assert_frame_equal(
+                second[second['key'] == 'AAA'],
+                first[first['key'] == 'AAA'], check_dtype=False)
+
+    def test_process_pool_matches_serial(self):
+        """Test fitting in worker processes gives the serial result"""
+        serial = VolumeForecaster(mean_forecast, min_active_days=5)
+        pooled = VolumeForecaster(mean_forecast, min_active_days=5,
+                                  workers=2)
+        pd.testing.assert_frame_equal(pooled.forecast(self.series),
+                                      serial.forecast(self.series))
+
+    def test_forecast_summary(self):
+        """Test forecasts are totalled per key, largest first"""
+        forecasts = VolumeForecaster(mean_forecast, horizon=4,
+                                     min_active_days=1).forecast(self.series)
+        summary = forecast_summary(forecasts)
+        self.assertEqual(list(summary.index), ['CCC', 'AAA', 'BBB'])
+        self.assertTrue(summary['yhat'].is_monotonic_decreasing)
+        self.assertAlmostEqual(summary.loc['AAA', 'yhat'],
+                               4 * self.series['AAA'].mean())
+
+    def test_time_series_analysis(self):
+        """Test the analysis forecasts the top tickers of the dataset"""
+        analysis = TimeSeriesAnalysis(DATA_PATH)
+        forecasts = analysis.forecast_publication_frequency(
+            top=3, forecaster=VolumeForecaster(mean_forecast, horizon=2,
+                                               min_active_days=1))
+        self.assertEqual(
+            list(forecasts['key'].unique()),
+            list(analysis.data['stock'].value_counts().head(3).index))
+        self.assertEqual(len(forecasts), 2 * forecasts['key'].nunique())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+#!/usr/bin/python3
+"""
+This module contains tests for the `FrequencyMatrix` tickers x days
+article-count matrix.
+"""
+import unittest
+import inspect
+import numpy as np
+import pandas as pd
+import pycodestyle
+from scipy import sparse as sp
+from src.frequency_matrix import FrequencyMatrix
+from tests.test_publisher_analysis import check_docstring
+import src
+MODULE_DOC = src.frequency_matrix.__doc__
+
+
+class TestFrequencyMatrixDocs(unittest.TestCase):
+    """
+    Tests to check the documentation and style of FrequencyMatrix class.
+    """
+    def setUp(self):
+        """Set up for docstring tests"""
+        self.base_funcs = inspect.getmembers(
+            FrequencyMatrix, inspect.isfunction) + inspect.getmembers(
+            src.frequency_matrix, inspect.isfunction)
+
+    def test_pep8_conformance(self):
+        """Test that src/frequency_matrix.py conforms to PEP8."""
+        for path in ['src/frequency_matrix.py',
+                     'tests/test_frequency_matrix.py']:
+            with self.subTest(path=path):
+                errors = pycodestyle.Checker(path).check_all()
+                self.assertEqual(errors, 0)
+
+    def test_module_docstring(self):
+        """Test for the existence of module docstring"""
+        self.assertIsNot(MODULE_DOC, None,
+                         "frequency_matrix.py needs a docstring")
+        self.assertTrue(len(MODULE_DOC) > 1,
+                        "frequency_matrix.py needs a docstring")
+
+    def test_class_docstring(self):
+        """Test for the FrequencyMatrix class docstring"""
+        self.assertIsNot(FrequencyMatrix.__doc__, None,
+                         "FrequencyMatrix class needs a docstring")
+        self.assertTrue(len(FrequencyMatrix.__doc__) >= 1,
+                        "FrequencyMatrix class needs a docstring")
+
+    def test_func_docstrings(self):
+        """
+        Test for the presence of docstrings in FrequencyMatrix methods.
+        """
+        for func in self.base_funcs:
+            with self.subTest(function=func):
+                check_docstring(func[1])
+
+
+class TestFrequencyMatrix(unittest.TestCase):
+    """Unit tests for FrequencyMatrix class"""
+    def setUp(self):
+        """Build a small multi-ticker dataset"""
+        self.data = pd.DataFrame({
+            'stock': ['B', 'A', 'A', 'B', 'A', None, 'A'],
+            'date': ['2022-01-01 10:00:00-04:00', '2022-01-01 23:30:00-04:00',
+                     '2022-01-01 09:00:00-04:00', '2022-01-04 09:00:00-04:00',
+                     '2022-01-03 09:00:00-04:00', '2022-01-03 09:00:00-04:00',
+                     None]})
+
+    def test_counts_match_groupby(self):
+        """Test the sparse and dense matrices against a groupby"""
+        expected = self.data.assign(
+            date=pd.to_datetime(self.data['date'], utc=True)).dropna()
+        expected = expected.groupby(
+            ['stock', expected['date'].dt.date]).size()
+        for dense in [False, True]:
+            with self.subTest(dense=dense):
+                matrix = FrequencyMatrix.from_frame(self.data.copy(), dense)
+                self.assertEqual(sp.issparse(matrix.counts), not dense)
+                self.assertEqual(matrix.tickers.tolist(), ['A', 'B'])
+                self.assertEqual(len(matrix.days), 4)
+                for (ticker, day), count in expected.items():
+                    self.assertEqual(
+                        matrix.ticker_series(ticker)[str(day)], count)
+                self.assertEqual(
+                    matrix.daily_totals().tolist(), [2, 1, 1, 1])
+
+    def test_compare_slices_days(self):
+        """Test side-by-side counts for a date range"""
+        matrix = FrequencyMatrix.from_frame(self.data)
+        frame = matrix.compare(['B', 'A'], '2022-01-02', '2022-01-04')
+        self.assertEqual(frame.columns.tolist(), ['B', 'A'])
+        self.assertEqual(frame['A'].tolist(), [1, 1, 0])
+        self.assertEqual(frame['B'].tolist(), [0, 0, 1])
+
+    def test_spikes_match_dense_rule(self):
+        """Test spikes against mean + 2 std per ticker row"""
+        rng = np.random.default_rng(3)
+        dates = pd.Timestamp('2022-01-01') + pd.to_timedelta(
+            rng.integers(0, 90, 3000), unit='D')
+        data = pd.DataFrame({
+            'stock': rng.choice(['A', 'B', 'C'], 3000, p=[.6, .3, .1]),
+            'date': dates})
+        data.loc[:80, 'date'] = pd.Timestamp('2022-02-01')
+        matrix = FrequencyMatrix.from_frame(data, dense=True)
+        spikes = matrix.spikes()
+        for row, ticker in enumerate(matrix.tickers):
+            counts = matrix.counts[row]
+            expected = matrix.days[counts > counts.mean() + 2 * counts.std(
+                ddof=1)]
+            self.assertEqual(
+                spikes.loc[spikes['stock'] == ticker, 'date'].tolist(),
+                expected.tolist())
+        self.assertIn(pd.Timestamp('2022-02-01'), spikes['date'].tolist())
+        sparse_spikes = FrequencyMatrix.from_frame(data).spikes()
+        pd.testing.assert_frame_equal(
+            sparse_spikes.sort_values(['stock', 'date']).reset_index(
+                drop=True),
+            spikes.sort_values(['stock', 'date']).reset_index(drop=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
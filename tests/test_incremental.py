@@ -0,0 +1,175 @@
+#!/usr/bin/python3
+"""
+This module contains tests for `IncrementalAggregator` append-only
+ingestion.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+import inspect
+from unittest.mock import patch
+import pandas as pd
+import pycodestyle
+from src.data_loader import load_news_data
+from src.incremental import IncrementalAggregator
+from src.news_statistics import NewsStatistics
+from src.publisher_analysis import PublisherAnalysis
+from tests.test_publisher_analysis import check_docstring
+import src
+MODULE_DOC = src.incremental.__doc__
+
+
+class TestIncrementalAggregatorDocs(unittest.TestCase):
+    """
+    Tests to check the documentation and style of IncrementalAggregator
+    class.
+    """
+    def setUp(self):
+        """Set up for docstring tests"""
+        self.base_funcs = inspect.getmembers(
+            IncrementalAggregator, inspect.isfunction)
+
+    def test_pep8_conformance(self):
+        """Test that src/incremental.py conforms to PEP8."""
+        for path in ['src/incremental.py',
+                     'tests/test_incremental.py']:
+            with self.subTest(path=path):
+                errors = pycodestyle.Checker(path).check_all()
+                self.assertEqual(errors, 0)
+
+    def test_module_docstring(self):
+        """Test for the existence of module docstring"""
+        self.assertIsNot(MODULE_DOC, None,
+                         "incremental.py needs a docstring")
+        self.assertTrue(len(MODULE_DOC) > 1,
+                        "incremental.py needs a docstring")
+
+    def test_class_docstring(self):
+        """Test for the IncrementalAggregator class docstring"""
+        self.assertIsNot(IncrementalAggregator.__doc__, None,
+                         "IncrementalAggregator class needs a docstring")
+        self.assertTrue(len(IncrementalAggregator.__doc__) >= 1,
+                        "IncrementalAggregator class needs a docstring")
+
+    def test_func_docstrings(self):
+        """
+        Test for the presence of docstrings in IncrementalAggregator methods.
+        """
+        for func in self.base_funcs:
+            with self.subTest(function=func):
+                check_docstring(func[1])
+
+
+def assert_same_statistics(test, actual, expected):
+    """
+    Assert that two NewsStatistics objects hold the same aggregates.
+
+    Args:
+    - test (unittest.TestCase): The running test case.
+    - actual (NewsStatistics): Aggregates under test.
+    - expected (NewsStatistics): Reference aggregates.
+    """
+    test.assertEqual(actual.rows, expected.rows)
+    for name in ['length_counts', 'publisher_counts', 'date_counts',
+                 'hour_counts', 'stock_counts']:
+        test.assertEqual(
+            getattr(actual, name).to_dict(), getattr(expected, name).to_dict())
+
+
+class TestIncrementalAggregator(unittest.TestCase):
+    """Unit tests for IncrementalAggregator class"""
+    def setUp(self):
+        """Split the sample dataset into an initial file and a delta"""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.data_path = os.path.join(self.tmp_dir, 'ratings.csv')
+        self.state_path = os.path.join(self.tmp_dir, 'state.json')
+        with open('data/raw_analyst_ratings.csv', encoding='utf-8') as f:
+            self.lines = f.readlines()
+        with open(self.data_path, 'w', encoding='utf-8') as handle:
+            handle.writelines(self.lines[:61])
+        self.expected = NewsStatistics.from_frame(load_news_data(
+            'data/raw_analyst_ratings.csv'))
+
+    def tearDown(self):
+        """Remove the scratch directory"""
+        shutil.rmtree(self.tmp_dir)
+
+    def append(self, lines):
+        """
+        Append raw lines to the scratch dataset.
+
+        Args:
+        - lines (list): Lines to append.
+        """
+        with open(self.data_path, 'a', encoding='utf-8') as handle:
+            handle.writelines(lines)
+
+    def test_refresh_folds_in_only_appended_rows(self):
+        """Test that a refresh after an append reads only the new rows"""
+        aggregator = IncrementalAggregator(self.data_path, self.state_path)
+        self.assertEqual(aggregator.refresh().rows, 60)
+        self.append(self.lines[61:])
+        with patch('src.incremental.load_news_data',
+                   wraps=load_news_data) as mock_load:
+            stats = aggregator.refresh()
+            self.assertEqual(mock_load.call_count, 1)
+            block = mock_load.call_args[0][0].getvalue()
+            self.assertEqual(block.count(b'\n'), 41)
+        assert_same_statistics(self, stats, self.expected)
+        self.assertEqual(
+            stats.length_moments()['count'], self.expected.rows)
+        pd.testing.assert_series_equal(
+            stats.headline_stats, self.expected.headline_stats)
+
+    def test_incomplete_line_is_deferred(self):
+        """Test that a partially written last line is read later"""
+        aggregator = IncrementalAggregator(self.data_path, self.state_path)
+        aggregator.refresh()
+        last = self.lines[61]
+        self.append([last[:20]])
+        self.assertEqual(aggregator.refresh().rows, 60)
+        self.append([last[20:]])
+        self.assertEqual(aggregator.refresh().rows, 61)
+
+    def test_rewritten_file_rebuilds_state(self):
+        """Test that a non-append change triggers a full rebuild"""
+        aggregator = IncrementalAggregator(self.data_path, self.state_path)
+        aggregator.refresh()
+        with open(self.data_path, 'w', encoding='utf-8') as handle:
+            handle.writelines(self.lines[:1] + self.lines[41:])
+        self.assertEqual(aggregator.refresh().rows, 60)
+
+    def test_empty_file(self):
+        """Test a header-only or empty file gives empty aggregates"""
+        aggregator = IncrementalAggregator(self.data_path, self.state_path)
+        for lines in [self.lines[:1], []]:
+            with self.subTest(lines=len(lines)):
+                aggregator.reset()
+                with open(self.data_path, 'w', encoding='utf-8') as handle:
+                    handle.writelines(lines)
+                stats = aggregator.refresh()
+                self.assertEqual(stats.rows, 0)
+                self.assertEqual(stats.headline_stats['count'], 0)
+                self.assertTrue(stats.top_publishers().empty)
+        with open(self.data_path, 'w', encoding='utf-8') as handle:
+            handle.writelines(self.lines[:1])
+        aggregator.reset()
+        aggregator.refresh()
+        self.append(self.lines[1:])
+        assert_same_statistics(self, aggregator.refresh(), self.expected)
+
+    def test_incremental_analysis(self):
+        """Test PublisherAnalysis running from incremental state"""
+        self.append(self.lines[61:])
+        analysis = PublisherAnalysis(
+            self.data_path, state_path=self.state_path)
+        self.assertIsNone(analysis.data)
+        self.assertEqual(analysis.top_publishers(1).to_dict(),
+                         {'Benzinga Newsdesk': 41})
+        headline_stats, _, _ = analysis.descriptive_statistics()
+        self.assertEqual(headline_stats['count'], 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+#!/usr/bin/python3
+"""
+This module contains tests for the opt-in instrumentation layer.
+"""
+import os
+import pstats
+import tempfile
+import unittest
+import inspect
+import pandas as pd
+import pycodestyle
+from src import instrumentation
+from src.instrumentation import (
+    disable, enable, instrumented, measure, read_records, summarize)
+from src.publisher_analysis import PublisherAnalysis
+from tests.test_publisher_analysis import check_docstring
+import src
+MODULE_DOC = src.instrumentation.__doc__
+
+
+@instrumented
+def failing_step(data):
+    """Raise after receiving a frame"""
+    raise ValueError(f'{len(data)} rows')
+
+
+class TestInstrumentationDocs(unittest.TestCase):
+    """
+    Tests to check the documentation and style of the instrumentation
+    module.
+    """
+    def setUp(self):
+        """Set up for docstring tests"""
+        self.base_funcs = inspect.getmembers(
+            src.instrumentation, inspect.isfunction) + inspect.getmembers(
+            src.instrumentation.InstrumentationConfig, inspect.isfunction)
+
+    def test_pep8_conformance(self):
+        """Test that src/instrumentation.py conforms to PEP8."""
+        for path in ['src/instrumentation.py',
+                     'scripts/instrumentation_report.py',
+                     'tests/test_instrumentation.py']:
+            with self.subTest(path=path):
+                errors = pycodestyle.Checker(path).check_all()
+                self.assertEqual(errors, 0)
+
+    def test_module_docstring(self):
+        """Test for the existence of module docstring"""
+        self.assertIsNot(MODULE_DOC, None,
+                         "instrumentation.py needs a docstring")
+        self.assertTrue(len(MODULE_DOC) > 1,
+                        "instrumentation.py needs a docstring")
+
+    def test_func_docstrings(self):
+        """
+        Test for the presence of docstrings in instrumentation functions.
+        """
+        for func in self.base_funcs:
+            with self.subTest(function=func):
+                check_docstring(func[1])
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Unit tests for the instrumentation layer"""
+    def setUp(self):
+        """Create a scratch directory for the records"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.records_path = os.path.join(self.tmp_dir.name, 'calls.jsonl')
+
+    def tearDown(self):
+        """Turn instrumentation off and remove the scratch directory"""
+        disable()
+        self.tmp_dir.cleanup()
+
+    def test_disabled_by_default(self):
+        """Test that nothing is written unless enabled"""
+        self.assertIsNone(instrumentation.CONFIG.output_path)
+        analysis = PublisherAnalysis('data/raw_analyst_ratings.csv')
+        analysis.top_publishers()
+        self.assertFalse(os.path.exists(self.records_path))
+
+    def test_records_nested_calls(self):
+        """Test the per-call records of a load and an analysis"""
+        enable(self.records_path)
+        analysis = PublisherAnalysis(
+            'data/raw_analyst_ratings.csv', typed=True)
+        analysis.extract_domains()
+        analysis.top_publishers()
+        records = read_records(self.records_path)
+        self.assertEqual(records['call'].tolist(), [
+            'data_loader.load_news_data', 'PublisherAnalysis.__init__',
+            'PublisherTable.extend', 'PublisherAnalysis.extract_domains',
+            'NewsStatistics.from_frame', 'PublisherAnalysis.statistics',
+            'PublisherAnalysis.top_publishers'])
+        self.assertEqual(records['depth'].tolist(), [1, 0, 1, 0, 2, 1, 0])
+        self.assertTrue((records['rows'] == 100).all())
+        for column in ['wall_seconds', 'cpu_seconds', 'memory_delta_mb']:
+            self.assertTrue(records[column].notna().all())
+        summary = summarize(records)
+        self.assertEqual(summary.loc['PublisherAnalysis.__init__', 'calls'], 1)
+        self.assertIn('rows_per_second', summary)
+
+    def test_profile_and_trace_single_method(self):
+        """Test cProfile and tracemalloc capture for selected calls"""
+        enable(self.records_path,
+               profile=['PublisherAnalysis.extract_domains'],
+               trace_memory=['data_loader.load_news_data'])
+        analysis = PublisherAnalysis(
+            'data/raw_analyst_ratings.csv', typed=True)
+        analysis.extract_domains()
+        records = read_records(self.records_path).set_index('call')
+        profile_path = records.loc[
+            'PublisherAnalysis.extract_domains', 'profile_path']
+        self.assertTrue(profile_path.startswith(self.tmp_dir.name))
+        self.assertGreater(pstats.Stats(profile_path).total_calls, 0)
+        self.assertGreater(records.loc[
+            'data_loader.load_news_data', 'tracemalloc_peak_mb'], 0)
+        self.assertTrue(pd.isna(records.loc[
+            'PublisherAnalysis.__init__', 'tracemalloc_peak_mb']))
+
+    def test_failed_call_is_recorded(self):
+        """Test that a raising call is recorded and re-raised"""
+        enable(self.records_path)
+        with self.assertRaises(ValueError):
+            failing_step(pd.DataFrame({'a': [1, 2]}))
+        record = read_records(self.records_path).iloc[0]
+        self.assertEqual(record['call'], 'test_instrumentation.failing_step')
+        self.assertIn('2 rows', record['error'])
+
+    def test_measure(self):
+        """Test that measure returns the result with its time and memory"""
+        result, metrics = measure(sum, ([1, 2, 3],))
+        self.assertEqual(result, 6)
+        self.assertEqual(sorted(metrics), ['peak_mb', 'seconds'])
+        _, metrics = measure(list, kwargs={}, memory=False)
+        self.assertEqual(list(metrics), ['seconds'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+#!/usr/bin/python3
+"""
+This module contains tests for the concurrent multi-file loader.
+"""
+import os
+import tempfile
+import unittest
+import inspect
+from unittest.mock import patch
+import pandas as pd
+import pycodestyle
+from src import multi_file_loader
+from src.financial_news_analysis import FinancialNewsAnalysis
+from src.multi_file_loader import (
+    expand_paths, is_file_set, iter_news_files, load_news_files)
+from tests.test_publisher_analysis import check_docstring
+import src
+MODULE_DOC = src.multi_file_loader.__doc__
+DATA_PATH = 'data/raw_analyst_ratings.csv'
+
+
+class TestMultiFileLoaderDocs(unittest.TestCase):
+    """
+    Tests to check the documentation and style of the multi_file_loader
+    module.
+    """
+    def setUp(self):
+        """Set up for docstring tests"""
+        self.base_funcs = inspect.getmembers(
+            src.multi_file_loader, inspect.isfunction)
+
+    def test_pep8_conformance(self):
+        """Test that src/multi_file_loader.py conforms to PEP8."""
+        for path in ['src/multi_file_loader.py',
+                     'tests/test_multi_file_loader.py']:
+            with self.subTest(path=path):
+                errors = pycodestyle.Checker(path).check_all()
+                self.assertEqual(errors, 0)
+
+    def test_module_docstring(self):
+        """Test for the existence of module docstring"""
+        self.assertIsNot(MODULE_DOC, None,
+                         "multi_file_loader.py needs a docstring")
+        self.assertTrue(len(MODULE_DOC) > 1,
+                        "multi_file_loader.py needs a docstring")
+
+    def test_func_docstrings(self):
+        """
+        Test for the presence of docstrings in multi_file_loader functions.
+        """
+        for func in self.base_funcs:
+            with self.subTest(function=func):
+                check_docstring(func[1])
+
+
+class TestMultiFileLoader(unittest.TestCase):
+    """
+    Unit tests for the multi-file loader. The sample CSV is split into
+    four daily files; the third repeats the last five rows of the second.
+    """
+    def setUp(self):
+        """Split the sample CSV into overlapping files"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.data = pd.read_csv(DATA_PATH, index_col=0)
+        self.pattern = os.path.join(self.tmp_dir.name, 'day_*.csv')
+        for day, (start, stop) in enumerate(
+                [(0, 30), (30, 60), (55, 80), (80, 100)]):
+            self.data[start:stop].to_csv(self.path(day))
+
+    def tearDown(self):
+        """Remove the split files"""
+        self.tmp_dir.cleanup()
+
+    def path(self, day):
+        """
+        Path of one daily file.
+
+        Args:
+        - day (int): Number of the file.
+
+        Returns:
+        - str: Its path in the scratch directory.
+        """
+        return os.path.join(self.tmp_dir.name, f'day_{day}.csv')
+
+    def test_glob_deduplicated_on_url(self):
+        """Test that a glob loads every row once, in file order"""
+        data = load_news_files(self.pattern, workers=2)
+        self.assertEqual(len(data), 100)
+        self.assertEqual(data.attrs['duplicates'], 5)
+        self.assertEqual(data.attrs['bad_dates'], 0)
+        self.assertEqual(data['url'].tolist(), self.data['url'].tolist())
+        self.assertIsInstance(data['publisher'].dtype, pd.CategoricalDtype)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(data['date']))
+
+    def test_dedup_keys(self):
+        """Test deduplication on the unnamed index and no deduplication"""
+        by_index = load_news_files(
+            [self.path(day) for day in range(4)], ['stock'], 'index')
+        self.assertEqual(by_index.columns.tolist(), ['stock'])
+        self.assertEqual(by_index.attrs['duplicates'], 5)
+        self.assertEqual(by_index['stock'].tolist(),
+                         self.data['stock'].tolist())
+        self.assertEqual(len(load_news_files(self.pattern, dedup_on=None)),
+                         105)
+        with self.assertRaises(ValueError):
+            load_news_files(self.pattern, dedup_on='headline')
+
+    def test_schema_check(self):
+        """Test that a file lacking a column is reported by name"""
+        self.data[:10].drop(columns='url').to_csv(self.path(9))
+        with self.assertRaisesRegex(ValueError, 'day_9.csv.*url'):
+            load_news_files(self.pattern)
+        self.assertEqual(len(load_news_files(
+            self.pattern, ['stock'], dedup_on='index')), 100)
+
+    def test_bounded_prefetch(self):
+        """Test that only workers + prefetch files are read ahead"""
+        with patch('src.multi_file_loader.read_news_file',
+                   wraps=multi_file_loader.read_news_file) as read:
+            frames = iter_news_files(self.pattern, ['stock'], workers=1,
+                                     prefetch=1)
+            first = next(frames)
+            self.assertLessEqual(read.call_count, 3)
+            self.assertEqual(len(first), 30)
+            self.assertEqual(sum(len(frame) for frame in frames), 70)
+        self.assertEqual(read.call_count, 4)
+
+    def test_paths(self):
+        """Test glob expansion and file set detection"""
+        self.assertEqual(expand_paths([self.path(1), self.pattern]),
+                         [self.path(day) for day in [1, 0, 2, 3]])
+        self.assertTrue(is_file_set(self.pattern))
+        self.assertTrue(is_file_set([DATA_PATH]))
+        self.assertFalse(is_file_set(DATA_PATH))
+        with self.assertRaises(FileNotFoundError):
+            expand_paths(os.path.join(self.tmp_dir.name, 'none_*.csv'))
+
+    def test_analysis_over_file_set(self):
+        """Test that analyses over a file set match the single file"""
+        single = FinancialNewsAnalysis(DATA_PATH)
+        self.assertTrue(FinancialNewsAnalysis(self.pattern).statistics(
+            ).equals(single.statistics()))
+        self.assertTrue(FinancialNewsAnalysis(
+            self.pattern, out_of_core=True).statistics().equals(
+                single.statistics()))
+        with self.assertRaises(ValueError):
+            FinancialNewsAnalysis(self.pattern, cache_dir=self.tmp_dir.name)
+
+
+if __name__ == '__main__':
+    unittest.main()
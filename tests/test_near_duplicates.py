@@ -0,0 +1,178 @@
+#!/usr/bin/python3
+"""
+This module contains tests for the near-duplicate headline clustering.
+"""
+import itertools
+import re
+import unittest
+import inspect
+import numpy as np
+import pandas as pd
+import pycodestyle
+from src.financial_news_analysis import FinancialNewsAnalysis
+from src.near_duplicates import StoryClusterer, headline_shingles
+from src.time_series_analysis import TimeSeriesAnalysis
+from tests.test_publisher_analysis import check_docstring
+import src
+MODULE_DOC = src.near_duplicates.__doc__
+DATA_PATH = 'data/raw_analyst_ratings.csv'
+SECTOR = ('Shares of several companies in the sector, including {}, are '
+          'trading lower as markets fall amid renewed economic concerns.')
+
+
+def jaccard_pairs(headlines, threshold):
+    """
+    Find the pairs of headlines whose word bigram sets have a Jaccard
+    similarity of at least `threshold` by comparing every pair.
+
+    Args:
+    - headlines (list): Distinct headlines.
+    - threshold (float): Minimum similarity.
+
+    Returns:
+    - set: Position pairs (i, j), i < j, of the similar headlines.
+    """
+    shingles = []
+    for headline in headlines:
+        words = re.findall(r'[a-z0-9]+', headline.lower())
+        shingles.append({' '.join(pair) for pair in zip(words, words[1:])}
+                        or set(words))
+    return {(i, j) for i, j in itertools.combinations(range(len(headlines)), 2)
+            if len(shingles[i] & shingles[j]) /
+            len(shingles[i] | shingles[j]) >= threshold}
+
+
+def news_rows():
+    """
+    Build rows where one story is syndicated across tickers and days.
+
+    Returns:
+    - pandas DataFrame: Rows with `headline`, `date` and `stock` columns.
+    """
+    rows = [(SECTOR.format(ticker), f'2020-03-25 {hour:02d}:00:00-04:00',
+             ticker) for hour, ticker in enumerate(['MMP', 'BCS', 'ERE'], 9)]
+    rows += [(SECTOR.format('YK'), '2020-03-26 10:00:00-04:00', 'YK'),
+             ('Analyst Downgrades ERE To Sell, Lowers Price Target To $78',
+              '2020-03-25 08:00:00-04:00', 'ERE'),
+             ('Analyst Downgrades MD To Sell, Lowers Price Target To $214',
+              '2020-03-25 08:00:00-04:00', 'MD'),
+             (None, '2020-03-25 08:00:00-04:00', 'MD'),
+             (None, '2020-03-25 08:00:00-04:00', 'MD'),
+             (SECTOR.format('KJLF'), '2020-03-25 07:00:00-04:00', 'KJLF')]
+    return pd.DataFrame(rows, columns=['headline', 'date', 'stock'],
+                        index=range(10, 10 + len(rows)))
+
+
+class TestNearDuplicatesDocs(unittest.TestCase):
+    """
+    Tests to check the documentation and style of the near_duplicates
+    module.
+    """
+    def setUp(self):
+        """Set up for docstring tests"""
+        self.base_funcs = inspect.getmembers(
+            StoryClusterer, inspect.isfunction) + inspect.getmembers(
+            src.near_duplicates, inspect.isfunction)
+
+    def test_pep8_conformance(self):
+        """Test that src/near_duplicates.py conforms to PEP8."""
+        for path in ['src/near_duplicates.py',
+                     'tests/test_near_duplicates.py']:
+            with self.subTest(path=path):
+                errors = pycodestyle.Checker(path).check_all()
+                self.assertEqual(errors, 0)
+
+    def test_module_docstring(self):
+        """Test for the existence of module docstring"""
+        self.assertIsNot(MODULE_DOC, None,
+                         "near_duplicates.py needs a docstring")
+        self.assertTrue(len(MODULE_DOC) > 1,
+                        "near_duplicates.py needs a docstring")
+
+    def test_func_docstrings(self):
+        """
+        Test for the presence of docstrings in near_duplicates functions.
+        """
+        for func in self.base_funcs:
+            with self.subTest(function=func):
+                check_docstring(func[1])
+
+
+class TestStoryClusterer(unittest.TestCase):
+    """Unit tests for StoryClusterer"""
+    def test_stories(self):
+        """Test syndicated copies of one day form one story"""
+        data = news_rows()
+        clusterer = StoryClusterer()
+        stories = clusterer.cluster(data)
+        self.assertEqual(stories.index.tolist(), data.index.tolist())
+        self.assertEqual(stories.tolist(), [0, 0, 0, 1, 2, 3, 4, 5, 0])
+        self.assertEqual(clusterer.report['stories'], 6)
+        undated = StoryClusterer(window_days=None).cluster(data)
+        self.assertEqual(undated.tolist(), [0, 0, 0, 0, 1, 2, 3, 4, 0])
+
+    def test_shingles(self):
+        """Test shingles are distinct bigrams, or words of short headlines"""
+        hashes, counts = headline_shingles(pd.Series(
+            ['Stocks to watch', 'Watch', '', 'a b a b']))
+        self.assertEqual(counts.tolist(), [2, 1, 0, 2])
+        self.assertEqual(len(hashes), 5)
+        self.assertTrue((hashes < 2 ** 32).all())
+
+    def test_matches_brute_force(self):
+        """Test the LSH clusters recover the pairs found by brute force"""
+        headlines = pd.read_csv(DATA_PATH)['headline'].unique().tolist()
+        stories = StoryClusterer(window_days=None).cluster(
+            pd.DataFrame({'headline': headlines})).to_numpy()
+        expected = jaccard_pairs(headlines, 0.6)
+        found = {(i, j) for i, j in itertools.combinations(
+            range(len(headlines)), 2) if stories[i] == stories[j]}
+        self.assertTrue(expected)
+        self.assertGreaterEqual(len(expected & found) / len(expected), 0.95)
+        self.assertFalse(found - jaccard_pairs(headlines, 0.3))
+
+    def test_bands_divide_permutations(self):
+        """Test the bands must split the signatures evenly"""
+        with self.assertRaises(ValueError):
+            StoryClusterer(permutations=128, bands=24)
+
+
+class TestUniqueStories(unittest.TestCase):
+    """Tests for the story API of FinancialNewsAnalysis"""
+    def test_unique_stories(self):
+        """Test frequency analyses count each story once"""
+        data = news_rows()
+        analysis = TimeSeriesAnalysis.from_frame(data)
+        unique = analysis.unique_stories()
+        self.assertIsInstance(unique, TimeSeriesAnalysis)
+        self.assertNotIn('story_id', data)
+        self.assertEqual(analysis.story_ids().tolist(),
+                         [0, 0, 0, 1, 2, 3, 4, 5, 0])
+        self.assertEqual(unique.data.index.tolist(),
+                         [13, 14, 15, 16, 17, 18])
+        self.assertEqual(unique.descriptive_statistics()[2].sum(), 6)
+        self.assertEqual(analysis.descriptive_statistics()[2].sum(), 9)
+        self.assertEqual(unique.daily_counts().sum(), 6)
+
+    def test_existing_ids_reused(self):
+        """Test stored story IDs are reused unless a clusterer is given"""
+        analysis = FinancialNewsAnalysis(DATA_PATH, typed=True)
+        analysis.data['story_id'] = np.arange(100) % 2
+        self.assertEqual(len(analysis.unique_stories().data), 2)
+        clusterer = StoryClusterer(window_days=None)
+        unique = analysis.unique_stories(clusterer)
+        self.assertEqual(len(unique.data), clusterer.report['stories'])
+        self.assertLess(len(unique.data), 88)
+        self.assertIs(analysis.story_ids(), analysis.story_ids())
+        analysis.data = analysis.data.iloc[:10]
+        self.assertEqual(len(analysis.story_ids()), 10)
+
+    def test_out_of_core(self):
+        """Test stories need the rows in memory"""
+        analysis = FinancialNewsAnalysis(DATA_PATH, out_of_core=True)
+        with self.assertRaises(ValueError):
+            analysis.unique_stories()
+
+
+if __name__ == '__main__':
+    unittest.main()
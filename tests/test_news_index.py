@@ -0,0 +1,189 @@
+#!/usr/bin/python3
+"""
+This module contains tests for the (stock, date) query index.
+"""
+import unittest
+import inspect
+import numpy as np
+import pandas as pd
+import pycodestyle
+from src.financial_news_analysis import FinancialNewsAnalysis
+from src.news_index import NewsIndex
+from tests.test_publisher_analysis import check_docstring
+import src
+MODULE_DOC = src.news_index.__doc__
+DATA_PATH = 'data/raw_analyst_ratings.csv'
+
+
+def scan(data, stock, start=None, end=None):
+    """
+    Select one ticker's rows in a range by scanning every row.
+
+    Args:
+    - data (pandas DataFrame): Data with parsed dates.
+    - stock (str): The ticker.
+    - start (str): First publication time included.
+    - end (str): End of the range, excluded.
+
+    Returns:
+    - pandas DataFrame: The matching rows with a date, in publication
+    order.
+    """
+    mask = (data['stock'] == stock) & data['date'].notna()
+    if start is not None:
+        mask &= data['date'] >= pd.Timestamp(start, tz='UTC')
+    if end is not None:
+        mask &= data['date'] < pd.Timestamp(end, tz='UTC')
+    return data[mask].sort_values('date', kind='stable')
+
+
+class TestNewsIndexDocs(unittest.TestCase):
+    """
+    Tests to check the documentation and style of the news_index module.
+    """
+    def setUp(self):
+        """Set up for docstring tests"""
+        self.base_funcs = inspect.getmembers(
+            NewsIndex, inspect.isfunction) + inspect.getmembers(
+            src.news_index, inspect.isfunction)
+
+    def test_pep8_conformance(self):
+        """Test that src/news_index.py conforms to PEP8."""
+        for path in ['src/news_index.py', 'tests/test_news_index.py']:
+            with self.subTest(path=path):
+                errors = pycodestyle.Checker(path).check_all()
+                self.assertEqual(errors, 0)
+
+    def test_module_docstring(self):
+        """Test for the existence of module docstring"""
+        self.assertIsNot(MODULE_DOC, None,
+                         "news_index.py needs a docstring")
+        self.assertTrue(len(MODULE_DOC) > 1,
+                        "news_index.py needs a docstring")
+
+    def test_func_docstrings(self):
+        """
+        Test for the presence of docstrings in news_index functions.
+        """
+        for func in self.base_funcs:
+            with self.subTest(function=func):
+                check_docstring(func[1])
+
+
+class TestNewsIndex(unittest.TestCase):
+    """Unit tests for NewsIndex"""
+    def setUp(self):
+        """Build random typed data with missing tickers and dates"""
+        rng = np.random.default_rng(8)
+        size = 2000
+        dates = pd.Series(pd.to_datetime(
+            rng.integers(1.577e9, 1.609e9, size), unit='s', utc=True))
+        dates[rng.random(size) < 0.02] = pd.NaT
+        stocks = pd.Series(rng.choice(['AAPL', 'TSLA', 'MSFT', 'A'], size))
+        stocks[rng.random(size) < 0.02] = None
+        self.data = pd.DataFrame({
+            'date': dates, 'stock': stocks.astype('category'),
+            'publisher': pd.Series(rng.choice(
+                ['p1', 'p2', 'p3', 'p4'], size, p=[0.5, 0.3, 0.15, 0.05]),
+                dtype='category')},
+            index=pd.RangeIndex(100, 100 + size))
+        self.index = NewsIndex(self.data, cache_size=4)
+
+    def test_matches_scan(self):
+        """Test every query against a scan of all rows"""
+        for stock in ['AAPL', 'TSLA', 'A', 'NONE']:
+            for start, end in [(None, None), ('2020-03-01', '2020-04-01'),
+                               (None, '2020-02-01'), ('2020-11-15', None),
+                               ('2020-04-01', '2020-03-01')]:
+                with self.subTest(stock=stock, start=start, end=end):
+                    expected = scan(self.data, stock, start, end)
+                    if start is None and end is None:
+                        # NaT rows only match a query without bounds.
+                        expected = pd.concat([self.data[
+                            (self.data['stock'] == stock) &
+                            self.data['date'].isna()], expected])
+                    articles = self.index.articles(stock, start, end)
+                    pd.testing.assert_frame_equal(articles, expected)
+                    self.assertEqual(self.index.count(stock, start, end),
+                                     len(expected))
+                    top = self.index.top_publishers(stock, start, end, 2)
+                    counts = expected['publisher'].value_counts()
+                    self.assertEqual(top.to_dict(),
+                                     counts[counts > 0].head(2).to_dict())
+
+    def test_missing_dates(self):
+        """Test undated rows fall outside every bounded range"""
+        index = NewsIndex(pd.DataFrame({
+            'stock': ['A', 'A', 'A'], 'publisher': ['p1', 'p2', 'p1'],
+            'date': pd.to_datetime(['2020-01-05', None, '2020-01-20'])}))
+        self.assertEqual(index.count('A'), 3)
+        self.assertEqual(index.count('A', end='2020-01-10'), 1)
+        self.assertEqual(index.count('A', '2020-01-01', '2020-01-10'), 1)
+        self.assertEqual(index.count('A', start='2020-01-01'), 2)
+        self.assertEqual(index.articles('A', end='2020-01-10').index.tolist(),
+                         [0])
+        self.assertEqual(index.top_publishers('A', end='2020-01-10').to_dict(),
+                         {'p1': 1})
+
+    def test_timezones(self):
+        """Test naive bounds are UTC and aware bounds are converted"""
+        aware = self.index.count('AAPL', pd.Timestamp(
+            '2020-03-01 05:00', tz='America/New_York'), '2020-04-01')
+        self.assertEqual(aware, self.index.count(
+            'AAPL', '2020-03-01 10:00', '2020-04-01'))
+        naive = NewsIndex(self.data.assign(
+            date=self.data['date'].dt.tz_localize(None)))
+        self.assertEqual(naive.count('AAPL', '2020-03-01', '2020-04-01'),
+                         self.index.count('AAPL', '2020-03-01', '2020-04-01'))
+
+    def test_lru_cache(self):
+        """Test repeated queries hit the cache and old ones are evicted"""
+        first = self.index.articles('AAPL', '2020-03-01', '2020-04-01')
+        self.assertIs(
+            self.index.articles('AAPL', '2020-03-01', '2020-04-01'), first)
+        for month in range(4, 8):
+            self.index.count('TSLA', f'2020-0{month}-01')
+        info = self.index.cache_info()
+        self.assertEqual(info, {'hits': 1, 'misses': 5, 'currsize': 4,
+                                'maxsize': 4})
+        self.assertIsNot(
+            self.index.articles('AAPL', '2020-03-01', '2020-04-01'), first)
+
+
+class TestAnalysisQueries(unittest.TestCase):
+    """Tests for the query API of FinancialNewsAnalysis"""
+    def test_queries(self):
+        """Test queries over the sample dataset, typed and untyped"""
+        for typed in [False, True]:
+            with self.subTest(typed=typed):
+                analysis = FinancialNewsAnalysis(DATA_PATH, typed=typed)
+                articles = analysis.query_articles(
+                    'A', '2020-05-01', '2020-06-01')
+                expected = scan(analysis.data, 'A', '2020-05-01',
+                                '2020-06-01')
+                self.assertEqual(articles.index.tolist(),
+                                 expected.index.tolist())
+                self.assertEqual(analysis.query_count('A', '2020-05-01',
+                                                      '2020-06-01'),
+                                 len(expected))
+                self.assertEqual(
+                    analysis.query_top_publishers('A', n=1).to_dict(),
+                    {'Benzinga Newsdesk': 41})
+
+    def test_index_follows_data(self):
+        """Test replacing the data rebuilds the index"""
+        analysis = FinancialNewsAnalysis(DATA_PATH, typed=True)
+        index = analysis.news_index()
+        self.assertIs(analysis.news_index(), index)
+        analysis.data = analysis.data.iloc[:10]
+        self.assertEqual(analysis.query_count('A'), 10)
+
+    def test_out_of_core(self):
+        """Test queries need the rows in memory"""
+        analysis = FinancialNewsAnalysis(DATA_PATH, out_of_core=True)
+        with self.assertRaises(ValueError):
+            analysis.query_count('A')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+#!/usr/bin/python3
+"""
+This module contains tests for the single-pass `NewsStatistics` engine.
+"""
+import unittest
+import inspect
+import pandas as pd
+import pycodestyle
+from src.news_statistics import NewsStatistics, describe_counts
+from tests.test_publisher_analysis import check_docstring
+import src
+MODULE_DOC = src.news_statistics.__doc__
+
+
+class TestNewsStatisticsDocs(unittest.TestCase):
+    """
+    Tests to check the documentation and style of NewsStatistics class.
+    """
+    def setUp(self):
+        """Set up for docstring tests"""
+        self.base_funcs = inspect.getmembers(
+            NewsStatistics, inspect.isfunction) + inspect.getmembers(
+            src.news_statistics, inspect.isfunction)
+
+    def test_pep8_conformance(self):
+        """Test that src/news_statistics.py conforms to PEP8."""
+        for path in ['src/news_statistics.py',
+                     'tests/test_news_statistics.py']:
+            with self.subTest(path=path):
+                errors = pycodestyle.Checker(path).check_all()
+                self.assertEqual(errors, 0)
+
+    def test_module_docstring(self):
+        """Test for the existence of module docstring"""
+        self.assertIsNot(MODULE_DOC, None,
+                         "news_statistics.py needs a docstring")
+        self.assertTrue(len(MODULE_DOC) > 1,
+                        "news_statistics.py needs a docstring")
+
+    def test_class_docstring(self):
+        """Test for the NewsStatistics class docstring"""
+        self.assertIsNot(NewsStatistics.__doc__, None,
+                         "NewsStatistics class needs a docstring")
+        self.assertTrue(len(NewsStatistics.__doc__) >= 1,
+                        "NewsStatistics class needs a docstring")
+
+    def test_func_docstrings(self):
+        """
+        Test for the presence of docstrings in NewsStatistics methods.
+        """
+        for func in self.base_funcs:
+            with self.subTest(function=func):
+                check_docstring(func[1])
+
+
+class TestNewsStatistics(unittest.TestCase):
+    """Unit tests for NewsStatistics class"""
+    def setUp(self):
+        """Load the sample dataset"""
+        self.data = pd.read_csv('data/raw_analyst_ratings.csv')
+        self.stats = NewsStatistics.from_frame(self.data)
+
+    def test_headline_stats_match_describe(self):
+        """Test that headline_stats equals describe() on per-row lengths"""
+        expected = self.data['headline'].apply(len).describe()
+        pd.testing.assert_series_equal(
+            self.stats.headline_stats, expected, check_names=False)
+
+    def test_describe_counts_with_missing_headlines(self):
+        """Test describe_counts against describe() with missing values"""
+        headlines = pd.Series(['abc', None, 'a', 'abcdef', 'ab', 'abc'])
+        stats = NewsStatistics.from_frame(pd.DataFrame(
+            {'headline': headlines}))
+        pd.testing.assert_series_equal(
+            stats.headline_stats, headlines.str.len().describe(),
+            check_names=False)
+        self.assertEqual(describe_counts(pd.Series(dtype='int64'))[
+            'count'], 0)
+
+    def test_counts_match_value_counts(self):
+        """Test the publisher, stock, date and hour counts"""
+        self.assertTrue(self.stats.publisher_counts.equals(
+            self.data['publisher'].value_counts()))
+        self.assertEqual(self.stats.stock_counts['A'], 100)
+        self.assertEqual(
+            self.stats.date_counts.to_dict(),
+            self.data['date'].dt.date.value_counts().to_dict())
+        self.assertEqual(
+            self.stats.hour_counts.to_dict(),
+            self.data.groupby(self.data['date'].dt.hour).size().to_dict())
+        self.assertEqual(self.stats.rows, 100)
+
+    def test_categorical_counts_drop_unused(self):
+        """Test that unused categories are not reported"""
+        publishers = pd.Series(pd.Categorical(
+            ['a', 'b', 'a'], categories=['a', 'b', 'c']))
+        stats = NewsStatistics.from_frame(pd.DataFrame(
+            {'publisher': publishers}))
+        self.assertEqual(stats.publisher_counts.to_dict(), {'a': 2, 'b': 1})
+        self.assertEqual(stats.top_publishers(1).index.tolist(), ['a'])
+
+    def test_merge_and_round_trip(self):
+        """Test that merged partial aggregates equal the whole"""
+        head = NewsStatistics.from_frame(self.data.iloc[:40].copy())
+        tail = NewsStatistics.from_frame(self.data.iloc[40:].copy())
+        merged = NewsStatistics.from_dict(head.merge(tail).to_dict())
+        self.assertEqual(merged.rows, 100)
+        for name in ['length_counts', 'publisher_counts', 'date_counts',
+                     'hour_counts', 'stock_counts']:
+            with self.subTest(aggregate=name):
+                self.assertEqual(getattr(merged, name).to_dict(),
+                                 getattr(self.stats, name).to_dict())
+        pd.testing.assert_series_equal(
+            merged.headline_stats, self.stats.headline_stats)
+
+    def test_missing_columns(self):
+        """Test that aggregates of missing columns are None"""
+        stats = NewsStatistics.from_frame(pd.DataFrame({'stock': ['A']}))
+        self.assertIsNone(stats.length_counts)
+        self.assertIsNone(stats.date_counts)
+        self.assertEqual(stats.stock_counts['A'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/python3
+"""
+This module contains tests for the out-of-core analysis backend.
+"""
+import unittest
+import inspect
+from unittest.mock import patch
+import pandas as pd
+import pycodestyle
+from src.financial_news_analysis import FinancialNewsAnalysis
+from src.out_of_core import streaming_map, streaming_statistics
+from src.publisher_analysis import PublisherAnalysis
+from src.time_series_analysis import TimeSeriesAnalysis
+from tests.test_publisher_analysis import check_docstring
+import src
+MODULE_DOC = src.out_of_core.__doc__
+DATA_PATH = 'data/raw_analyst_ratings.csv'
+
+
+class TestOutOfCoreDocs(unittest.TestCase):
+    """
+    Tests to check the documentation and style of the out_of_core module.
+    """
+    def setUp(self):
+        """Set up for docstring tests"""
+        self.base_funcs = inspect.getmembers(
+            src.out_of_core, inspect.isfunction)
+
+    def test_pep8_conformance(self):
+        """Test that src/out_of_core.py conforms to PEP8."""
+        for path in ['src/out_of_core.py', 'tests/test_out_of_core.py']:
+            with self.subTest(path=path):
+                errors = pycodestyle.Checker(path).check_all()
+                self.assertEqual(errors, 0)
+
+    def test_module_docstring(self):
+        """Test for the existence of module docstring"""
+        self.assertIsNot(MODULE_DOC, None,
+                         "out_of_core.py needs a docstring")
+        self.assertTrue(len(MODULE_DOC) > 1,
+                        "out_of_core.py needs a docstring")
+
+    def test_func_docstrings(self):
+        """
+        Test for the presence of docstrings in out_of_core functions.
+        """
+        for func in self.base_funcs:
+            with self.subTest(function=func):
+                check_docstring(func[1])
+
+
+class TestOutOfCoreParity(unittest.TestCase):
+    """
+    The out-of-core results must equal the in-memory ones on the sample
+    CSV. Chunks of 7 rows make every aggregate span several chunks. The
+    order of equally frequent keys is not compared, as in
+    `NewsStatistics.equals`.
+    """
+    def test_descriptive_statistics(self):
+        """Test headline, publisher and date statistics"""
+        in_memory = FinancialNewsAnalysis(DATA_PATH)
+        out_of_core = FinancialNewsAnalysis(
+            DATA_PATH, out_of_core=True, chunksize=7)
+        expected = in_memory.descriptive_statistics()
+        actual = out_of_core.descriptive_statistics()
+        self.assertIsNone(out_of_core.data)
+        pd.testing.assert_series_equal(actual[0], expected[0])
+        for counts, expected_counts in zip(actual[1:], expected[1:]):
+            self.assertEqual(counts.to_dict(), expected_counts.to_dict())
+        self.assertTrue(out_of_core.statistics().equals(
+            in_memory.statistics()))
+
+    def test_publishers(self):
+        """Test top publishers and publisher domains"""
+        in_memory = PublisherAnalysis(DATA_PATH)
+        out_of_core = PublisherAnalysis(
+            DATA_PATH, out_of_core=True, chunksize=7)
+        self.assertEqual(out_of_core.top_publishers(3).to_dict(),
+                         in_memory.top_publishers(3).to_dict())
+        self.assertEqual(out_of_core.top_publishers().tolist(),
+                         in_memory.top_publishers().tolist())
+        pd.testing.assert_series_equal(
+            out_of_core.extract_domains().astype(object),
+            in_memory.extract_domains())
+
+    def test_publication_frequency_over_time(self):
+        """Test the daily publication counts"""
+        in_memory = TimeSeriesAnalysis(DATA_PATH)
+        out_of_core = TimeSeriesAnalysis(
+            DATA_PATH, out_of_core=True, chunksize=7)
+        pd.testing.assert_series_equal(
+            out_of_core.publication_frequency_over_time(),
+            in_memory.publication_frequency_over_time())
+
+
+class TestStreaming(unittest.TestCase):
+    """Unit tests for the streaming helpers"""
+    def test_only_requested_columns_read(self):
+        """Test that aggregates of unread columns stay None"""
+        with patch('src.data_loader.pd.read_csv',
+                   wraps=pd.read_csv) as read_csv:
+            stats = streaming_statistics(DATA_PATH, ['publisher'], 30)
+        self.assertEqual(read_csv.call_args.kwargs['usecols'], ['publisher'])
+        self.assertEqual(stats.rows, 100)
+        self.assertIsNone(stats.date_counts)
+        self.assertEqual(stats.publisher_counts.sum(), 100)
+
+    def test_streaming_map_calls_once_per_value(self):
+        """Test that the function runs once per distinct value"""
+        stocks = pd.read_csv(DATA_PATH)['stock']
+        calls = []
+
+        def lower(value):
+            """Record the call and lowercase the value"""
+            calls.append(value)
+            return value.lower()
+        mapped = streaming_map(DATA_PATH, 'stock', lower, chunksize=9)
+        self.assertEqual(sorted(calls), sorted(stocks.unique()))
+        self.assertEqual(mapped.tolist(), stocks.str.lower().tolist())
+        self.assertIsInstance(mapped.dtype, pd.CategoricalDtype)
+
+
+if __name__ == '__main__':
+    unittest.main()
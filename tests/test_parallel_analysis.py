@@ -0,0 +1,109 @@
+#!/usr/bin/python3
+"""
+This module contains tests for the partitioned, multi-process analysis
+helpers.
+"""
+import os
+import tempfile
+import unittest
+import inspect
+from unittest.mock import patch
+import pandas as pd
+import pycodestyle
+from src.parallel_analysis import (
+    count_range, file_ranges, matches_serial, parallel_statistics)
+from src.time_series_analysis import TimeSeriesAnalysis
+from tests.test_publisher_analysis import check_docstring
+import src
+MODULE_DOC = src.parallel_analysis.__doc__
+
+
+class TestParallelAnalysisDocs(unittest.TestCase):
+    """
+    Tests to check the documentation and style of the parallel_analysis
+    module.
+    """
+    def setUp(self):
+        """Set up for docstring tests"""
+        self.base_funcs = inspect.getmembers(
+            src.parallel_analysis, inspect.isfunction)
+
+    def test_pep8_conformance(self):
+        """Test that src/parallel_analysis.py conforms to PEP8."""
+        for path in ['src/parallel_analysis.py',
+                     'tests/test_parallel_analysis.py']:
+            with self.subTest(path=path):
+                errors = pycodestyle.Checker(path).check_all()
+                self.assertEqual(errors, 0)
+
+    def test_module_docstring(self):
+        """Test for the existence of module docstring"""
+        self.assertIsNot(MODULE_DOC, None,
+                         "parallel_analysis.py needs a docstring")
+        self.assertTrue(len(MODULE_DOC) > 1,
+                        "parallel_analysis.py needs a docstring")
+
+    def test_func_docstrings(self):
+        """
+        Test for the presence of docstrings in parallel_analysis functions.
+        """
+        for func in self.base_funcs:
+            with self.subTest(function=func):
+                check_docstring(func[1])
+
+
+class TestParallelAnalysis(unittest.TestCase):
+    """Unit tests for the parallel_analysis functions"""
+    def setUp(self):
+        """Write a multi-ticker file from the sample dataset"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        data = pd.read_csv('data/raw_analyst_ratings.csv')
+        data['stock'] = [f'T{i % 7}' for i in range(len(data))]
+        data.loc[3, 'headline'] = None
+        self.data_path = os.path.join(self.tmp_dir.name, 'ratings.csv')
+        data.to_csv(self.data_path, index=False)
+
+    def tearDown(self):
+        """Remove the temporary file"""
+        self.tmp_dir.cleanup()
+
+    def test_ranges_cover_all_rows(self):
+        """Test that byte ranges are contiguous whole lines of every row"""
+        header, ranges = file_ranges(self.data_path, partitions=7)
+        self.assertEqual(len(ranges), 7)
+        self.assertEqual(ranges[0][0], len(header))
+        self.assertEqual(ranges[-1][1], os.path.getsize(self.data_path))
+        self.assertTrue(all(stop == start for (_, stop), (start, _) in zip(
+            ranges, ranges[1:])))
+        rows = [count_range(self.data_path, header, start, stop).rows
+                for start, stop in ranges]
+        self.assertEqual(sum(rows), 100)
+
+    def test_more_ranges_than_rows(self):
+        """Test that empty ranges are dropped"""
+        _, ranges = file_ranges(self.data_path, partitions=500)
+        self.assertEqual(len(ranges), 100)
+
+    def test_parallel_matches_serial(self):
+        """Test that merged partial results equal the serial path"""
+        self.assertTrue(matches_serial(self.data_path, workers=2))
+        self.assertTrue(matches_serial(
+            self.data_path, ['publisher', 'date'], workers=2))
+
+    def test_single_worker_is_serial(self):
+        """Test that one worker reads the ranges in process"""
+        with patch('src.parallel_analysis.ProcessPoolExecutor') as pool:
+            stats = parallel_statistics(self.data_path, workers=1)
+        pool.assert_not_called()
+        self.assertEqual(stats.rows, 100)
+
+    def test_analysis_workers_knob(self):
+        """Test the workers knob leaves the aggregates unchanged"""
+        analysis = TimeSeriesAnalysis(self.data_path, workers=2)
+        serial = TimeSeriesAnalysis(self.data_path)
+        self.assertTrue(analysis.publication_frequency_over_time().equals(
+            serial.publication_frequency_over_time()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/python3
+"""
+This module contains tests for the headless plot rendering helpers.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+import inspect
+import matplotlib.pyplot as plt
+import pandas as pd
+import pycodestyle
+from src.financial_news_analysis import FinancialNewsAnalysis
+from src.plot_rendering import (
+    FigureRenderer, RenderJob, draw_publication_frequency,
+    draw_publication_times, render_batch)
+from src.time_series_analysis import TimeSeriesAnalysis
+from tests.test_publisher_analysis import check_docstring
+import src
+MODULE_DOC = src.plot_rendering.__doc__
+
+
+class TestPlotRenderingDocs(unittest.TestCase):
+    """
+    Tests to check the documentation and style of the plot_rendering
+    module.
+    """
+    def setUp(self):
+        """Set up for docstring tests"""
+        self.base_funcs = inspect.getmembers(
+            src.plot_rendering, inspect.isfunction) + inspect.getmembers(
+            FigureRenderer, inspect.isfunction)
+
+    def test_pep8_conformance(self):
+        """Test that src/plot_rendering.py conforms to PEP8."""
+        for path in ['src/plot_rendering.py',
+                     'tests/test_plot_rendering.py']:
+            with self.subTest(path=path):
+                errors = pycodestyle.Checker(path).check_all()
+                self.assertEqual(errors, 0)
+
+    def test_module_docstring(self):
+        """Test for the existence of module docstring"""
+        self.assertIsNot(MODULE_DOC, None,
+                         "plot_rendering.py needs a docstring")
+        self.assertTrue(len(MODULE_DOC) > 1,
+                        "plot_rendering.py needs a docstring")
+
+    def test_class_docstring(self):
+        """Test for the FigureRenderer class docstring"""
+        self.assertIsNot(FigureRenderer.__doc__, None,
+                         "FigureRenderer class needs a docstring")
+        self.assertTrue(len(FigureRenderer.__doc__) >= 1,
+                        "FigureRenderer class needs a docstring")
+
+    def test_func_docstrings(self):
+        """
+        Test for the presence of docstrings in plot_rendering functions.
+        """
+        for func in self.base_funcs:
+            with self.subTest(function=func):
+                check_docstring(func[1])
+
+
+class TestPlotRendering(unittest.TestCase):
+    """Unit tests for FigureRenderer and render_batch"""
+    def setUp(self):
+        """Create a scratch output directory"""
+        self.out_dir = tempfile.mkdtemp()
+        self.frequency = pd.Series(
+            [1, 4, 2], index=pd.date_range('2022-01-01', periods=3))
+
+    def tearDown(self):
+        """Remove the scratch output directory"""
+        shutil.rmtree(self.out_dir)
+
+    def test_render_reuses_figure(self):
+        """Test that one figure renders PNG and SVG without pyplot"""
+        figures = plt.get_fignums()
+        renderer = FigureRenderer()
+        figure = renderer.figure
+        for name in ['a.png', 'b.svg']:
+            path = renderer.render(
+                os.path.join(self.out_dir, name),
+                draw_publication_frequency, (self.frequency,))
+            self.assertTrue(os.path.getsize(path) > 0)
+        self.assertIs(renderer.figure, figure)
+        self.assertEqual(len(figure.axes), 1)
+        self.assertEqual(plt.get_fignums(), figures)
+        with open(os.path.join(self.out_dir, 'b.svg'),
+                  encoding='utf-8') as handle:
+            self.assertIn('<svg', handle.read())
+
+    def test_render_batch_in_pool(self):
+        """Test that a worker pool writes every job in order"""
+        hours = pd.Series([3, 1], index=[9, 10])
+        jobs = [RenderJob(os.path.join(self.out_dir, f'{i}.png'),
+                          draw_publication_times, (hours,))
+                for i in range(4)]
+        paths = render_batch(jobs, workers=2)
+        self.assertEqual(paths, [job.path for job in jobs])
+        self.assertTrue(all(os.path.exists(path) for path in paths))
+
+    def test_analysis_output_paths(self):
+        """Test the render mode of the analysis plotting methods"""
+        figures = plt.get_fignums()
+        paths = FinancialNewsAnalysis(
+            'data/raw_analyst_ratings.csv').visualize_stat_measures(
+            self.out_dir, fmt='svg')
+        self.assertEqual(len(paths), 3)
+        analysis = TimeSeriesAnalysis('data/raw_analyst_ratings.csv')
+        analysis.data['stock'] = ['A', 'B'] * 50
+        spikes_path = os.path.join(self.out_dir, 'spikes.png')
+        analysis.analyze_article_spikes(output_path=spikes_path)
+        self.assertTrue(os.path.exists(spikes_path))
+        tickers = analysis.render_ticker_reports(
+            os.path.join(self.out_dir, 'tickers'))
+        self.assertEqual(sorted(map(os.path.basename, tickers)),
+                         ['A.png', 'B.png'])
+        self.assertEqual(plt.get_fignums(), figures)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,12 +2,14 @@
 """
 This module contains tests for `PublisherAnalysis` analysis class.
 """
+import os
+import tempfile
 import unittest
 import inspect
 from unittest.mock import patch
 import pandas as pd
 import pycodestyle
-from src.publisher_analysis import PublisherAnalysis
+from src.publisher_analysis import PublisherAnalysis, extract_domain
 import src
 
 MODULE_DOC = src.publisher_analysis.__doc__
@@ -113,6 +115,57 @@ class TestPublisherAnalysis(unittest.TestCase):
         self.assertEqual(publisher_domains.tolist(), [
             'example', 'example', 'example', 'example'])
 
+    def test_extract_domains_once_per_publisher(self):
+        """
+        Test that extract_domains looks up each distinct publisher once,
+        offline, and keeps missing publishers missing.
+        """
+        publisher_analysis = PublisherAnalysis('data/raw_analyst_ratings.csv')
+        publisher_analysis.data = pd.DataFrame({'publisher': pd.Categorical(
+            ['a@news.co.uk', None, 'a@news.co.uk', 'b@example.com'])})
+        extract_domain.cache_clear()
+        with patch('tldextract.suffix_list.find_first_response') as fetch:
+            publisher_domains = publisher_analysis.extract_domains()
+            fetch.assert_not_called()
+        self.assertEqual(extract_domain.cache_info().misses, 2)
+        self.assertEqual(publisher_domains.tolist()[::2], ['news', 'news'])
+        self.assertTrue(pd.isna(publisher_domains[1]))
+        self.assertEqual(publisher_domains[3], 'example')
+
+    def test_extract_domains_skips_names(self):
+        """
+        Test that plain publisher names get no domain.
+        """
+        publisher_analysis = PublisherAnalysis('data/raw_analyst_ratings.csv')
+        domains = publisher_analysis.extract_domains()
+        self.assertEqual(domains.value_counts().to_dict(), {'benzinga': 7})
+        self.assertEqual(domains.isna().sum(), 93)
+
+    def test_publisher_groups(self):
+        """
+        Test article counts per normalized name and publisher type, and
+        the reuse of a stored publisher table.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'publishers.feather')
+            publisher_analysis = PublisherAnalysis(
+                'data/raw_analyst_ratings.csv', publisher_table=path)
+            names = publisher_analysis.publisher_groups()
+            raw = publisher_analysis.data['publisher'].value_counts()
+            self.assertEqual(names['Benzinga Newsdesk'],
+                             raw['Benzinga Newsdesk'] +
+                             raw['Benzinga_Newsdesk'])
+            self.assertEqual(
+                publisher_analysis.publisher_groups('kind').to_dict(),
+                {'person': 48, 'desk': 45, 'email': 7})
+            with patch('src.publisher_table.normalize_publisher') as norm:
+                reused = PublisherAnalysis(
+                    'data/raw_analyst_ratings.csv', typed=True,
+                    publisher_table=path)
+                self.assertEqual(reused.publisher_groups().to_dict(),
+                                 names.to_dict())
+                norm.assert_not_called()
+
     def test_invalid_data_path(self):
         """Test handling of invalid data path"""
         # Test if an invalid data path raises an exception
@@ -135,6 +188,39 @@ class TestPublisherAnalysis(unittest.TestCase):
                 top_publishers)
             mock_show.assert_called()
 
+    def test_publisher_table_extended_once_per_dataset(self):
+        """Test the table is extended once, and again for new data"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'publishers.feather')
+            analysis = PublisherAnalysis.from_frame(
+                pd.read_csv('data/raw_analyst_ratings.csv'),
+                publisher_table=path)
+            with patch('src.publisher_analysis.PublisherTable.extend',
+                       autospec=True,
+                       side_effect=src.publisher_table.PublisherTable.extend
+                       ) as extend:
+                analysis.publisher_ids()
+                analysis.extract_domains()
+                analysis.publisher_groups('kind')
+                self.assertEqual(extend.call_count, 1)
+                analysis.data = analysis.data.iloc[:10]
+                analysis.publisher_ids()
+                self.assertEqual(extend.call_count, 2)
+            self.assertTrue(os.path.exists(path))
+
+    def test_publisher_figure_files_reuse_renderer(self):
+        """Test repeated figure files are drawn on one figure"""
+        analysis = PublisherAnalysis('data/raw_analyst_ratings.csv')
+        top_publishers = analysis.top_publishers(3)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            analysis.plot_publisher_distribution(
+                top_publishers, os.path.join(tmp_dir, 'first.png'))
+            figure = analysis.figure_renderer().figure
+            analysis.plot_publisher_distribution(
+                top_publishers, os.path.join(tmp_dir, 'second.png'))
+            self.assertIs(analysis.figure_renderer().figure, figure)
+            self.assertEqual(len(os.listdir(tmp_dir)), 2)
+
 
 if __name__ == '__main__':
     unittest.main()
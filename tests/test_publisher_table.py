@@ -0,0 +1,137 @@
+#!/usr/bin/python3
+"""
+This module contains tests for the persistent publisher dimension table.
+"""
+import os
+import tempfile
+import unittest
+import inspect
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+import pycodestyle
+from src.publisher_table import (
+    PublisherTable, normalize_publisher, publisher_domain)
+from tests.test_publisher_analysis import check_docstring
+import src
+MODULE_DOC = src.publisher_table.__doc__
+
+
+class TestPublisherTableDocs(unittest.TestCase):
+    """
+    Tests to check the documentation and style of PublisherTable class.
+    """
+    def setUp(self):
+        """Set up for docstring tests"""
+        self.base_funcs = inspect.getmembers(
+            src.publisher_table, inspect.isfunction) + inspect.getmembers(
+            PublisherTable, inspect.isfunction)
+
+    def test_pep8_conformance(self):
+        """Test that src/publisher_table.py conforms to PEP8."""
+        for path in ['src/publisher_table.py',
+                     'tests/test_publisher_table.py']:
+            with self.subTest(path=path):
+                errors = pycodestyle.Checker(path).check_all()
+                self.assertEqual(errors, 0)
+
+    def test_module_docstring(self):
+        """Test for the existence of module docstring"""
+        self.assertIsNot(MODULE_DOC, None,
+                         "publisher_table.py needs a docstring")
+        self.assertTrue(len(MODULE_DOC) > 1,
+                        "publisher_table.py needs a docstring")
+
+    def test_class_docstring(self):
+        """Test for the PublisherTable class docstring"""
+        self.assertIsNot(PublisherTable.__doc__, None,
+                         "PublisherTable class needs a docstring")
+        self.assertTrue(len(PublisherTable.__doc__) >= 1,
+                        "PublisherTable class needs a docstring")
+
+    def test_func_docstrings(self):
+        """
+        Test for the presence of docstrings in publisher_table functions.
+        """
+        for func in self.base_funcs:
+            with self.subTest(function=func):
+                check_docstring(func[1])
+
+
+class TestNormalizePublisher(unittest.TestCase):
+    """Unit tests for the publisher normalization"""
+    def test_kinds(self):
+        """Test names, kinds and domains of typical publishers"""
+        self.assertEqual(normalize_publisher('Paul Quintaro'),
+                         ('Paul Quintaro', 'person', None))
+        self.assertEqual(normalize_publisher('Benzinga_Newsdesk'),
+                         ('Benzinga Newsdesk', 'desk', None))
+        self.assertEqual(normalize_publisher(' Zacks  Equity Research'),
+                         ('Zacks Equity Research', 'desk', None))
+        self.assertEqual(normalize_publisher('Luke@Benzinga.com'),
+                         ('luke@benzinga.com', 'email', 'benzinga'))
+
+    def test_domain_only_for_emails(self):
+        """Test that plain names get no domain"""
+        self.assertIsNone(publisher_domain('Benzinga Newsdesk'))
+        self.assertEqual(publisher_domain('jdoe@reuters.co.uk'), 'reuters')
+
+
+class TestPublisherTable(unittest.TestCase):
+    """Unit tests for PublisherTable"""
+    def setUp(self):
+        """Create a scratch directory for the stored table"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'dim', 'publishers.ftr')
+
+    def tearDown(self):
+        """Remove the scratch directory"""
+        self.tmp_dir.cleanup()
+
+    def test_stable_ids_across_runs(self):
+        """Test that stored IDs survive reloads and extensions"""
+        table = PublisherTable(self.path)
+        self.assertEqual(table.extend(pd.Categorical(
+            ['Lisa Levin', 'a@x.com', 'Lisa Levin', None])), 2)
+        reloaded = PublisherTable(self.path)
+        with patch('src.publisher_table.normalize_publisher',
+                   wraps=normalize_publisher) as normalize:
+            self.assertEqual(reloaded.extend(['a@x.com', 'Vick Meyer']), 1)
+        normalize.assert_called_once_with('Vick Meyer')
+        self.assertEqual(len(PublisherTable(self.path)), 3)
+        ids = reloaded.ids(pd.Series(['Vick Meyer', None, 'Lisa Levin',
+                                      'unknown']))
+        self.assertEqual(ids.tolist(), [2, -1, 0, -1])
+        domains = reloaded.attribute(ids, 'domain')
+        self.assertEqual(pd.isna(domains).tolist(), [True] * 4)
+        self.assertEqual(reloaded.attribute(np.array([1]), 'domain')[0], 'x')
+
+    def test_unchanged_table_not_rewritten(self):
+        """Test that extending with known publishers writes nothing"""
+        table = PublisherTable(self.path)
+        table.extend(['Lisa Levin'])
+        with patch('src.publisher_table.feather.write_feather') as write:
+            self.assertEqual(table.extend(['Lisa Levin']), 0)
+        write.assert_not_called()
+
+    def test_group_counts(self):
+        """Test grouping by name, kind and domain, with weights"""
+        table = PublisherTable()
+        table.extend(['Benzinga Newsdesk', 'Benzinga_Newsdesk', 'a@x.com',
+                      'Lisa Levin'])
+        ids = np.array([0, 1, 1, 2, 3, -1])
+        self.assertEqual(table.group_counts(ids).to_dict(), {
+            'Benzinga Newsdesk': 3, 'a@x.com': 1, 'Lisa Levin': 1})
+        self.assertEqual(table.group_counts(ids, 'kind').to_dict(), {
+            'desk': 3, 'email': 1, 'person': 1})
+        self.assertEqual(table.group_counts(ids, 'domain').to_dict(),
+                         {'x': 1})
+        weighted = table.group_counts(
+            np.array([0, 1, 2, 3]), 'name', np.array([1, 2, 1, 1]))
+        pd.testing.assert_series_equal(weighted, table.group_counts(ids))
+        with self.assertRaises(ValueError):
+            table.group_counts(ids, 'publisher')
+
+
+if __name__ == '__main__':
+    unittest.main()
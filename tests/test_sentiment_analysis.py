@@ -0,0 +1,173 @@
+#!/usr/bin/python3
+"""
+This module contains tests for the batched, cached headline sentiment
+scorer.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+import inspect
+import numpy as np
+import pandas as pd
+import pycodestyle
+from src.sentiment_analysis import HeadlineSentiment, SentimentAnalysis
+from tests.test_publisher_analysis import check_docstring
+import src
+MODULE_DOC = src.sentiment_analysis.__doc__
+
+
+def word_count_scores(headlines):
+    """Score headlines by their number of words"""
+    return [float(len(headline.split())) for headline in headlines]
+
+
+def nan_for_tesla_scores(headlines):
+    """Score headlines by their number of words, NaN for Tesla ones"""
+    return [np.nan if 'Tesla' in headline else float(len(headline.split()))
+            for headline in headlines]
+
+
+def negative_scores(headlines):
+    """Score every headline -5"""
+    return [-5.0] * len(headlines)
+
+
+class TestSentimentAnalysisDocs(unittest.TestCase):
+    """
+    Tests to check the documentation and style of the sentiment classes.
+    """
+    def setUp(self):
+        """Set up for docstring tests"""
+        self.base_funcs = inspect.getmembers(
+            HeadlineSentiment, inspect.isfunction) + inspect.getmembers(
+            SentimentAnalysis, inspect.isfunction) + inspect.getmembers(
+            src.sentiment_analysis, inspect.isfunction)
+
+    def test_pep8_conformance(self):
+        """Test that src/sentiment_analysis.py conforms to PEP8."""
+        for path in ['src/sentiment_analysis.py',
+                     'tests/test_sentiment_analysis.py']:
+            with self.subTest(path=path):
+                errors = pycodestyle.Checker(path).check_all()
+                self.assertEqual(errors, 0)
+
+    def test_module_docstring(self):
+        """Test for the existence of module docstring"""
+        self.assertIsNot(MODULE_DOC, None,
+                         "sentiment_analysis.py needs a docstring")
+        self.assertTrue(len(MODULE_DOC) > 1,
+                        "sentiment_analysis.py needs a docstring")
+
+    def test_class_docstring(self):
+        """Test for the sentiment class docstrings"""
+        for cls in [HeadlineSentiment, SentimentAnalysis]:
+            with self.subTest(cls=cls):
+                self.assertIsNot(cls.__doc__, None,
+                                 f"{cls.__name__} class needs a docstring")
+                self.assertTrue(len(cls.__doc__) >= 1,
+                                f"{cls.__name__} class needs a docstring")
+
+    def test_func_docstrings(self):
+        """
+        Test for the presence of docstrings in the sentiment methods.
+        """
+        for func in self.base_funcs:
+            with self.subTest(function=func):
+                check_docstring(func[1])
+
+
+class TestHeadlineSentiment(unittest.TestCase):
+    """Unit tests for HeadlineSentiment class"""
+    def setUp(self):
+        """Create a scratch directory and repetitive headlines"""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.tmp_dir, 'sentiment.feather')
+        self.headlines = pd.Series(
+            ['Stocks That Hit 52-Week Highs On Friday'] * 5 +
+            ['Apple beats estimates', None, 'Apple beats estimates',
+             'Tesla shares fall'], index=range(10, 19))
+
+    def tearDown(self):
+        """Remove the scratch directory"""
+        shutil.rmtree(self.tmp_dir)
+
+    def test_scores_distinct_headlines_once(self):
+        """Test deduplication and alignment with the input index"""
+        calls = []
+
+        def scorer(headlines):
+            calls.append(list(headlines))
+            return word_count_scores(headlines)
+
+        scores = HeadlineSentiment(scorer).score(self.headlines)
+        self.assertEqual(sorted(sum(calls, [])), sorted(
+            set(self.headlines.dropna())))
+        self.assertTrue(scores.index.equals(self.headlines.index))
+        self.assertEqual(scores[10], 7.0)
+        self.assertTrue(np.isnan(scores[16]))
+        self.assertEqual(scores[18], 3.0)
+
+    def test_rerun_served_from_cache(self):
+        """Test that a re-run only scores unseen headlines"""
+        first = HeadlineSentiment(word_count_scores, self.cache_path)
+        expected = first.score(self.headlines)
+        self.assertEqual(first.report['scored'], 3)
+        second = HeadlineSentiment(word_count_scores, self.cache_path)
+        extended = pd.concat(
+            [self.headlines, pd.Series(['Markets rally'], index=[19])])
+        scores = second.score(extended)
+        self.assertEqual(second.report, {
+            'rows': 10, 'unique': 4, 'cached': 3, 'scored': 1})
+        pd.testing.assert_series_equal(scores[:-1], expected)
+        self.assertEqual(scores[19], 2.0)
+
+    def test_nan_scores_cached_once(self):
+        """Test headlines scored as NaN are not scored again"""
+        for run in range(3):
+            sentiment = HeadlineSentiment(nan_for_tesla_scores,
+                                          self.cache_path)
+            scores = sentiment.score(self.headlines)
+            self.assertEqual(sentiment.report['scored'],
+                             3 if run == 0 else 0)
+            self.assertTrue(np.isnan(scores[18]))
+        cached = sentiment.read_cache()
+        self.assertEqual(len(cached), 3)
+        self.assertTrue(cached.index.is_unique)
+
+    def test_cache_keyed_by_scorer(self):
+        """Test another scorer, or version, does not reuse the scores"""
+        HeadlineSentiment(word_count_scores, self.cache_path).score(
+            self.headlines)
+        other = HeadlineSentiment(negative_scores, self.cache_path)
+        self.assertEqual(other.score(self.headlines)[17], -5.0)
+        self.assertEqual(other.report['scored'], 3)
+        newer = HeadlineSentiment(negative_scores, self.cache_path,
+                                  scorer_version='2')
+        newer.score(self.headlines)
+        self.assertEqual(newer.report['cached'], 0)
+        again = HeadlineSentiment(negative_scores, self.cache_path,
+                                  scorer_version='2')
+        again.score(self.headlines)
+        self.assertEqual(again.report['cached'], 3)
+
+    def test_workers_match_serial(self):
+        """Test that scoring in processes gives the serial result"""
+        headlines = pd.Series([f'headline number {i % 50}'
+                               for i in range(500)])
+        serial = HeadlineSentiment(word_count_scores).score(headlines)
+        parallel = HeadlineSentiment(
+            word_count_scores, workers=2, batch_size=7).score(headlines)
+        pd.testing.assert_series_equal(serial, parallel)
+
+    def test_attach_sentiment_column(self):
+        """Test that SentimentAnalysis adds a sentiment column"""
+        analysis = SentimentAnalysis('data/raw_analyst_ratings.csv')
+        report = analysis.add_sentiment(word_count_scores, self.cache_path)
+        self.assertEqual(report['rows'], len(analysis.data))
+        self.assertTrue(analysis.data['sentiment'].equals(
+            analysis.data['headline'].str.split().str.len().astype(float)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,184 @@
+#!/usr/bin/python3
+"""
+This module contains tests for the mergeable streaming sketches.
+"""
+import unittest
+import inspect
+from functools import reduce
+import numpy as np
+import pandas as pd
+import pycodestyle
+from src.sketches import (
+    CountMinSketch, HyperLogLog, KllSketch, NewsSketches, SpaceSaving,
+    streaming_sketches)
+from src.synthetic_data import generate_ratings
+from tests.test_publisher_analysis import check_docstring
+import src
+MODULE_DOC = src.sketches.__doc__
+DATA_PATH = 'data/raw_analyst_ratings.csv'
+
+
+class TestSketchesDocs(unittest.TestCase):
+    """
+    Tests to check the documentation and style of the sketches module.
+    """
+    def setUp(self):
+        """Set up for docstring tests"""
+        self.base_funcs = inspect.getmembers(src.sketches, inspect.isfunction)
+        for cls in [CountMinSketch, SpaceSaving, HyperLogLog, KllSketch,
+                    NewsSketches]:
+            self.base_funcs += inspect.getmembers(cls, inspect.isfunction)
+
+    def test_pep8_conformance(self):
+        """Test that src/sketches.py conforms to PEP8."""
+        for path in ['src/sketches.py', 'tests/test_sketches.py']:
+            with self.subTest(path=path):
+                errors = pycodestyle.Checker(path).check_all()
+                self.assertEqual(errors, 0)
+
+    def test_module_docstring(self):
+        """Test for the existence of module docstring"""
+        self.assertIsNot(MODULE_DOC, None,
+                         "sketches.py needs a docstring")
+        self.assertTrue(len(MODULE_DOC) > 1,
+                        "sketches.py needs a docstring")
+
+    def test_func_docstrings(self):
+        """
+        Test for the presence of docstrings in sketches functions.
+        """
+        for func in self.base_funcs:
+            with self.subTest(function=func):
+                check_docstring(func[1])
+
+
+class TestSketchBounds(unittest.TestCase):
+    """
+    Sketches built over four partitions and merged must stay within their
+    documented error bounds of the exact results.
+    """
+    @classmethod
+    def setUpClass(cls):
+        """Generate a skewed synthetic dataset and its partitions"""
+        cls.data = generate_ratings(20000, seed=3)
+        cls.parts = np.array_split(cls.data, 4)
+
+    def test_count_min(self):
+        """Test that Count-Min never undercounts and stays within eps*N"""
+        exact = self.data['stock'].value_counts()
+        sketches = []
+        for part in self.parts:
+            sketch = CountMinSketch(width=500, depth=4)
+            sketch.update(part['stock'].value_counts())
+            sketches.append(sketch)
+        merged = reduce(CountMinSketch.merge, sketches)
+        whole = CountMinSketch(width=500, depth=4)
+        whole.update(exact)
+        np.testing.assert_array_equal(merged.table, whole.table)
+        overcount = merged.estimate(exact.index) - exact
+        self.assertGreaterEqual(overcount.min(), 0)
+        # The bound holds per key with probability 1 - exp(-depth).
+        self.assertLessEqual(
+            (overcount > merged.epsilon * len(self.data)).mean(),
+            np.exp(-merged.depth))
+        with self.assertRaises(ValueError):
+            merged.merge(CountMinSketch(width=501, depth=4))
+        sized = CountMinSketch.for_error(0.01, 0.01)
+        self.assertEqual((sized.width, sized.depth), (272, 5))
+
+    def test_space_saving(self):
+        """Test the top keys and the per-key bounds"""
+        exact = self.data['stock'].value_counts()
+        summaries = []
+        for part in self.parts:
+            summary = SpaceSaving(capacity=50)
+            summary.update(part['stock'].value_counts())
+            summaries.append(summary)
+        merged = reduce(SpaceSaving.merge, summaries)
+        self.assertEqual(merged.total, len(self.data))
+        top = merged.top(5)
+        self.assertEqual(top.index.tolist(), exact.index[:5].tolist())
+        true = exact.reindex(merged.counts.index, fill_value=0)
+        self.assertTrue((true <= merged.counts).all())
+        self.assertTrue((true >= merged.counts - merged.errors).all())
+        unmonitored = exact.drop(merged.counts.index)
+        self.assertLessEqual(unmonitored.max(), merged.floor)
+
+    def test_hyperloglog(self):
+        """Test the distinct count and exact register merging"""
+        values = np.arange(50000).astype(str)
+        sketches = []
+        for part in np.array_split(values, 4):
+            sketch = HyperLogLog(precision=12)
+            sketch.update(part)
+            sketches.append(sketch)
+        merged = reduce(HyperLogLog.merge, sketches)
+        whole = HyperLogLog(precision=12)
+        whole.update(np.concatenate([values, values[:100]]))
+        np.testing.assert_array_equal(merged.registers, whole.registers)
+        self.assertLess(abs(merged.count() / len(values) - 1),
+                        4 * merged.relative_error)
+        small = HyperLogLog()
+        small.update(['a', 'b', 'c', 'a'])
+        self.assertEqual(round(small.count()), 3)
+        with self.assertRaises(ValueError):
+            HyperLogLog(precision=8)
+
+    def test_kll_quantiles(self):
+        """Test the rank error of merged quantile sketches"""
+        values = np.random.default_rng(0).lognormal(4, 0.5, 100000)
+        sketches = []
+        for i, part in enumerate(np.array_split(values, 4)):
+            sketch = KllSketch(k=200, seed=i)
+            sketch.update(part)
+            sketches.append(sketch)
+        merged = reduce(KllSketch.merge, sketches)
+        self.assertEqual(merged.total, len(values))
+        self.assertLess(sum(map(len, merged.levels)), 3 * 200)
+        values.sort()
+        for quantile, estimate in merged.quantiles(
+                [0.01, 0.25, 0.5, 0.75, 0.99]).items():
+            rank = np.searchsorted(values, estimate, side='right') / len(
+                values)
+            self.assertLess(abs(rank - quantile), 1.7 / 200)
+            self.assertLess(abs(merged.rank(estimate) - quantile), 0.01)
+        self.assertTrue(KllSketch().quantiles([0.5]).isna().all())
+
+
+class TestNewsSketches(unittest.TestCase):
+    """Unit tests for the sketches of the financial news data"""
+    def test_sample_is_exact(self):
+        """Test that the small sample is answered exactly"""
+        data = pd.read_csv(DATA_PATH)
+        sketches = streaming_sketches(DATA_PATH, chunksize=7)
+        self.assertEqual(sketches.rows, 100)
+        exact = data['publisher'].value_counts()
+        self.assertEqual(sketches.top_publishers(20).to_dict(),
+                         exact.to_dict())
+        self.assertEqual(sketches.top_stocks(3).tolist(),
+                         data['stock'].value_counts().head(3).tolist())
+        distinct = sketches.distinct_counts()
+        self.assertEqual(distinct['publishers'], len(exact))
+        self.assertEqual(distinct['stocks'], data['stock'].nunique())
+        self.assertEqual(distinct['domains'], 1)
+        self.assertEqual(
+            sketches.headline_quantiles([0.5]).iloc[0],
+            data['headline'].str.len().quantile(0.5, interpolation='lower'))
+
+    def test_merge_partitions(self):
+        """Test that merged partitions match the sketch of all rows"""
+        data = pd.read_csv(DATA_PATH)
+        merged = NewsSketches.from_frame(data[:40]).merge(
+            NewsSketches.from_frame(data[40:]))
+        whole = NewsSketches.from_frame(data)
+        self.assertEqual(merged.rows, whole.rows)
+        self.assertEqual(merged.top_publishers().to_dict(),
+                         whole.top_publishers().to_dict())
+        pd.testing.assert_series_equal(
+            merged.distinct_counts(), whole.distinct_counts())
+        np.testing.assert_array_equal(
+            merged.publisher_counts.table, whole.publisher_counts.table)
+
+
+if __name__ == '__main__':
+    unittest.main()
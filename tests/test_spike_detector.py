@@ -0,0 +1,166 @@
+#!/usr/bin/python3
+"""
+This module contains tests for the `StreamingSpikeDetector` streaming
+spike detector and its replay harness.
+"""
+import unittest
+import inspect
+import numpy as np
+import pandas as pd
+import pycodestyle
+from src.spike_detector import StreamingSpikeDetector, replay_csv
+from tests.test_publisher_analysis import check_docstring
+import src
+MODULE_DOC = src.spike_detector.__doc__
+
+
+class TestStreamingSpikeDetectorDocs(unittest.TestCase):
+    """
+    Tests to check the documentation and style of StreamingSpikeDetector
+    class.
+    """
+    def setUp(self):
+        """Set up for docstring tests"""
+        self.base_funcs = inspect.getmembers(
+            StreamingSpikeDetector, inspect.isfunction) + \
+            inspect.getmembers(src.spike_detector, inspect.isfunction)
+
+    def test_pep8_conformance(self):
+        """Test that src/spike_detector.py conforms to PEP8."""
+        for path in ['src/spike_detector.py',
+                     'tests/test_spike_detector.py']:
+            with self.subTest(path=path):
+                errors = pycodestyle.Checker(path).check_all()
+                self.assertEqual(errors, 0)
+
+    def test_module_docstring(self):
+        """Test for the existence of module docstring"""
+        self.assertIsNot(MODULE_DOC, None,
+                         "spike_detector.py needs a docstring")
+        self.assertTrue(len(MODULE_DOC) > 1,
+                        "spike_detector.py needs a docstring")
+
+    def test_class_docstring(self):
+        """Test for the StreamingSpikeDetector class docstring"""
+        self.assertIsNot(StreamingSpikeDetector.__doc__, None,
+                         "StreamingSpikeDetector class needs a docstring")
+        self.assertTrue(len(StreamingSpikeDetector.__doc__) >= 1,
+                        "StreamingSpikeDetector class needs a docstring")
+
+    def test_func_docstrings(self):
+        """
+        Test for the presence of docstrings in StreamingSpikeDetector
+        methods.
+        """
+        for func in self.base_funcs:
+            with self.subTest(function=func):
+                check_docstring(func[1])
+
+
+def daily_stream(counts, start='2022-01-01'):
+    """
+    Expand daily article counts into one timestamp per article.
+
+    Args:
+    - counts (list): Articles per consecutive day.
+    - start (str): First day.
+
+    Returns:
+    - pandas Series: Article timestamps in order.
+    """
+    days = pd.date_range(start, periods=len(counts), tz='UTC')
+    return pd.Series(np.repeat(days + pd.Timedelta(hours=12), counts))
+
+
+class TestStreamingSpikeDetector(unittest.TestCase):
+    """Unit tests for StreamingSpikeDetector class"""
+    def setUp(self):
+        """Build a daily count series with gaps and two bursts"""
+        rng = np.random.default_rng(7)
+        counts = rng.poisson(4, 60)
+        counts[[10, 11, 12, 30, 31, 32, 33]] = 0
+        counts[25] = 30
+        counts[50] = 25
+        self.counts = counts
+
+    def expected_thresholds(self, window, n_std, min_articles):
+        """
+        Brute-force thresholds from a pandas rolling window.
+
+        Args:
+        - window (int): Rolling window length in days.
+        - n_std (float): Standard deviations above the mean.
+        - min_articles (int): Smallest daily count that can be a spike.
+
+        Returns:
+        - pandas Series: Threshold per day, from the previous days.
+        """
+        history = pd.Series(self.counts, dtype='float64').shift()
+        rolling = history.rolling(window, min_periods=1)
+        return np.maximum(rolling.mean() + n_std * rolling.std(),
+                          min_articles - 1)
+
+    def test_rolling_spikes_match_brute_force(self):
+        """Test spike days against a full rolling-window recomputation"""
+        detector = StreamingSpikeDetector(window=14, min_periods=7)
+        events = detector.update_batch(
+            ['A'] * self.counts.sum(), daily_stream(self.counts))
+        thresholds = self.expected_thresholds(14, 2.0, 3)
+        expected = [day for day in range(7, len(self.counts))
+                    if self.counts[day] > thresholds[day]]
+        start = pd.Timestamp('2022-01-01').date()
+        self.assertEqual(
+            [(event.date - start).days for event in events], expected)
+        for event in events:
+            day = (event.date - start).days
+            self.assertAlmostEqual(event.threshold, thresholds[day])
+            self.assertEqual(event.articles, int(thresholds[day]) + 1)
+        self.assertIn(25, expected)
+
+    def test_one_event_per_spike_day(self):
+        """Test that the crossing article emits and later ones do not"""
+        detector = StreamingSpikeDetector(window=5, min_periods=3)
+        stream = daily_stream([1, 1, 1, 1, 10])
+        events = [detector.update('A', ts) for ts in stream]
+        emitted = [i for i, event in enumerate(events) if event]
+        self.assertEqual(len(emitted), 1)
+        self.assertEqual(events[emitted[0]].articles, 3)
+
+    def test_ewm_matches_iterative_updates(self):
+        """Test the closed-form EWM gap update against day-by-day updates"""
+        detector = StreamingSpikeDetector(alpha=0.2, min_periods=1)
+        detector.update_batch(
+            ['A'] * self.counts.sum(), daily_stream(self.counts))
+        detector.update('A', pd.Timestamp('2022-12-31', tz='UTC'))
+        mean, variance = float(self.counts[0]), 0.0
+        padded = list(self.counts[1:]) + [0] * (
+            (pd.Timestamp('2022-12-31') - pd.Timestamp('2022-03-02')).days)
+        for count in padded:
+            delta = count - mean
+            mean += 0.2 * delta
+            variance = 0.8 * (variance + 0.2 * delta ** 2)
+        state = detector.states['A']
+        self.assertAlmostEqual(state.total, mean)
+        self.assertAlmostEqual(state.total_sq, variance)
+
+    def test_tickers_are_independent_and_late_ignored(self):
+        """Test per-ticker state and late arrivals"""
+        detector = StreamingSpikeDetector(window=5, min_periods=3)
+        detector.update('A', '2022-01-05')
+        detector.update('B', '2022-01-01')
+        self.assertIsNone(detector.update('A', '2022-01-01'))
+        self.assertEqual(detector.late, 1)
+        self.assertEqual(set(detector.states), {'A', 'B'})
+
+    def test_replay_csv(self):
+        """Test the replay harness on the sample dataset"""
+        events, report = replay_csv(
+            'data/raw_analyst_ratings.csv',
+            StreamingSpikeDetector(window=30, min_periods=3), batch_size=7)
+        self.assertEqual(report['articles'], 100)
+        self.assertEqual(report['events'], len(events))
+        self.assertGreater(report['articles_per_second'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+#!/usr/bin/python3
+"""
+This module contains tests for the seeded synthetic dataset generator.
+"""
+import os
+import tempfile
+import unittest
+import inspect
+import pandas as pd
+import pycodestyle
+from src.data_loader import load_news_data
+from src.synthetic_data import (
+    GENERATION_BLOCK, SYNTHETIC_COLUMNS, generate_ratings, write_ratings_csv)
+from tests.test_publisher_analysis import check_docstring
+import src
+MODULE_DOC = src.synthetic_data.__doc__
+
+
+class TestSyntheticDataDocs(unittest.TestCase):
+    """
+    Tests to check the documentation and style of the synthetic_data
+    module.
+    """
+    def setUp(self):
+        """Set up for docstring tests"""
+        self.base_funcs = inspect.getmembers(
+            src.synthetic_data, inspect.isfunction)
+
+    def test_pep8_conformance(self):
+        """Test that src/synthetic_data.py conforms to PEP8."""
+        for path in ['src/synthetic_data.py',
+                     'tests/test_synthetic_data.py']:
+            with self.subTest(path=path):
+                errors = pycodestyle.Checker(path).check_all()
+                self.assertEqual(errors, 0)
+
+    def test_module_docstring(self):
+        """Test for the existence of module docstring"""
+        self.assertIsNot(MODULE_DOC, None,
+                         "synthetic_data.py needs a docstring")
+        self.assertTrue(len(MODULE_DOC) > 1,
+                        "synthetic_data.py needs a docstring")
+
+    def test_func_docstrings(self):
+        """
+        Test for the presence of docstrings in synthetic_data functions.
+        """
+        for func in self.base_funcs:
+            with self.subTest(function=func):
+                check_docstring(func[1])
+
+
+class TestSyntheticData(unittest.TestCase):
+    """Unit tests for the synthetic dataset generator"""
+    def test_seeded_and_skewed(self):
+        """Test reproducibility and the skew of publishers and tickers"""
+        data = generate_ratings(20000, seed=3)
+        pd.testing.assert_frame_equal(data, generate_ratings(20000, seed=3))
+        self.assertFalse(data.equals(generate_ratings(20000, seed=4)))
+        self.assertEqual(list(data.columns), SYNTHETIC_COLUMNS)
+        for column in ['publisher', 'stock']:
+            with self.subTest(column=column):
+                counts = data[column].value_counts()
+                self.assertGreater(counts.iloc[0], 20 * counts.median())
+        self.assertLess(
+            data['headline'].nunique(), len(data) * 0.9)
+        self.assertTrue(data['publisher'].str.contains('@').any())
+
+    def test_csv_loads_like_the_real_file(self):
+        """Test the written CSV against the real schema and parser"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'ratings.csv')
+            rows = GENERATION_BLOCK + 10
+            write_ratings_csv(path, rows, seed=1)
+            real = pd.read_csv('data/raw_analyst_ratings.csv', nrows=1)
+            synthetic = pd.read_csv(path)
+            self.assertEqual(list(synthetic.columns), list(real.columns))
+            self.assertEqual(synthetic['Unnamed: 0'].tolist(),
+                             list(range(rows)))
+            data = load_news_data(path)
+        self.assertEqual(data.attrs['bad_dates'], 0)
+        self.assertEqual(
+            set(data['date'].dt.hour[data['date'].dt.hour != 0]) - set(
+                range(10, 24)), set())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+#!/usr/bin/python3
+"""
+This module contains tests for the streaming headline text features.
+"""
+import os
+import tempfile
+import unittest
+import inspect
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+import pycodestyle
+from sklearn.feature_extraction.text import TfidfTransformer
+from src.text_features import (
+    DEFAULT_FEATURES, HeadlineFeatures, TextFeatureAnalysis,
+    headline_vectorizer, topic_summary)
+from tests.test_publisher_analysis import check_docstring
+import src
+MODULE_DOC = src.text_features.__doc__
+DATA_PATH = 'data/raw_analyst_ratings.csv'
+
+
+class TestTextFeaturesDocs(unittest.TestCase):
+    """
+    Tests to check the documentation and style of the text_features module.
+    """
+    def setUp(self):
+        """Set up for docstring tests"""
+        self.base_funcs = inspect.getmembers(
+            HeadlineFeatures, inspect.isfunction) + inspect.getmembers(
+            src.text_features, inspect.isfunction)
+
+    def test_pep8_conformance(self):
+        """Test that src/text_features.py conforms to PEP8."""
+        for path in ['src/text_features.py', 'tests/test_text_features.py']:
+            with self.subTest(path=path):
+                errors = pycodestyle.Checker(path).check_all()
+                self.assertEqual(errors, 0)
+
+    def test_module_docstring(self):
+        """Test for the existence of module docstring"""
+        self.assertIsNot(MODULE_DOC, None,
+                         "text_features.py needs a docstring")
+        self.assertTrue(len(MODULE_DOC) > 1,
+                        "text_features.py needs a docstring")
+
+    def test_func_docstrings(self):
+        """
+        Test for the presence of docstrings in text_features functions.
+        """
+        for func in self.base_funcs:
+            with self.subTest(function=func):
+                check_docstring(func[1])
+
+
+class TestHeadlineFeatures(unittest.TestCase):
+    """Unit tests for HeadlineFeatures"""
+    def setUp(self):
+        """Load the sample headlines and create a scratch directory"""
+        self.headlines = pd.read_csv(DATA_PATH)['headline']
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Remove the scratch directory"""
+        self.tmp_dir.cleanup()
+
+    def test_chunks_match_whole_corpus(self):
+        """Test streamed counts and TF-IDF equal a single pass"""
+        features = HeadlineFeatures(
+            n_features=2 ** 12, n_topics=3, chunksize=7).fit(DATA_PATH)
+        expected = headline_vectorizer(2 ** 12).transform(self.headlines)
+        self.assertEqual(features.report, {'rows': 100, 'cached': False})
+        self.assertEqual((features.counts != expected).nnz, 0)
+        np.testing.assert_allclose(
+            features.tfidf().toarray(),
+            TfidfTransformer().fit_transform(expected).toarray(), rtol=1e-5)
+
+    def test_topics(self):
+        """Test both topic models give one weight per headline and topic"""
+        for topic_model in ['nmf', 'lda']:
+            with self.subTest(topic_model=topic_model):
+                features = HeadlineFeatures(
+                    n_features=2 ** 12, n_topics=4, topic_model=topic_model,
+                    chunksize=30).fit(DATA_PATH)
+                weights = features.document_topics()
+                self.assertEqual(weights.shape, (100, 4))
+                terms = features.top_terms(3)
+                self.assertEqual([len(topic) for topic in terms], [3] * 4)
+                self.assertIn('agilent', sum(terms, []))
+                summary = topic_summary(features, 3)
+                self.assertEqual(summary['headlines'].sum(), 100)
+                np.testing.assert_allclose(
+                    features.document_topics(features.transform(
+                        self.headlines[:5])), weights[:5], atol=1e-2)
+        with self.assertRaises(ValueError):
+            HeadlineFeatures(topic_model='lsa')
+
+    def test_persisted_features_are_reused(self):
+        """Test a second fit reads the features instead of the CSV"""
+        first = HeadlineFeatures(
+            n_features=2 ** 12, n_topics=3, cache_dir=self.tmp_dir.name,
+            chunksize=30).fit(DATA_PATH)
+        with patch('src.text_features.iter_frames') as frames:
+            second = HeadlineFeatures(
+                n_features=2 ** 12, n_topics=3, cache_dir=self.tmp_dir.name,
+                chunksize=30).fit(DATA_PATH)
+        frames.assert_not_called()
+        self.assertEqual(second.report, {'rows': 100, 'cached': True})
+        self.assertEqual((second.counts != first.counts).nnz, 0)
+        np.testing.assert_allclose(second.document_topics(),
+                                   first.document_topics())
+        self.assertEqual(second.top_terms(), first.top_terms())
+        other = HeadlineFeatures(
+            n_features=2 ** 12, n_topics=5, cache_dir=self.tmp_dir.name,
+            chunksize=30).fit(DATA_PATH)
+        self.assertFalse(other.report['cached'])
+        self.assertEqual(len(os.listdir(self.tmp_dir.name)), 8)
+
+    def test_analysis(self):
+        """Test the analysis streams its data file"""
+        analysis = TextFeatureAnalysis(DATA_PATH, out_of_core=True)
+        features = analysis.headline_features(n_topics=2)
+        self.assertEqual(features.counts.shape[0], 100)
+
+    def test_analysis_uses_loaded_rows(self):
+        """Test rows in memory are used instead of the data file"""
+        data = pd.read_csv(DATA_PATH).iloc[:40]
+        analysis = TextFeatureAnalysis.from_frame(data, DATA_PATH)
+        with patch('src.text_features.iter_frames') as frames:
+            features = analysis.headline_features(
+                n_topics=2, cache_dir=self.tmp_dir.name)
+        frames.assert_not_called()
+        self.assertEqual(features.report, {'rows': 40, 'cached': False})
+        expected = headline_vectorizer(DEFAULT_FEATURES).transform(
+            data['headline'])
+        self.assertEqual((features.counts != expected).nnz, 0)
+        again = analysis.headline_features(
+            n_topics=2, cache_dir=self.tmp_dir.name)
+        self.assertEqual(again.report, {'rows': 40, 'cached': True})
+        other = TextFeatureAnalysis.from_frame(data.iloc[:30], DATA_PATH)
+        self.assertFalse(other.headline_features(
+            n_topics=2, cache_dir=self.tmp_dir.name).report['cached'])
+
+
+if __name__ == '__main__':
+    unittest.main()
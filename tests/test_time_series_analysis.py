@@ -4,6 +4,8 @@ This module provides the TimeSeriesAnalysis class for analyzing financial
 news data.
 """
 from datetime import datetime
+import os
+import tempfile
 from unittest.mock import patch
 import unittest
 import inspect
@@ -77,23 +79,71 @@ class TestFinancialNewsAnalysis(unittest.TestCase):
         """
         Test if publication_frequency_over_time produces expected output
         """
-        # Create a mock DataFrame with 'date' column
+        # Create a DataFrame with 'date' column in the dataset's formats
         dates = [
-            '2022-01-01',
-            '2022-01-01', '2022-01-02', '2022-01-02', '2022-01-02']
+            '2022-01-01 09:00:00-05:00', '2022-01-02 00:00:00',
+            '2022-01-01 12:30:00-04:00', '2022-01-02 10:00:00-05:00',
+            '2022-01-01']
         df = pd.DataFrame({'date': dates})
 
-        with patch.object(
-                pd, 'to_datetime',
-                return_value=pd.Series(
-                    [datetime(2022, 1, 1),
-                     datetime(2022, 1, 2)] * 3)) as _:
-            self.time_series_analysis.data = df
-            publication_frequency = \
-                self.time_series_analysis.publication_frequency_over_time()
-            expected_result = pd.Series(
-                [3, 2], index=[datetime(2022, 1, 1), datetime(2022, 1, 2)])
-            self.assertTrue(publication_frequency.equals(expected_result))
+        self.time_series_analysis.data = df
+        publication_frequency = \
+            self.time_series_analysis.publication_frequency_over_time()
+        expected_result = pd.Series(
+            [3, 2], index=[datetime(2022, 1, 1), datetime(2022, 1, 2)])
+        self.assertTrue(publication_frequency.equals(expected_result))
+
+    def test_publication_times_without_prior_parse(self):
+        """
+        Test that publication_times parses string dates itself
+        """
+        self.time_series_analysis.data = pd.DataFrame(
+            {'date': ['2022-01-01 09:15:00', '2022-01-01 09:45:00',
+                      '2022-01-02 14:00:00']})
+        publication_times = self.time_series_analysis.publication_times()
+        self.assertEqual(publication_times.to_dict(), {9: 2, 14: 1})
+
+    def test_publication_times_across_offsets(self):
+        """
+        Test that hours are counted in UTC whatever the source offset
+        """
+        self.time_series_analysis.data = pd.DataFrame(
+            {'date': ['2020-01-06 09:30:00-05:00', '2020-06-05 10:30:00-04:00',
+                      '2020-06-05 14:45:00']})
+        publication_times = self.time_series_analysis.publication_times()
+        self.assertEqual(publication_times.to_dict(), {14: 3})
+
+    def test_article_spikes_table(self):
+        """
+        Test that article_spikes returns the spike dates and thresholds
+        """
+        dates = ['2022-01-01'] * 30 + [
+            f'2022-01-{day:02d}' for day in range(2, 12)]
+        self.time_series_analysis.data = pd.DataFrame({'date': dates})
+        spikes = self.time_series_analysis.article_spikes()
+        self.assertEqual(spikes.index.tolist(), [datetime(2022, 1, 1).date()])
+        self.assertEqual(spikes['articles'].tolist(), [30])
+        self.assertTrue((spikes['articles'] > spikes['threshold']).all())
+        self.assertTrue((spikes['zscore'] > 2).all())
+
+    def test_daily_counts_shared_and_invalidated(self):
+        """
+        Test that the analyses group the rows once per dataset
+        """
+        self.time_series_analysis.data = pd.DataFrame(
+            {'date': pd.date_range('2022-01-01', periods=48, freq='H')})
+        with patch('src.financial_news_analysis.NewsStatistics.from_frame',
+                   wraps=src.news_statistics.NewsStatistics.from_frame) as \
+                from_frame:
+            self.time_series_analysis.publication_frequency_over_time()
+            self.time_series_analysis.publication_times()
+            self.time_series_analysis.article_spikes()
+            self.assertEqual(from_frame.call_count, 1)
+            self.time_series_analysis.data = pd.DataFrame(
+                {'date': pd.date_range('2022-01-01', periods=3)})
+            self.assertEqual(
+                len(self.time_series_analysis.daily_counts()), 3)
+            self.assertEqual(from_frame.call_count, 2)
 
     def test_invalid_data_path(self):
         """Test handling of invalid data path"""
@@ -138,6 +188,27 @@ class TestFinancialNewsAnalysis(unittest.TestCase):
             self.time_series_analysis.analyze_article_spikes()
             mock_show.assert_called()
 
+    def test_figures_reuse_one_renderer(self):
+        """Test figure files of one analysis share its renderer"""
+        with tempfile.TemporaryDirectory() as tmp_dir, \
+                patch('src.financial_news_analysis.FigureRenderer',
+                      wraps=src.plot_rendering.FigureRenderer) as renderer, \
+                patch('src.plot_rendering.FigureRenderer') as batch_renderer:
+            self.time_series_analysis.analyze_publication_times(
+                os.path.join(tmp_dir, 'times.png'))
+            self.time_series_analysis.analyze_article_spikes(
+                os.path.join(tmp_dir, 'spikes.svg'))
+            self.time_series_analysis.visualize_stat_measures(tmp_dir)
+            self.time_series_analysis.render_ticker_reports(
+                os.path.join(tmp_dir, 'tickers'))
+            self.assertEqual(sorted(os.listdir(tmp_dir)), [
+                'headline_lengths.png', 'publication_dates.png', 'spikes.svg',
+                'tickers', 'times.png', 'top_publishers.png'])
+            self.assertEqual(os.listdir(os.path.join(tmp_dir, 'tickers')),
+                             ['A.png'])
+        renderer.assert_called_once()
+        batch_renderer.assert_not_called()
+
 
 if __name__ == '__main__':
     unittest.main()